@@ -65,6 +65,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.profiling.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -99,13 +100,42 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# core.backends.postgresql es el backend de Django más contadores de
+# conexiones (ver /api/internal/stats/).
+# DB_CONN_MAX_AGE: segundos que un worker reutiliza su conexión (0 = una
+# por petición). Con DB_PGBOUNCER=1 (pgbouncer en modo transaction) no se
+# pueden usar cursores del lado del servidor.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
+        'PORT': os.environ.get('DB_PORT', ''),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': bool(int(os.environ.get('DB_CONN_HEALTH_CHECKS', 1))),  # noqa
+        'DISABLE_SERVER_SIDE_CURSORS': bool(int(os.environ.get('DB_PGBOUNCER', 0))),  # noqa
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Con varios workers de uWSGI usar 'redis' (el de docker-compose-deploy)
+# o 'file' para que la invalidación llegue a todos los procesos.
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
@@ -150,6 +180,23 @@ MEDIA_URL = '/static/media/'
 MEDIA_ROOT = '/vol/web/media'
 STATIC_ROOT = '/vol/web/static'
 
+# Guarda la media por hash (SHA-256) para no duplicar archivos
+MEDIA_CONTENT_ADDRESSED = bool(int(os.environ.get('MEDIA_CONTENT_ADDRESSED', 0)))  # noqa
+
+# Con X-Accel-Redirect nginx entrega la media protegida (ver
+# proxy/default.conf.tpl); sin él la entrega Django
+MEDIA_X_ACCEL_REDIRECT = bool(int(os.environ.get('MEDIA_X_ACCEL_REDIRECT', 0)))  # noqa
+MEDIA_X_ACCEL_PREFIX = '/protected-media/'
+
+# Subidas por partes: cada parte debe caber en el client_max_body_size
+# del proxy (10M)
+UPLOAD_CHUNK_MAX_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', 2 * 1024 ** 3))
+
+# Worker de miniaturas (process_image_variants)
+IMAGE_VARIANT_PROCESSES = int(os.environ.get('IMAGE_VARIANT_PROCESSES', 2))
+IMAGE_VARIANT_MAX_ATTEMPTS = 3
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -159,6 +206,62 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Paginación keyset opcional (sólo con ?cursor= o ?page_size=)
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 100)),
+}
+
+
+# Vistas async de core.asyncviews. Sólo convienen bajo ASGI: con uWSGI
+# cada petición pagaría async_to_sync (ver DEPLOYMENT.md, ASGI Mode).
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+ASYNC_VIEWS = bool(int(os.environ.get('ASYNC_VIEWS', SERVER_MODE == 'asgi')))
+
+
+# Segundos que se guarda el catálogo de actividades y preguntas (se
+# invalida por señales al editarlo). Con locmem cada worker tiene su copia
+# y la invalidación sólo llega al que hizo la escritura, así que el tiempo
+# se limita a LOCMEM_CACHE_MAX_TIMEOUT.
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 3600))
+LOCMEM_CACHE_MAX_TIMEOUT = int(os.environ.get('LOCMEM_CACHE_MAX_TIMEOUT', 30))
+# Cache de autenticación por token (ver core.authentication); el alias
+# vacío usa 'default'
+TOKEN_AUTH_CACHE_TIMEOUT = int(os.environ.get('TOKEN_AUTH_CACHE_TIMEOUT', 60))
+TOKEN_AUTH_CACHE_ALIAS = os.environ.get('TOKEN_AUTH_CACHE_ALIAS') or None
+if CACHE_BACKEND == 'locmem':
+    CATALOG_CACHE_TIMEOUT = min(CATALOG_CACHE_TIMEOUT, LOCMEM_CACHE_MAX_TIMEOUT)  # noqa
+    TOKEN_AUTH_CACHE_TIMEOUT = min(TOKEN_AUTH_CACHE_TIMEOUT, LOCMEM_CACHE_MAX_TIMEOUT)  # noqa
+# Candado y espera ante un miss para que sólo un proceso reconstruya
+CACHE_STAMPEDE_LOCK_TIMEOUT = 10
+CACHE_STAMPEDE_WAIT = 2
+
+# Presupuestos por petición: las que los pasan se registran en el log
+# (ver core.profiling)
+REQUEST_QUERY_BUDGET = int(os.environ.get('REQUEST_QUERY_BUDGET', 30))
+REQUEST_TIME_BUDGET_MS = int(os.environ.get('REQUEST_TIME_BUDGET_MS', 500))
+# Medir el tiempo de serializers envuelve BaseSerializer.data en todo el
+# proceso; sólo se activa con REQUEST_PROFILE_SERIALIZERS=1
+REQUEST_PROFILE_SERIALIZERS = bool(int(os.environ.get('REQUEST_PROFILE_SERIALIZERS', 0)))  # noqa
+
+# Métricas por ruta (ver core.metrics): con varios workers cada uno
+# vuelca las suyas a METRICS_DIR para que /api/internal/metrics/ las sume
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+METRICS_FLUSH_SECONDS = int(os.environ.get('METRICS_FLUSH_SECONDS', 5))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.profiling': {
+            'handlers': ['console'],
+            'level': os.environ.get('PROFILING_LOG_LEVEL', 'WARNING'),
+        },
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -31,6 +31,9 @@ urlpatterns = [
     path('', core_views.index_page, name='index'),
     path('admin/', admin.site.urls),
     path('api/health-check/', core_views.health_check, name='health-check'),
+    path('api/internal/stats/', core_views.internal_stats, name='internal-stats'),  # noqa
+    path('api/internal/metrics/', core_views.metrics, name='internal-metrics'),  # noqa
+    path('sel4c/media/<str:kind>/<int:pk>/<str:field>/', core_views.serve_media, name='media'),  # noqa
     path('sel4c/schema/', SpectacularAPIView.as_view(), name='api-schema'),
     path(
         'sel4c/docs/',
@@ -129,16 +129,24 @@ class FormsQuestionResponseAdmin(admin.ModelAdmin):
 
 class ActivityResponseAdmin(admin.ModelAdmin):
     fields = ['id', 'user', 'activity', 'response_type',
-              'string_response', 'image_response', 'video_response',
-              'audio_response', 'time_minutes']
-    readonly_fields = ['id', 'user', 'activity', 'response_type',
-                       'string_response', 'image_response', 'video_response',
-                       'audio_response', 'time_minutes']
+              'string_response', 'image_response', 'image_thumbnail',
+              'image_medium', 'video_response', 'audio_response',
+              'time_minutes']
+    readonly_fields = fields
 
     class Meta:
         model = models.ActivityResponse
 
 
+class ResponseUploadSessionAdmin(admin.ModelAdmin):
+    fields = ['id', 'user', 'activity', 'response_type', 'filename',
+              'size', 'offset', 'time_minutes', 'created_at', 'updated_at']
+    readonly_fields = fields
+
+    class Meta:
+        model = models.ResponseUploadSession
+
+
 class ModuleResponseCompletionAdmin(admin.ModelAdmin):
     fields = ['id', 'user', 'parent_activity', 'completed']
     readonly_fields = ['id', 'user', 'parent_activity', 'completed']
@@ -147,9 +155,19 @@ class ModuleResponseCompletionAdmin(admin.ModelAdmin):
         model = models.ModuleResponseCompletion
 
 
+class UserProgressAdmin(admin.ModelAdmin):
+    fields = ['id', 'user', 'answered_activities', 'completed_modules',
+              'total_time_minutes', 'last_activity', 'last_activity_at',
+              'updated_at']
+    readonly_fields = fields
+
+    class Meta:
+        model = models.UserProgress
+
+
 class UserPhotoMediaAdmin(admin.ModelAdmin):
-    fields = ['id', 'user', 'photo']
-    readonly_fields = ['id', 'user', 'photo']
+    fields = ['id', 'user', 'photo', 'photo_thumbnail', 'photo_medium']
+    readonly_fields = fields
 
     class Meta:
         model = models.UserPhotoMedia
@@ -163,6 +181,25 @@ class UserVideoMediaAdmin(admin.ModelAdmin):
         model = models.UserVideoMedia
 
 
+class MediaBlobAdmin(admin.ModelAdmin):
+    fields = ['id', 'name', 'digest', 'size', 'ref_count', 'created_at']
+    readonly_fields = fields
+
+    class Meta:
+        model = models.MediaBlob
+
+
+class ImageVariantJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'model_name', 'object_id', 'field', 'status']
+    list_filter = ['status']
+    fields = ['id', 'model_name', 'object_id', 'field', 'source_name',
+              'status', 'attempts', 'error', 'created_at', 'updated_at']
+    readonly_fields = fields
+
+    class Meta:
+        model = models.ImageVariantJob
+
+
 class UserUserDefaultsAdmin(admin.ModelAdmin):
     fields = ['id', 'user', 'user_defaults']
     readonly_fields = ['id', 'user', 'user_defaults']
@@ -182,7 +219,11 @@ admin.site.register(models.FormsQuestionResponse, FormsQuestionResponseAdmin)
 admin.site.register(models.Activity, ActivityAdmin)
 admin.site.register(models.ActivityResponse, ActivityResponseAdmin)
 admin.site.register(models.ModuleResponseCompletion, ModuleResponseCompletionAdmin)  # noqa
+admin.site.register(models.ResponseUploadSession, ResponseUploadSessionAdmin)
+admin.site.register(models.UserProgress, UserProgressAdmin)
 admin.site.register(models.UserPhotoMedia, UserPhotoMediaAdmin)
 admin.site.register(models.UserVideoMedia, UserVideoMediaAdmin)
+admin.site.register(models.MediaBlob, MediaBlobAdmin)
+admin.site.register(models.ImageVariantJob, ImageVariantJobAdmin)
 
 admin.site.register(models.UserUserDefaults, UserUserDefaultsAdmin)  # noqa
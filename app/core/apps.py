@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # registra las señales de la cache de tokens, media y conexiones
+        from core import authentication, db, signals  # noqa
+        from core.profiling import install_serializer_timing
+
+        if settings.REQUEST_PROFILE_SERIALIZERS:
+            install_serializer_timing()
@@ -0,0 +1,128 @@
+"""
+Vistas async de DRF para los caminos de lectura más usados
+"""
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404
+from django.utils.functional import classproperty
+from rest_framework.response import Response
+
+from core.cache import CachedResponseMixin, aget_or_build
+
+
+class AsyncViewMixin:
+    """
+    ``dispatch`` async para una vista de DRF (que sólo lo tiene síncrono),
+    activo sólo con ``ASYNC_VIEWS`` (por omisión, bajo ASGI). Con WSGI la
+    vista sigue síncrona: ``async_to_sync`` en cada petición sólo agrega
+    costo.
+
+    En modo async, si existe la versión con prefijo ``a`` del handler
+    (``aget``, ``alist``) se espera en el event loop; los demás handlers
+    (las escrituras) y la autenticación, que puede consultar la base de
+    datos, corren en un hilo con ``sync_to_async``.
+    """
+
+    @classproperty
+    def view_is_async(cls):
+        return settings.ASYNC_VIEWS
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        if cls.view_is_async:
+            # ViewSetMixin.as_view no marca la vista como corrutina
+            view = markcoroutinefunction(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    def async_handler(self, handler):
+        """Versión async de ``handler`` o ``None`` si no tiene"""
+        name = getattr(handler, '__name__', '')
+        ahandler = getattr(self, 'a' + name, None)
+        if ahandler is not None and iscoroutinefunction(ahandler):
+            return ahandler
+        return None
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            method = request.method.lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            ahandler = self.async_handler(handler)
+            if ahandler is not None:
+                response = await ahandler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(
+                    request, *args, **kwargs,
+                )
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs,
+        )
+        return self.response
+
+
+class AsyncCachedResponseMixin(CachedResponseMixin):
+    """
+    ``CachedResponseMixin`` con ``alist`` y ``aretrieve``: en modo async la
+    cache y, en un miss, la consulta usan las APIs async de Django. Usar
+    junto con ``AsyncViewMixin``.
+    """
+
+    async def _acached(self, request, action, build):
+        return await aget_or_build(
+            self.cache_namespace,
+            self.cache_parts(request, action),
+            build,
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        return Response(await self._acached(request, 'list', self.alist_data))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return Response(await self._acached(
+            request, 'retrieve', self.aretrieve_data,
+        ))
+
+    async def alist_data(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        # sin ?cursor ni ?page_size no pagina y no consulta nada
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is not None:
+            data = self.get_serializer(page, many=True).data
+            return self.get_paginated_response(data).data
+        objects = [obj async for obj in queryset]
+        return self.get_serializer(objects, many=True).data
+
+    async def aretrieve_data(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(**{
+                self.lookup_field: self.kwargs[lookup_url_kwarg],
+            })
+        except (ObjectDoesNotExist, ValueError, TypeError):
+            raise Http404
+        self.check_object_permissions(self.request, instance)
+        return self.get_serializer(instance).data
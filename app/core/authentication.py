@@ -0,0 +1,151 @@
+"""
+Autenticación por token con cache
+"""
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+# Campos del usuario que se guardan en cache. El resto (la contraseña
+# incluida) no sale de la base de datos: queda diferido y se consulta
+# sólo si alguien lo usa.
+CACHED_USER_FIELDS = (
+    'id', 'email', 'name', 'is_active', 'is_staff', 'is_superuser',
+)
+
+
+class TokenCache:
+    """
+    Cache de tokens en un backend de cache de Django
+    (``TOKEN_AUTH_CACHE_ALIAS``, por defecto ``default``).
+
+    Las entradas y las invalidaciones van al mismo backend, así que con uno
+    compartido (redis en docker-compose-deploy) un token borrado o un
+    usuario desactivado deja de servirse en todos los workers a la vez.
+    Los contadores son del proceso.
+    """
+    key_prefix = 'token-auth:'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'TOKEN_AUTH_CACHE_TIMEOUT', 60)
+
+    @property
+    def cache(self):
+        alias = getattr(settings, 'TOKEN_AUTH_CACHE_ALIAS', None)
+        return caches[alias or 'default']
+
+    def get(self, key):
+        """Devuelve los campos cacheados del usuario o None"""
+        value = self.cache.get(self.key_prefix + key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        # DRF guarda un token por usuario; el índice por usuario permite
+        # invalidar sin consultar la tabla de tokens
+        self.cache.set_many({
+            self.key_prefix + key: value,
+            f'{self.key_prefix}user:{value["id"]}': key,
+        }, self.timeout)
+
+    def delete(self, key):
+        self.cache.delete(self.key_prefix + key)
+        with self._lock:
+            self.invalidations += 1
+
+    def delete_user(self, user_id):
+        """Invalida el token cacheado de un usuario"""
+        key = self.cache.get(f'{self.key_prefix}user:{user_id}')
+        if key is not None:
+            self.delete(key)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` que evita la consulta de Token + Usuario en
+    cada petición guardando el resultado en ``token_cache``.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, {
+                field: getattr(user, field) for field in CACHED_USER_FIELDS
+            })
+            return (user, token)
+
+        if not cached['is_active']:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+        # from_db espera los valores en el orden de los campos del modelo
+        User = get_user_model()
+        fields = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in cached
+        ]
+        user = User.from_db(
+            DEFAULT_DB_ALIAS, fields, [cached[field] for field in fields],
+        )
+        token = Token.from_db(
+            DEFAULT_DB_ALIAS, ['key', 'user_id'], [key, user.pk],
+        )
+        token.user = user
+        return (user, token)
+
+
+def invalidate_token(key):
+    """Quita un token de la cache (p. ej. al rotarlo)"""
+    token_cache.delete(key)
+
+
+def invalidate_user_tokens(user_id):
+    """Quita de la cache todos los tokens de un usuario"""
+    token_cache.delete_user(user_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, **kwargs):
+    """Un usuario modificado (p. ej. desactivado) no debe servirse de cache"""
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
@@ -0,0 +1,28 @@
+"""
+Backend de PostgreSQL que alimenta los contadores de core.db y la
+medición por petición de core.profiling
+"""
+import time
+
+from django.db.backends.postgresql import base
+
+from core.db import connection_stats
+from core.profiling import record_query
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(record_query)
+
+    def get_new_connection(self, conn_params):
+        started = time.monotonic()
+        connection = super().get_new_connection(conn_params)
+        connection_stats.connected(time.monotonic() - started)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            connection_stats.closed()
+        return super()._close()
@@ -0,0 +1,112 @@
+"""
+Benchmark de los caminos de consulta de los listados (EXPLAIN ANALYZE)
+"""
+import statistics
+
+from django.db import connection
+
+from core.models import (
+    ActivityResponse,
+    FormsQuestionResponse,
+    ModuleResponseCompletion,
+    UserData,
+)
+from core.seeding import drop_off_plan, seed_catalog, seed_users
+
+
+# Índices de core/migrations/0006_response_indexes.py
+BENCHMARK_INDEXES = (
+    'actresp_activity_user_idx',
+    'actresp_media_type_user_idx',
+)
+
+# Una página de KeysetPagination
+PAGE = 100
+
+
+def benchmark_queries():
+    """
+    Consultas tal como las arman las vistas de listados, con valores
+    tomados de los datos existentes.
+    """
+    responses = ActivityResponse.objects.all()
+    user_id = responses.order_by('-id').values_list(
+        'user_id', flat=True,
+    ).first() or 0
+    # la actividad con respuestas más reciente (las últimas son las que
+    # menos usuarios alcanzan)
+    activity_id = responses.order_by('-activity_id').values_list(
+        'activity_id', flat=True,
+    ).first() or 0
+    return {
+        'activity_responses:all': responses.order_by('user_id', 'id')[:PAGE],
+        'activity_responses:user': responses.filter(user_id=user_id).order_by('user_id', 'id')[:PAGE],  # noqa
+        'activity_responses:activity': responses.filter(activity_id=activity_id).order_by('user_id', 'id')[:PAGE],  # noqa
+        'activity_responses:response_type': responses.filter(response_type='audio').order_by('user_id', 'id')[:PAGE],  # noqa
+        'activity_responses:own': responses.filter(user_id=user_id).order_by('activity_id'),  # noqa
+        'forms_responses:all': FormsQuestionResponse.objects.order_by('user_id', 'id')[:PAGE],  # noqa
+        'completed_modules:all': ModuleResponseCompletion.objects.order_by('user_id', 'id')[:PAGE],  # noqa
+        'users_info': UserData.objects.filter(user__is_superuser=False).select_related('user').order_by('user_id')[:PAGE],  # noqa
+    }
+
+
+def _index_names(plan):
+    names = set()
+    if 'Index Name' in plan:
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        names |= _index_names(child)
+    return names
+
+
+def explain(queryset, repeat=5):
+    """Mediana del tiempo de ejecución (ms) y los índices que se usaron"""
+    sql, params = queryset.query.sql_with_params()
+    timings = []
+    with connection.cursor() as cursor:
+        for _ in range(repeat):
+            cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', params)
+            result = cursor.fetchone()[0][0]
+            timings.append(result['Execution Time'])
+    return {
+        'ms': round(statistics.median(timings), 3),
+        'indexes': sorted(_index_names(result['Plan'])),
+    }
+
+
+def run_benchmark(repeat=5):
+    return {
+        name: explain(queryset, repeat)
+        for name, queryset in benchmark_queries().items()
+    }
+
+
+def drop_benchmark_indexes():
+    """Quita los índices (llamar dentro de una transacción a revertir)"""
+    with connection.cursor() as cursor:
+        for name in BENCHMARK_INDEXES:
+            cursor.execute(
+                f'DROP INDEX IF EXISTS {connection.ops.quote_name(name)}'
+            )
+
+
+def seed_responses(count, activities=50, batch_size=5000):
+    """
+    Crea ``count`` respuestas de actividad (más datos, scores, forms y
+    módulos completados) repartidas con abandono entre usuarios sintéticos
+    sin contraseña utilizable.
+    """
+    activities = min(activities, max(count, 1))
+    catalog = seed_catalog(
+        modules=5,
+        activities_per_module=max(1, activities // 5),
+        questions=10,
+    )
+    seed_users(
+        drop_off_plan(count, len(catalog.activities)),
+        catalog,
+        batch_size=batch_size,
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
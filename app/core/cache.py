@@ -0,0 +1,180 @@
+"""
+Utilidades de cache con invalidación por namespace
+"""
+import asyncio
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+_MISSING = object()
+
+
+def _version_key(namespace):
+    return f'cache-ns:{namespace}'
+
+
+def namespace_version(namespace):
+    """Versión actual de un namespace (forma parte de cada llave)"""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # empieza en el tiempo actual para no repetir versiones si la
+        # llave de versión fue desalojada de la cache
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+async def anamespace_version(namespace):
+    """Versión async de ``namespace_version``"""
+    key = _version_key(namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key, 0)
+    return version
+
+
+def bump_namespace(namespace):
+    """Invalida todas las llaves de un namespace"""
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_namespace(namespace):
+    """Invalida un namespace ahora y de nuevo al confirmar la transacción"""
+    bump_namespace(namespace)
+    # de nuevo al confirmar, por si otra petición cacheó antes del commit
+    transaction.on_commit(partial(bump_namespace, namespace))
+
+
+def _versioned_key(namespace, version, parts):
+    digest = hashlib.md5(
+        '|'.join(str(part) for part in parts).encode('utf-8')
+    ).hexdigest()
+    return f'{namespace}:{version}:{digest}'
+
+
+def make_key(namespace, *parts):
+    """Arma la llave versionada de un valor del namespace"""
+    return _versioned_key(namespace, namespace_version(namespace), parts)
+
+
+async def amake_key(namespace, *parts):
+    """Versión async de ``make_key``"""
+    version = await anamespace_version(namespace)
+    return _versioned_key(namespace, version, parts)
+
+
+def get_or_build(namespace, parts, builder, timeout=None):
+    """
+    Devuelve el valor cacheado o lo construye con ``builder``.
+
+    Ante un miss sólo el proceso que obtiene el candado reconstruye el
+    valor; el resto espera hasta ``CACHE_STAMPEDE_WAIT`` segundos a que
+    aparezca antes de construirlo por su cuenta.
+    """
+    key = make_key(namespace, *parts)
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    if timeout is None:
+        timeout = settings.CATALOG_CACHE_TIMEOUT
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, settings.CACHE_STAMPEDE_LOCK_TIMEOUT):
+        try:
+            value = builder()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + settings.CACHE_STAMPEDE_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+    return builder()
+
+
+async def aget_or_build(namespace, parts, builder, timeout=None):
+    """Versión async de ``get_or_build``; ``builder`` regresa un awaitable"""
+    key = await amake_key(namespace, *parts)
+    value = await cache.aget(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    if timeout is None:
+        timeout = settings.CATALOG_CACHE_TIMEOUT
+    lock_key = f'{key}:lock'
+    if await cache.aadd(lock_key, 1, settings.CACHE_STAMPEDE_LOCK_TIMEOUT):
+        try:
+            value = await builder()
+            await cache.aset(key, value, timeout)
+        finally:
+            await cache.adelete(lock_key)
+        return value
+
+    deadline = time.monotonic() + settings.CACHE_STAMPEDE_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        value = await cache.aget(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+    return await builder()
+
+
+class CachedResponseMixin:
+    """
+    Cachea la data de ``list`` y ``retrieve`` de un ViewSet de sólo lectura
+    pública. La llave sólo incluye lo que cambia la respuesta: la acción,
+    el host (los links de paginación son absolutos), el id y los
+    parámetros de ``cache_query_params``. Otros parámetros no crean
+    entradas nuevas.
+    """
+    cache_namespace = None
+    cache_query_params = ('cursor', 'page_size')
+
+    def cache_parts(self, request, action):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            action,
+            request.build_absolute_uri('/'),
+            self.kwargs.get(lookup_url_kwarg),
+            *(
+                request.query_params.get(name)
+                for name in self.cache_query_params
+            ),
+        )
+
+    def _cached(self, request, action, build):
+        return get_or_build(
+            self.cache_namespace,
+            self.cache_parts(request, action),
+            lambda: build().data,
+        )
+
+    def list(self, request, *args, **kwargs):
+        build = super().list
+        return Response(self._cached(
+            request, 'list', lambda: build(request, *args, **kwargs),
+        ))
+
+    def retrieve(self, request, *args, **kwargs):
+        build = super().retrieve
+        return Response(self._cached(
+            request, 'retrieve', lambda: build(request, *args, **kwargs),
+        ))
@@ -0,0 +1,67 @@
+"""
+Contadores de conexiones a la base de datos (por proceso)
+"""
+import threading
+
+from django.core.signals import request_started
+from django.db import connections
+from django.dispatch import receiver
+
+
+class ConnectionStats:
+    """
+    Cuenta conexiones nuevas, reutilizadas y cerradas del proceso.
+
+    ``connect_seconds`` es el tiempo que los workers esperaron a que se
+    abriera una conexión (handshake con PostgreSQL o cola de pgbouncer).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.connects = 0
+            self.reuses = 0
+            self.closes = 0
+            self.connect_seconds = 0.0
+            self.max_connect_seconds = 0.0
+
+    def connected(self, seconds):
+        with self._lock:
+            self.connects += 1
+            self.connect_seconds += seconds
+            self.max_connect_seconds = max(self.max_connect_seconds, seconds)
+
+    def closed(self):
+        with self._lock:
+            self.closes += 1
+
+    def reused(self):
+        with self._lock:
+            self.reuses += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'connects': self.connects,
+                'reuses': self.reuses,
+                'closes': self.closes,
+                'connect_seconds': round(self.connect_seconds, 4),
+                'max_connect_seconds': round(self.max_connect_seconds, 4),
+            }
+
+
+connection_stats = ConnectionStats()
+
+
+@receiver(request_started)
+def count_reused_connections(sender, **kwargs):
+    """
+    Corre después de ``close_old_connections`` de Django: una conexión que
+    sigue abierta al empezar la petición se va a reutilizar.
+    """
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            connection_stats.reused()
@@ -0,0 +1,65 @@
+"""
+Variantes reducidas (miniatura y tamaño medio) de las imágenes subidas
+"""
+import os
+
+from PIL import Image, ImageOps
+
+
+# Tamaño máximo (ancho, alto) de cada variante
+IMAGE_VARIANT_SIZES = {
+    'thumbnail': (256, 256),
+    'medium': (1024, 1024),
+}
+IMAGE_VARIANT_QUALITY = 80
+
+
+def variant_name(source_name, variant):
+    """Nombre del archivo de una variante a partir del original"""
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}__{variant}.jpg')
+
+
+def generate_variants(media_root, source_name):
+    """
+    Genera todas las variantes de una imagen y devuelve sus nombres.
+
+    No usa el ORM para poder ejecutarse en un proceso aparte.
+    """
+    names = {}
+    with Image.open(os.path.join(media_root, source_name)) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        for variant, size in IMAGE_VARIANT_SIZES.items():
+            name = variant_name(source_name, variant)
+            path = os.path.join(media_root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            resized = image.copy()
+            resized.thumbnail(size)
+            resized.save(
+                path,
+                format='JPEG',
+                quality=IMAGE_VARIANT_QUALITY,
+                optimize=True,
+            )
+            names[variant] = name
+    return names
+
+
+def run_variant_job(job):
+    """
+    Corre en el proceso hijo del worker: ``job`` es (media_root, nombre).
+    Regresa (nombres, error) para no depender de excepciones pickleables.
+    """
+    media_root, source_name = job
+    try:
+        return generate_variants(media_root, source_name), None
+    except Exception as exc:  # noqa
+        return None, f'{type(exc).__name__}: {exc}'
+
+
+def delete_variants(storage, source_name):
+    """Borra las variantes de una imagen"""
+    for variant in IMAGE_VARIANT_SIZES:
+        storage.delete(variant_name(source_name, variant))
@@ -0,0 +1,57 @@
+"""
+Comando en Django para encolar variantes de imágenes ya existentes.
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.models import IMAGE_VARIANT_FIELDS, ImageVariantJob
+
+
+class Command(BaseCommand):
+    """Comando Django para encolar las imágenes sin variantes."""
+
+    help = 'Encola las imágenes subidas que todavía no tienen variantes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenera también las imágenes que ya tienen variantes.',
+        )
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        queued = set(
+            ImageVariantJob.objects.filter(
+                status__in=[ImageVariantJob.PENDING, ImageVariantJob.RUNNING],
+            ).values_list('model_name', 'object_id', 'field')
+        )
+
+        jobs = []
+        for model_name, fields in IMAGE_VARIANT_FIELDS.items():
+            model = apps.get_model('core', model_name)
+            for field, targets in fields.items():
+                rows = model.objects.exclude(
+                    Q(**{field: ''}) | Q(**{f'{field}__isnull': True})
+                )
+                if not options['all']:
+                    missing = Q()
+                    for target in targets.values():
+                        missing |= Q(**{target: ''})
+                        missing |= Q(**{f'{target}__isnull': True})
+                    rows = rows.filter(missing)
+                for pk, name in rows.values_list('pk', field).iterator():
+                    if (model_name, pk, field) in queued:
+                        continue
+                    jobs.append(ImageVariantJob(
+                        model_name=model_name,
+                        object_id=pk,
+                        field=field,
+                        source_name=name,
+                    ))
+
+        ImageVariantJob.objects.bulk_create(jobs, batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(
+            f'Queued {len(jobs)} image variant jobs.'
+        ))
@@ -0,0 +1,59 @@
+"""
+Comando en Django para medir los listados con EXPLAIN ANALYZE.
+"""
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.benchmark import (
+    drop_benchmark_indexes,
+    run_benchmark,
+    seed_responses,
+)
+
+
+class Command(BaseCommand):
+    """Comando Django para comparar los listados con y sin índices."""
+
+    help = (
+        'Corre EXPLAIN ANALYZE de los listados con los índices de 0006 y '
+        'sin ellos. Todo pasa en una transacción que se revierte (incluidos '
+        '--seed y el DROP INDEX), pero el DROP INDEX bloquea las tablas: '
+        'usar sólo contra una base de benchmark.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Respuestas sintéticas a crear antes de medir.',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', help='Archivo JSON de resultados.')
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        with transaction.atomic():
+            if options['seed']:
+                seed_responses(options['seed'])
+            after = run_benchmark(options['repeat'])
+            drop_benchmark_indexes()
+            before = run_benchmark(options['repeat'])
+            transaction.set_rollback(True)
+
+        results = {
+            name: {'before': before[name], 'after': after[name]}
+            for name in after
+        }
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:36} {result['before']['ms']:>10.3f} ms"
+                f" -> {result['after']['ms']:>10.3f} ms"
+                f"  {', '.join(result['after']['indexes'])}"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+        self.stdout.write(self.style.SUCCESS('Benchmark finished.'))
@@ -0,0 +1,34 @@
+"""
+Comando en Django para borrar archivos deduplicados sin referencias.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.storage import MediaStorage, collect_unreferenced
+
+
+class Command(BaseCommand):
+    """Comando Django para recolectar los MediaBlob sin referencias."""
+
+    help = (
+        'Borra los archivos deduplicados que quedaron sin referencias '
+        '(guardados que fallaron después de escribir el archivo).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=60,
+            help='Minutos desde que se creó el archivo (default 60).',
+        )
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        collected = collect_unreferenced(MediaStorage(), cutoff)
+        self.stdout.write(self.style.SUCCESS(
+            f'Collected {collected} unreferenced media files.'
+        ))
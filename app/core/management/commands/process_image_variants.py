@@ -0,0 +1,148 @@
+"""
+Comando en Django para generar las variantes de las imágenes subidas.
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.images import run_variant_job
+from core.models import IMAGE_VARIANT_FIELDS, ImageVariantJob
+
+
+class InlineExecutor:
+    """Ejecuta las tareas en el mismo proceso (``--processes 0``)"""
+
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+    def shutdown(self):
+        pass
+
+
+class Command(BaseCommand):
+    """Comando Django para procesar la cola de variantes de imagen."""
+
+    help = 'Genera miniaturas y variantes medianas de las imágenes en cola.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.IMAGE_VARIANT_PROCESSES,
+            help='Procesos de Pillow; 0 procesa en el mismo proceso.',
+        )
+        parser.add_argument('--batch', type=int, default=20)
+        parser.add_argument('--poll', type=float, default=2.0)
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Vacía la cola y termina.',
+        )
+        parser.add_argument(
+            '--stale-minutes',
+            type=int,
+            default=15,
+            help='Reencola tareas "running" de un worker que murió.',
+        )
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        self.requeue_stale(options['stale_minutes'])
+
+        if options['processes'] > 0:
+            # spawn: los hijos no heredan las conexiones a la base de datos
+            executor = ProcessPoolExecutor(
+                max_workers=options['processes'],
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        else:
+            executor = InlineExecutor()
+
+        done = 0
+        try:
+            while True:
+                jobs = self.claim(options['batch'])
+                if jobs:
+                    done += self.run(executor, jobs)
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            executor.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {done} image variant jobs.'
+        ))
+
+    def requeue_stale(self, minutes):
+        cutoff = timezone.now() - timedelta(minutes=minutes)
+        ImageVariantJob.objects.filter(
+            status=ImageVariantJob.RUNNING,
+            updated_at__lt=cutoff,
+        ).update(status=ImageVariantJob.PENDING)
+
+    def claim(self, batch):
+        """Toma tareas pendientes sin bloquear a otros workers"""
+        with transaction.atomic():
+            jobs = list(
+                ImageVariantJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(status=ImageVariantJob.PENDING)
+                .order_by('id')[:batch]
+            )
+            ImageVariantJob.objects.filter(
+                id__in=[job.id for job in jobs],
+            ).update(
+                status=ImageVariantJob.RUNNING,
+                attempts=F('attempts') + 1,
+                updated_at=timezone.now(),
+            )
+        for job in jobs:
+            job.attempts += 1
+        return jobs
+
+    def run(self, executor, jobs):
+        results = executor.map(
+            run_variant_job,
+            [(str(settings.MEDIA_ROOT), job.source_name) for job in jobs],
+        )
+        for job, (names, error) in zip(jobs, results):
+            if error:
+                self.fail(job, error)
+            else:
+                self.apply(job, names)
+        return len(jobs)
+
+    def apply(self, job, names):
+        """Guarda las variantes si la fila aún apunta a la misma imagen"""
+        model = apps.get_model('core', job.model_name)
+        targets = IMAGE_VARIANT_FIELDS[job.model_name][job.field]
+        model.objects.filter(
+            pk=job.object_id,
+            **{job.field: job.source_name},
+        ).update(**{
+            targets[variant]: name for variant, name in names.items()
+        })
+        job.status = ImageVariantJob.DONE
+        job.error = ''
+        job.save(update_fields=['status', 'error', 'updated_at'])
+
+    def fail(self, job, error):
+        if job.attempts >= settings.IMAGE_VARIANT_MAX_ATTEMPTS:
+            job.status = ImageVariantJob.FAILED
+        else:
+            job.status = ImageVariantJob.PENDING
+        job.error = error
+        job.save(update_fields=['status', 'error', 'updated_at'])
+        self.stderr.write(f'{job}: {error}')
@@ -0,0 +1,97 @@
+"""
+Comando en Django para sembrar datos sintéticos a escala.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.cache import bump_namespace
+from core.models import ActivityResponse
+from core.seeding import SEED_PASSWORD, seed_benchmark_data
+from methodology.tree import (
+    ACTIVITIES_CACHE_NAMESPACE,
+    FORMS_QUESTIONS_CACHE_NAMESPACE,
+)
+from user.analytics import SCORES_CACHE_NAMESPACE
+
+
+class Command(BaseCommand):
+    """Comando Django para sembrar usuarios, catálogo y respuestas."""
+
+    help = (
+        'Crea N usuarios con datos personales, scores, respuestas a M '
+        'actividades, forms y módulos completados, con COPY por tandas y '
+        'una sola contraseña hasheada. Usar sólo en una base de benchmark.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument(
+            '--responses',
+            type=int,
+            default=20,
+            help='Respuestas de actividad por usuario.',
+        )
+        parser.add_argument('--modules', type=int, default=5)
+        parser.add_argument(
+            '--activities-per-module', type=int, default=10,
+        )
+        parser.add_argument('--questions', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Semilla del generador (mismos datos con la misma semilla).',
+        )
+        parser.add_argument(
+            '--password',
+            default=SEED_PASSWORD,
+            help='Contraseña de todos los usuarios sembrados.',
+        )
+        parser.add_argument(
+            '--media',
+            action='store_true',
+            help='Respuestas de imagen, video y audio con archivos de relleno.',  # noqa
+        )
+        parser.add_argument(
+            '--drop-off',
+            action='store_true',
+            help='Cada usuario responde entre 1 y --responses actividades.',
+        )
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        media_storage = None
+        if options['media']:
+            media_storage = ActivityResponse._meta.get_field(
+                'image_response',
+            ).storage
+
+        started = time.monotonic()
+        with transaction.atomic():
+            totals = seed_benchmark_data(
+                options['users'],
+                options['responses'],
+                modules=options['modules'],
+                activities_per_module=options['activities_per_module'],
+                questions=options['questions'],
+                batch_size=options['batch_size'],
+                seed=options['seed'],
+                password=options['password'],
+                media_storage=media_storage,
+                drop_off=options['drop_off'],
+            )
+        # las señales no corrieron con bulk_create y COPY
+        for namespace in (
+            ACTIVITIES_CACHE_NAMESPACE,
+            FORMS_QUESTIONS_CACHE_NAMESPACE,
+            SCORES_CACHE_NAMESPACE,
+        ):
+            bump_namespace(namespace)
+
+        summary = ', '.join(f'{count} {name}' for name, count in totals.items())  # noqa
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {summary} in {time.monotonic() - started:.1f} s.'
+        ))
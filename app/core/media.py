@@ -0,0 +1,188 @@
+"""
+Entrega de media protegida (X-Accel-Redirect)
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.apps import apps
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils.http import http_date, parse_http_date_safe
+
+from core.models import IMAGE_VARIANT_FIELDS, MEDIA_FILE_FIELDS
+
+
+RANGE_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+# Segmento de la URL y el modelo que guarda el archivo
+MEDIA_KINDS = {
+    'activity-response': 'ActivityResponse',
+    'photo': 'UserPhotoMedia',
+    'video': 'UserVideoMedia',
+}
+
+
+def media_fields(model_name):
+    """Campos de archivo de un modelo, incluyendo sus variantes"""
+    fields = list(MEDIA_FILE_FIELDS[model_name])
+    for targets in IMAGE_VARIANT_FIELDS.get(model_name, {}).values():
+        fields.extend(targets.values())
+    return fields
+
+
+def media_url(request, kind, pk, field):
+    """
+    URL con control de acceso de un archivo. Es la única que se expone: el
+    MEDIA_URL público no entrega archivos subidos.
+    """
+    url = reverse('media', args=[kind, pk, field])
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def resolve_media(user, kind, pk, field):
+    """
+    Devuelve el nombre del archivo si ``user`` puede verlo.
+
+    Cualquier otro caso es 404 para no revelar qué filas existen.
+    """
+    model_name = MEDIA_KINDS.get(kind)
+    if model_name is None or field not in media_fields(model_name):
+        raise Http404
+    model = apps.get_model('core', model_name)
+    row = model.objects.filter(pk=pk).values_list('user_id', field).first()
+    if row is None or not row[1]:
+        raise Http404
+    owner_id, name = row
+    if owner_id != user.id and not user.is_superuser:
+        raise Http404
+    return name
+
+
+def file_etag(stat):
+    """ETag con el mismo formato que genera nginx (mtime-tamaño en hex)"""
+    return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """
+    Regresa (inicio, fin) inclusivos del header ``Range`` o None si hay que
+    ignorarlo. Sólo se acepta un rango: con varios se entrega el archivo
+    completo, igual que nginx con ``max_ranges 1``. Un rango fuera del
+    archivo levanta ``RangeNotSatisfiable``.
+    """
+    if not header or ',' in header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        # un Range mal formado se ignora (RFC 9110)
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            raise RangeNotSatisfiable
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable
+    return start, min(end, size - 1)
+
+
+def if_range_matches(header, etag, mtime):
+    """
+    ``If-Range`` con el ETag o exactamente la fecha de modificación del
+    archivo (RFC 9110: una fecha sólo valida si coincide con Last-Modified)
+    """
+    if not header:
+        return True
+    if header.startswith('"'):
+        return header == etag
+    date = parse_http_date_safe(header)
+    return date is not None and date == int(mtime)
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as media_file:
+        media_file.seek(start)
+        while length > 0:
+            chunk = media_file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def file_response(request, path, content_type):
+    """Entrega el archivo desde Django con soporte de Range y ETag"""
+    stat = os.stat(path)
+    etag = file_etag(stat)
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    headers = request.headers
+    try:
+        byte_range = parse_range(headers.get('Range'), stat.st_size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+    if byte_range and not if_range_matches(
+        headers.get('If-Range'), etag, stat.st_mtime,
+    ):
+        byte_range = None
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            read_range(path, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
+
+
+def media_response(request, name):
+    """Respuesta que entrega el archivo ``name`` de MEDIA_ROOT"""
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if settings.MEDIA_X_ACCEL_REDIRECT:
+        # nginx manda el archivo con sendfile y resuelve Range, If-Range y
+        # ETag; Django no lee los bytes
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_X_ACCEL_PREFIX + quote(name)
+        )
+    else:
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        if not os.path.isfile(path):
+            raise Http404
+        response = file_response(request, path, content_type)
+    if response.status_code in (200, 206):
+        response['Content-Disposition'] = (
+            f"inline; filename*=UTF-8''{quote(os.path.basename(name))}"
+        )
+        response['Cache-Control'] = 'private, max-age=3600'
+    return response
@@ -0,0 +1,204 @@
+"""
+Métricas por ruta (latencia, estados y tamaño de respuesta) en formato
+de texto de Prometheus
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+
+# Límites superiores de los buckets de los histogramas
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (
+    100, 1000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000,
+)
+
+HISTOGRAMS = {
+    'sel4c_http_request_duration_seconds': (
+        'Request latency by route', ('route', 'method'), LATENCY_BUCKETS,
+    ),
+    'sel4c_http_response_size_bytes': (
+        'Response body size by route', ('route', 'method'), SIZE_BUCKETS,
+    ),
+}
+COUNTERS = {
+    'sel4c_http_responses_total': (
+        'Responses by route and status', ('route', 'method', 'status'),
+    ),
+}
+
+# Separador de los valores de las etiquetas en las llaves del JSON
+LABEL_SEPARATOR = '\t'
+
+
+def empty_histogram(buckets):
+    return {'buckets': [0] * len(buckets), 'sum': 0, 'count': 0}
+
+
+def merge_samples(target, source):
+    """Suma las muestras de ``source`` (de otro proceso) a ``target``"""
+    for name, series in source.get('counters', {}).items():
+        merged = target['counters'].setdefault(name, {})
+        for labels, value in series.items():
+            merged[labels] = merged.get(labels, 0) + value
+    for name, series in source.get('histograms', {}).items():
+        buckets = HISTOGRAMS[name][2]
+        merged = target['histograms'].setdefault(name, {})
+        for labels, histogram in series.items():
+            current = merged.setdefault(labels, empty_histogram(buckets))
+            current['buckets'] = [
+                a + b for a, b in zip(current['buckets'], histogram['buckets'])
+            ]
+            current['sum'] += histogram['sum']
+            current['count'] += histogram['count']
+    return target
+
+
+def escape_label(value):
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    return ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs)
+
+
+def format_bound(bound):
+    return repr(float(bound))
+
+
+def render_samples(samples):
+    """Texto de exposición de Prometheus (versión 0.0.4)"""
+    lines = []
+    for name, (help_text, label_names) in COUNTERS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        series = samples['counters'].get(name, {})
+        for labels, value in sorted(series.items()):
+            values = labels.split(LABEL_SEPARATOR)
+            lines.append(f'{name}{{{format_labels(label_names, values)}}} {value}')  # noqa
+    for name, (help_text, label_names, buckets) in HISTOGRAMS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        series = samples['histograms'].get(name, {})
+        for labels, histogram in sorted(series.items()):
+            values = labels.split(LABEL_SEPARATOR)
+            cumulative = 0
+            for bound, count in zip(buckets, histogram['buckets']):
+                cumulative += count
+                label_text = format_labels(
+                    label_names, values, [('le', format_bound(bound))],
+                )
+                lines.append(f'{name}_bucket{{{label_text}}} {cumulative}')
+            label_text = format_labels(label_names, values, [('le', '+Inf')])
+            lines.append(f'{name}_bucket{{{label_text}}} {histogram["count"]}')  # noqa
+            label_text = format_labels(label_names, values)
+            lines.append(f'{name}_sum{{{label_text}}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{{label_text}}} {histogram["count"]}')  # noqa
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRegistry:
+    """
+    Métricas del proceso.
+
+    Con ``METRICS_DIR`` cada proceso (worker de uWSGI o gunicorn) vuelca sus
+    muestras a ``<METRICS_DIR>/<pid>.json`` cada ``METRICS_FLUSH_SECONDS``;
+    como nadie más escribe ese archivo no hacen falta candados entre
+    procesos. ``collect`` suma los archivos de todos los workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._samples = {'counters': {}, 'histograms': {}}
+            self._last_flush = time.monotonic()
+
+    def _inc(self, name, labels, value=1):
+        series = self._samples['counters'].setdefault(name, {})
+        key = LABEL_SEPARATOR.join(labels)
+        series[key] = series.get(key, 0) + value
+
+    def _observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][2]
+        series = self._samples['histograms'].setdefault(name, {})
+        histogram = series.setdefault(
+            LABEL_SEPARATOR.join(labels), empty_histogram(buckets),
+        )
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                histogram['buckets'][index] += 1
+                break
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+    def observe_request(self, route, method, status, seconds, size):
+        """Registra una petición terminada"""
+        with self._lock:
+            labels = (route, method)
+            self._inc('sel4c_http_responses_total', labels + (str(status),))
+            self._observe('sel4c_http_request_duration_seconds', labels, seconds)  # noqa
+            self._observe('sel4c_http_response_size_bytes', labels, size)
+            flush = (
+                time.monotonic() - self._last_flush
+                >= settings.METRICS_FLUSH_SECONDS
+            )
+        if flush:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._samples))
+
+    def flush(self):
+        """Escribe las muestras del proceso en ``METRICS_DIR``"""
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        with self._lock:
+            data = json.dumps(self._samples)
+            self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', dir=directory, suffix='.tmp', delete=False,
+        ) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, os.path.join(directory, f'{os.getpid()}.json'))
+
+    def collect(self):
+        """Muestras de todos los procesos (las propias, al momento)"""
+        samples = self.snapshot()
+        directory = settings.METRICS_DIR
+        if not directory or not os.path.isdir(directory):
+            return samples
+        own = f'{os.getpid()}.json'
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json') or filename == own:
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as samples_file:
+                    merge_samples(samples, json.load(samples_file))
+            except (OSError, ValueError):
+                # un worker a medio escribir o recién borrado
+                continue
+        return samples
+
+    def render(self):
+        return render_samples(self.collect())
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:09
+
+import core.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_responseuploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('digest', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='activityresponse',
+            name='audio_response',
+            field=models.FileField(null=True, storage=core.storage.MediaStorage(), upload_to=core.models.activity_media_response_file_path),
+        ),
+        migrations.AlterField(
+            model_name='activityresponse',
+            name='image_response',
+            field=models.ImageField(null=True, storage=core.storage.MediaStorage(), upload_to=core.models.activity_media_response_file_path),
+        ),
+        migrations.AlterField(
+            model_name='activityresponse',
+            name='video_response',
+            field=models.FileField(null=True, storage=core.storage.MediaStorage(), upload_to=core.models.activity_media_response_file_path),
+        ),
+        migrations.AlterField(
+            model_name='userphotomedia',
+            name='photo',
+            field=models.ImageField(storage=core.storage.MediaStorage(), upload_to=core.models.activity_media_response_file_path),
+        ),
+        migrations.AlterField(
+            model_name='uservideomedia',
+            name='video',
+            field=models.FileField(storage=core.storage.MediaStorage(), upload_to=core.models.activity_media_response_file_path),
+        ),
+    ]
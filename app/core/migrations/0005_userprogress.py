@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_progress(apps, schema_editor):
+    """Llena el resumen con las respuestas y módulos existentes"""
+    ActivityResponse = apps.get_model('core', 'ActivityResponse')
+    ModuleResponseCompletion = apps.get_model(
+        'core', 'ModuleResponseCompletion',
+    )
+    UserProgress = apps.get_model('core', 'UserProgress')
+
+    progress = {}
+    # la actividad de la última respuesta sale en la misma consulta
+    last_activity = ActivityResponse.objects.filter(
+        user_id=models.OuterRef('user_id'),
+    ).order_by('-id').values('activity_id')[:1]
+    responses = ActivityResponse.objects.values('user_id').annotate(
+        answered=models.Count('id'),
+        minutes=models.Sum('time_minutes'),
+        last_activity_id=models.Subquery(last_activity),
+    ).order_by()
+    for row in responses:
+        progress[row['user_id']] = UserProgress(
+            user_id=row['user_id'],
+            answered_activities=row['answered'],
+            total_time_minutes=row['minutes'] or 0,
+            last_activity_id=row['last_activity_id'],
+        )
+    modules = ModuleResponseCompletion.objects.filter(
+        completed=True,
+    ).values('user_id').annotate(completed=models.Count('id')).order_by()
+    for row in modules:
+        item = progress.setdefault(
+            row['user_id'], UserProgress(user_id=row['user_id']),
+        )
+        item.completed_modules = row['completed']
+    UserProgress.objects.bulk_create(progress.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_imagevariants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answered_activities', models.IntegerField(default=0)),
+                ('completed_modules', models.IntegerField(default=0)),
+                ('total_time_minutes', models.IntegerField(default=0)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('last_activity', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.activity')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(populate_progress, migrations.RunPython.noop),
+    ]
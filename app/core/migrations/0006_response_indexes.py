@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:36
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no bloquea escrituras en tablas grandes
+    atomic = False
+
+    dependencies = [
+        ('core', '0005_userprogress'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='activityresponse',
+            index=models.Index(fields=['activity', 'user', 'id'], name='actresp_activity_user_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='activityresponse',
+            index=models.Index(condition=models.Q(('response_type', 'text'), _negated=True), fields=['response_type', 'user', 'id'], name='actresp_media_type_user_idx'),
+        ),
+    ]
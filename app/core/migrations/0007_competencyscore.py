@@ -0,0 +1,159 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:13
+
+import logging
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+SCORE_FIELDS = (
+    'self_control_score',
+    'leadership_score',
+    'consciousness_and_social_value_score',
+    'social_innovation_and_financial_sustainability_score',
+    'systemic_thinking_score',
+    'scientific_thinking_score',
+    'critical_thinking_score',
+    'innovative_thinking_score',
+)
+# (modelo anterior, fase en CompetencyScore)
+PHASES = (('UserInitialScore', 1), ('UserFinalScore', 2))
+
+logger = logging.getLogger(__name__)
+
+
+def clamp_scores(row, phase):
+    """
+    Scores de ``row`` dentro de 0-100 (la restricción nueva). Cada valor
+    ajustado se registra con su valor original para poder revisarlo.
+    """
+    scores = {}
+    for field in SCORE_FIELDS:
+        value = row[field]
+        scores[field] = min(100, max(0, value))
+        if scores[field] != value:
+            logger.warning(
+                'Score out of range: user %s, phase %s, %s=%s stored as %s',
+                row['user_id'], phase, field, value, scores[field],
+            )
+    return scores
+
+
+def copy_scores(apps, schema_editor):
+    """
+    Copia ambas tablas de scores a CompetencyScore. Los scores fuera de
+    0-100 se ajustan y se registran en el log con un total al final.
+    """
+    CompetencyScore = apps.get_model('core', 'CompetencyScore')
+    clamped = 0
+    for model_name, phase in PHASES:
+        model = apps.get_model('core', model_name)
+        rows = []
+        for row in model.objects.values('user_id', *SCORE_FIELDS).iterator():
+            scores = clamp_scores(row, phase)
+            if scores != {field: row[field] for field in SCORE_FIELDS}:
+                clamped += 1
+            rows.append(CompetencyScore(
+                user_id=row['user_id'], phase=phase, **scores,
+            ))
+            if len(rows) == 1000:
+                CompetencyScore.objects.bulk_create(rows)
+                rows = []
+        CompetencyScore.objects.bulk_create(rows)
+    if clamped:
+        logger.warning(
+            '%d score rows had values outside 0-100 and were clamped; '
+            'review the rows logged above',
+            clamped,
+        )
+
+
+def restore_scores(apps, schema_editor):
+    """Regresa los scores de CompetencyScore a una tabla por fase"""
+    CompetencyScore = apps.get_model('core', 'CompetencyScore')
+    for model_name, phase in PHASES:
+        model = apps.get_model('core', model_name)
+        model.objects.bulk_create(
+            (
+                model(user_id=row['user_id'], **{
+                    field: row[field] for field in SCORE_FIELDS
+                })
+                for row in CompetencyScore.objects.filter(
+                    phase=phase,
+                ).values('user_id', *SCORE_FIELDS).iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_response_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompetencyScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phase', models.PositiveSmallIntegerField(choices=[(1, 'initial'), (2, 'final')])),
+                ('self_control_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('leadership_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('consciousness_and_social_value_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('social_innovation_and_financial_sustainability_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('systemic_thinking_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('scientific_thinking_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('critical_thinking_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('innovative_thinking_score', models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(100), django.core.validators.MinValueValidator(0)])),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='competency_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='competencyscore',
+            constraint=models.UniqueConstraint(fields=('user', 'phase'), name='competencyscore_user_phase'),
+        ),
+        migrations.AddConstraint(
+            model_name='competencyscore',
+            constraint=models.CheckConstraint(check=models.Q(('phase__in', [1, 2])), name='competencyscore_phase_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='competencyscore',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('self_control_score__range', (0, 100))), models.Q(('leadership_score__range', (0, 100))), models.Q(('consciousness_and_social_value_score__range', (0, 100))), models.Q(('social_innovation_and_financial_sustainability_score__range', (0, 100))), models.Q(('systemic_thinking_score__range', (0, 100))), models.Q(('scientific_thinking_score__range', (0, 100))), models.Q(('critical_thinking_score__range', (0, 100))), models.Q(('innovative_thinking_score__range', (0, 100)))), name='competencyscore_scores_range'),
+        ),
+        migrations.RunPython(copy_scores, restore_scores),
+        migrations.RemoveField(
+            model_name='userinitialscore',
+            name='user',
+        ),
+        migrations.DeleteModel(
+            name='UserFinalScore',
+        ),
+        migrations.DeleteModel(
+            name='UserInitialScore',
+        ),
+        migrations.CreateModel(
+            name='UserFinalScore',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('core.competencyscore',),
+        ),
+        migrations.CreateModel(
+            name='UserInitialScore',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('core.competencyscore',),
+        ),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:02
+
+import json
+
+from django.db import migrations, models
+
+
+# RFC 7386: las claves con null se borran, los objetos se mezclan
+# recursivamente y cualquier otro valor reemplaza al anterior.
+MERGE_PATCH_FUNCTION = '''
+CREATE OR REPLACE FUNCTION jsonb_merge_patch(target jsonb, patch jsonb)
+RETURNS jsonb LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    item record;
+BEGIN
+    IF jsonb_typeof(patch) IS DISTINCT FROM 'object' THEN
+        RETURN patch;
+    END IF;
+    IF jsonb_typeof(target) IS DISTINCT FROM 'object' THEN
+        target := '{}'::jsonb;
+    END IF;
+    FOR item IN SELECT key, value FROM jsonb_each(patch) LOOP
+        IF jsonb_typeof(item.value) = 'null' THEN
+            target := target - item.key;
+        ELSE
+            target := jsonb_set(
+                target,
+                ARRAY[item.key],
+                jsonb_merge_patch(target -> item.key, item.value)
+            );
+        END IF;
+    END LOOP;
+    RETURN target;
+END;
+$$;
+'''
+
+
+BATCH_SIZE = 1000
+
+
+def text_to_value(text):
+    """
+    Valor jsonb del texto guardado. Los objetos JSON se guardan como
+    objeto; cualquier otro texto (JSON o no) se guarda como la cadena
+    original, que es lo que la API regresa tal cual. NULL sigue siendo NULL.
+    """
+    if text is None:
+        return None
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return text
+    return value if isinstance(value, dict) else text
+
+
+def value_to_text(value):
+    if value is None:
+        return None
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def convert(model, source, target, function):
+    """Escribe ``function(source)`` en ``target`` por lotes de BATCH_SIZE"""
+    rows = []
+    for row in model.objects.only('pk', source).iterator(
+        chunk_size=BATCH_SIZE,
+    ):
+        setattr(row, target, function(getattr(row, source)))
+        rows.append(row)
+        if len(rows) == BATCH_SIZE:
+            model.objects.bulk_update(rows, [target])
+            rows = []
+    if rows:
+        model.objects.bulk_update(rows, [target])
+
+
+def text_to_json(apps, schema_editor):
+    """Convierte el texto guardado a JSON sin perder el texto original"""
+    UserUserDefaults = apps.get_model('core', 'UserUserDefaults')
+    convert(
+        UserUserDefaults, 'user_defaults', 'user_defaults_json',
+        text_to_value,
+    )
+
+
+def json_to_text(apps, schema_editor):
+    """Regresa el JSON a texto"""
+    UserUserDefaults = apps.get_model('core', 'UserUserDefaults')
+    convert(
+        UserUserDefaults, 'user_defaults_json', 'user_defaults',
+        value_to_text,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_competencyscore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useruserdefaults',
+            name='user_defaults_json',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(text_to_json, json_to_text),
+        migrations.RemoveField(
+            model_name='useruserdefaults',
+            name='user_defaults',
+        ),
+        migrations.RenameField(
+            model_name='useruserdefaults',
+            old_name='user_defaults_json',
+            new_name='user_defaults',
+        ),
+        migrations.RunSQL(
+            MERGE_PATCH_FUNCTION,
+            'DROP FUNCTION IF EXISTS jsonb_merge_patch(jsonb, jsonb);',
+        ),
+    ]
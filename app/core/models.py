@@ -14,6 +14,13 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 
+from core.storage import MediaStorage
+
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif']
+VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov']
+AUDIO_EXTENSIONS = ['.wav', '.mp3', '.ogg']
+
 
 def activity_media_response_file_path(instance, filename):
     """Genera la ruta del archivo para la nueva respuesta"""
@@ -21,11 +28,11 @@ def activity_media_response_file_path(instance, filename):
     filename = f'{uuid.uuid4()}{ext}'
 
     # Determina la carpeta destino en función del tipo de archivo
-    if ext in ['.jpg', '.jpeg', '.png', '.gif']:
+    if ext in IMAGE_EXTENSIONS:
         type = 'image'
-    elif ext in ['.mp4', '.avi', '.mov']:
+    elif ext in VIDEO_EXTENSIONS:
         type = 'video'
-    elif ext in ['.wav', '.mp3', '.ogg']:
+    elif ext in AUDIO_EXTENSIONS:
         type = 'audio'
     else:
         type = 'other'  # Otras extensiones de archivo
@@ -94,92 +101,117 @@ class UserData(models.Model):
         return self.user.email
 
 
-class UserInitialScore(models.Model):
-    """Objeto de Scores de Usuario"""
-    user = models.OneToOneField(
-        settings.AUTH_USER_MODEL,
-        unique=True,
-        on_delete=models.CASCADE,
-    )
-    self_control_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    leadership_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    consciousness_and_social_value_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    social_innovation_and_financial_sustainability_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    systemic_thinking_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    scientific_thinking_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    critical_thinking_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    innovative_thinking_score = models.IntegerField(
+# Competencias evaluadas en CompetencyScore
+COMPETENCY_SCORE_FIELDS = (
+    'self_control_score',
+    'leadership_score',
+    'consciousness_and_social_value_score',
+    'social_innovation_and_financial_sustainability_score',
+    'systemic_thinking_score',
+    'scientific_thinking_score',
+    'critical_thinking_score',
+    'innovative_thinking_score',
+)
+
+
+def _score_field():
+    return models.PositiveSmallIntegerField(
         default=0,
         validators=[MaxValueValidator(100), MinValueValidator(0)]
     )
 
-    def __str__(self):
-        return self.user.email
 
+class ScorePhase(models.IntegerChoices):
+    """Fase en la que se registró un score"""
+    INITIAL = 1, 'initial'
+    FINAL = 2, 'final'
 
-class UserFinalScore(models.Model):
-    """Objeto de Scores de Usuario"""
-    user = models.OneToOneField(
+
+class CompetencyScore(models.Model):
+    """
+    Scores de competencias de un usuario en una fase (inicial o final).
+    Ambas fases viven en la misma tabla, una fila por (usuario, fase).
+    """
+    user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
-        unique=True,
         on_delete=models.CASCADE,
+        related_name='competency_scores',
     )
-    self_control_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    leadership_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    consciousness_and_social_value_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    social_innovation_and_financial_sustainability_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    systemic_thinking_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    scientific_thinking_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    critical_thinking_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
-    innovative_thinking_score = models.IntegerField(
-        default=0,
-        validators=[MaxValueValidator(100), MinValueValidator(0)]
-    )
+    phase = models.PositiveSmallIntegerField(choices=ScorePhase.choices)
+    self_control_score = _score_field()
+    leadership_score = _score_field()
+    consciousness_and_social_value_score = _score_field()
+    social_innovation_and_financial_sustainability_score = _score_field()
+    systemic_thinking_score = _score_field()
+    scientific_thinking_score = _score_field()
+    critical_thinking_score = _score_field()
+    innovative_thinking_score = _score_field()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'phase'], name='competencyscore_user_phase',
+            ),
+            models.CheckConstraint(
+                check=models.Q(phase__in=ScorePhase.values),
+                name='competencyscore_phase_valid',
+            ),
+            models.CheckConstraint(
+                check=models.Q(*(
+                    models.Q(**{f'{field}__range': (0, 100)})
+                    for field in COMPETENCY_SCORE_FIELDS
+                )),
+                name='competencyscore_scores_range',
+            ),
+        ]
 
     def __str__(self):
-        return self.user.email
+        return f'{self.user.email} | {self.get_phase_display()}'
+
+
+class PhaseScoreQuerySet(models.QuerySet):
+    """Consultas sobre los scores de una sola fase"""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.phase = self.model.PHASE
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class PhaseScoreManager(models.Manager.from_queryset(PhaseScoreQuerySet)):
+    """Filtra CompetencyScore por la fase del modelo proxy"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(phase=self.model.PHASE)
+
+
+class PhaseScoreMixin:
+    """Fija la fase del modelo proxy al guardar"""
+
+    def save(self, *args, **kwargs):
+        self.phase = self.PHASE
+        super().save(*args, **kwargs)
+
+
+class UserInitialScore(PhaseScoreMixin, CompetencyScore):
+    """Objeto de Scores iniciales de Usuario"""
+    PHASE = ScorePhase.INITIAL
+
+    objects = PhaseScoreManager()
+
+    class Meta:
+        proxy = True
+
+
+class UserFinalScore(PhaseScoreMixin, CompetencyScore):
+    """Objeto de Scores finales de Usuario"""
+    PHASE = ScorePhase.FINAL
+
+    objects = PhaseScoreManager()
+
+    class Meta:
+        proxy = True
 
 
 class FormsQuestion(models.Model):
@@ -239,16 +271,63 @@ class ActivityResponse(models.Model):
     )
     response_type = models.CharField(max_length=10, choices=RESPONSE_TYPES)
     string_response = models.TextField(null=True)
-    image_response = models.ImageField(null=True, upload_to=activity_media_response_file_path)  # noqa
-    video_response = models.FileField(null=True, upload_to=activity_media_response_file_path)  # noqa
-    audio_response = models.FileField(null=True, upload_to=activity_media_response_file_path)  # noqa
+    image_response = models.ImageField(null=True, upload_to=activity_media_response_file_path, storage=MediaStorage())  # noqa
+    video_response = models.FileField(null=True, upload_to=activity_media_response_file_path, storage=MediaStorage())  # noqa
+    audio_response = models.FileField(null=True, upload_to=activity_media_response_file_path, storage=MediaStorage())  # noqa
     time_minutes = models.IntegerField()
+    # Variantes reducidas de image_response (ver core.images)
+    image_thumbnail = models.ImageField(null=True, blank=True, editable=False)  # noqa
+    image_medium = models.ImageField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.user.email} | {self.activity.title} | ({self.response_type} response)"  # noqa
 
     class Meta:
         unique_together = ('user', 'activity')
+        # filtros de admins en ActivityResponseView, ordenados por usuario
+        # (y paginados por id). El de tipo excluye texto, que es la mayoría
+        # y ya se resuelve recorriendo el índice de user.
+        indexes = [
+            models.Index(fields=['activity', 'user', 'id'], name='actresp_activity_user_idx'),  # noqa
+            models.Index(
+                fields=['response_type', 'user', 'id'],
+                condition=~models.Q(response_type='text'),
+                name='actresp_media_type_user_idx',
+            ),
+        ]
+
+
+class ResponseUploadSession(models.Model):
+    """Objeto de Subida por Partes de una Respuesta de Video o Audio"""
+    RESPONSE_TYPES = (
+        ('video', 'Video'),
+        ('audio', 'Audio'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # noqa
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    activity = models.ForeignKey(
+        Activity,
+        on_delete=models.CASCADE,
+    )
+    response_type = models.CharField(max_length=10, choices=RESPONSE_TYPES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    time_minutes = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def partial_name(self):
+        """Ruta (relativa a MEDIA_ROOT) donde se acumulan las partes"""
+        return os.path.join('uploads', 'partial', f'{self.id}.part')
+
+    def __str__(self):
+        return f"{self.user.email} | {self.activity.title} | {self.offset}/{self.size} bytes"  # noqa
 
 
 class ModuleResponseCompletion(models.Model):
@@ -270,13 +349,41 @@ class ModuleResponseCompletion(models.Model):
         unique_together = ('user', 'parent_activity')
 
 
+class UserProgress(models.Model):
+    """
+    Objeto de Resumen de Progreso de Usuario. Se actualiza con cada
+    respuesta o módulo completado (ver response.progress).
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    answered_activities = models.IntegerField(default=0)
+    completed_modules = models.IntegerField(default=0)
+    total_time_minutes = models.IntegerField(default=0)
+    last_activity = models.ForeignKey(
+        Activity,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.email} | {self.answered_activities} activities | {self.completed_modules} modules"  # noqa
+
+
 class UserPhotoMedia(models.Model):
     """Objeto de Media de Usuario"""
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
-    photo = models.ImageField(null=False, upload_to=activity_media_response_file_path)  # noqa
+    photo = models.ImageField(null=False, upload_to=activity_media_response_file_path, storage=MediaStorage())  # noqa
+    # Variantes reducidas de photo (ver core.images)
+    photo_thumbnail = models.ImageField(null=True, blank=True, editable=False)  # noqa
+    photo_medium = models.ImageField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"User: {self.user.email} | Photo: {self.photo}"  # noqa
@@ -288,19 +395,89 @@ class UserVideoMedia(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
-    video = models.FileField(null=False, upload_to=activity_media_response_file_path)  # noqa
+    video = models.FileField(null=False, upload_to=activity_media_response_file_path, storage=MediaStorage())  # noqa
 
     def __str__(self):
         return f"User: {self.user.email} | Video: {self.video}"  # noqa
 
 
+class MediaBlob(models.Model):
+    """Objeto de Archivo de Media Deduplicado (guardado por su hash)"""
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} | {self.ref_count} references"
+
+
+# Campos de archivo cuyos archivos se cuentan en MediaBlob
+MEDIA_FILE_FIELDS = {
+    'ActivityResponse': ['image_response', 'video_response', 'audio_response'],  # noqa
+    'UserPhotoMedia': ['photo'],
+    'UserVideoMedia': ['video'],
+}
+
+
+# Campos de imagen y los campos donde se guardan sus variantes
+IMAGE_VARIANT_FIELDS = {
+    'ActivityResponse': {
+        'image_response': {
+            'thumbnail': 'image_thumbnail',
+            'medium': 'image_medium',
+        },
+    },
+    'UserPhotoMedia': {
+        'photo': {
+            'thumbnail': 'photo_thumbnail',
+            'medium': 'photo_medium',
+        },
+    },
+}
+
+
+class ImageVariantJob(models.Model):
+    """Objeto de Tarea Pendiente para Generar Variantes de una Imagen"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    model_name = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    field = models.CharField(max_length=50)
+    source_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)  # noqa
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.model_name} {self.object_id} | {self.field} | {self.status}"  # noqa
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+
 class UserUserDefaults(models.Model):
     """Objeto de Respuesta de Actividad"""
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
-    user_defaults = models.TextField(null=True)
+    # objeto JSON (jsonb); ver swiftcon.defaults para las escrituras parciales
+    user_defaults = models.JSONField(null=True)
 
     def __str__(self):
         return f"User Defaults of {self.user.email}"
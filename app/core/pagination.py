@@ -0,0 +1,181 @@
+"""
+Paginación por cursor (keyset) para las vistas de listas
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import (
+    ImproperlyConfigured,
+    ValidationError as DjangoValidationError,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def _field_attribute(field):
+    """Devuelve el atributo del modelo que guarda el valor de un ordering"""
+    name = field.lstrip('-')
+    if name.endswith('__id') and name.count('__') == 1:
+        return name[:-len('__id')] + '_id'
+    if '__' in name:
+        raise ImproperlyConfigured(
+            f'Keyset pagination cannot order by related field "{name}".'
+        )
+    return name
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación keyset opcional.
+
+    Sólo se activa cuando la petición envía ``cursor`` o ``page_size``, así
+    las respuestas sin esos parámetros siguen siendo la lista completa. El
+    cursor guarda los valores del ordering del último registro (más el id
+    como desempate), por lo que cada página es un rango del índice en lugar
+    de un OFFSET.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 100
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and \
+                self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = self.decode_cursor(
+            params.get(self.cursor_query_param), queryset.model,
+        )
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(cursor))
+
+        page_size = self.get_page_size(request)
+        # se pide un registro de más para saber si hay otra página
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_ordering(self, queryset):
+        """Ordering del queryset con el id como desempate"""
+        ordering = [
+            field for field in queryset.query.order_by
+            if isinstance(field, str)
+        ] or list(queryset.model._meta.ordering)
+        if not {'id', 'pk', '-id', '-pk'} & set(ordering):
+            descending = ordering and ordering[-1].startswith('-')
+            ordering.append('-id' if descending else 'id')
+        return ordering
+
+    def get_keyset_filter(self, values):
+        """Construye el filtro (a, b, ...) > (x, y, ...) del ordering"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+
+        # cota sobre la primera columna para que se use un rango del índice
+        first = self.ordering[0]
+        bound = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{bound}': values[0]}) & condition
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value in (None, ''):
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            page_size = 0
+        if page_size < 1:
+            raise ValidationError({
+                self.page_size_query_param: 'A positive integer is required.',
+            })
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, instance):
+        values = [
+            getattr(instance, _field_attribute(field))
+            for field in self.ordering
+        ]
+        data = json.dumps(values, cls=DjangoJSONEncoder).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii')
+
+    def decode_cursor(self, encoded, model):
+        """
+        Valores del cursor convertidos al tipo de cada campo del ordering.
+        Un cursor que no corresponde al ordering es 404.
+        """
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, ValueError, UnicodeError):
+            raise NotFound('Invalid cursor')
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound('Invalid cursor')
+        return [
+            self.decode_value(model, field, value)
+            for field, value in zip(self.ordering, values)
+        ]
+
+    def decode_value(self, model, field, value):
+        if value is None or isinstance(value, (list, dict)):
+            raise NotFound('Invalid cursor')
+        name = _field_attribute(field)
+        if name == 'pk':
+            model_field = model._meta.pk
+        else:
+            model_field = model._meta.get_field(name)
+        try:
+            return model_field.to_python(value)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound('Invalid cursor')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.page[-1]),
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor of the next page (enables pagination).',  # noqa
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Results per page (enables pagination).',
+                'schema': {'type': 'integer'},
+            },
+        ]
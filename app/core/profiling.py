@@ -0,0 +1,216 @@
+"""
+Medición por petición de consultas SQL, serialización y render
+"""
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.serializers import BaseSerializer
+
+from core.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Tiempos (en segundos) y consultas de una petición"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.render_seconds = 0.0
+        self.total_seconds = 0.0
+        self._serializer_depth = 0
+        self._render_started = None
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self.started
+
+    def server_timing(self):
+        """
+        Valor del header ``Server-Timing`` (duraciones en ms). El tiempo de
+        serializers sólo aparece si se está midiendo.
+        """
+        metrics = [
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"',  # noqa
+        ]
+        if serializer_timing_installed():
+            metrics.append(
+                f'serializer;dur={self.serializer_seconds * 1000:.1f}',
+            )
+        metrics.extend([
+            f'render;dur={self.render_seconds * 1000:.1f}',
+            f'total;dur={self.total_seconds * 1000:.1f}',
+        ])
+        return ', '.join(metrics)
+
+
+def current_profile():
+    """Perfil de la petición en curso o ``None`` fuera de una petición"""
+    return _current_profile.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """``execute_wrapper`` que cuenta y cronometra cada consulta"""
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_seconds += time.perf_counter() - started
+
+
+def serializer_timing_installed():
+    return getattr(BaseSerializer.data.fget, 'profiled', False)
+
+
+def install_serializer_timing():
+    """
+    Envuelve ``BaseSerializer.data`` para medir la serialización. Cambia
+    todos los serializers del proceso, así que sólo se instala con
+    ``REQUEST_PROFILE_SERIALIZERS``.
+
+    ``Serializer.data`` y ``ListSerializer.data`` llaman a esta propiedad,
+    así que basta con envolverla una vez; los serializers anidados sólo
+    suman el tiempo del más externo.
+    """
+    data = BaseSerializer.data
+    if serializer_timing_installed():
+        return
+
+    def timed_data(serializer):
+        profile = _current_profile.get()
+        if profile is None:
+            return data.fget(serializer)
+        profile._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            profile._serializer_depth -= 1
+            if not profile._serializer_depth:
+                profile.serializer_seconds += time.perf_counter() - started
+
+    timed_data.profiled = True
+    timed_data.original = data
+    BaseSerializer.data = property(timed_data, doc=data.__doc__)
+
+
+def uninstall_serializer_timing():
+    """Regresa ``BaseSerializer.data`` a la propiedad original"""
+    if serializer_timing_installed():
+        BaseSerializer.data = BaseSerializer.data.fget.original
+
+
+def route_name(request, default=None):
+    """Nombre de la ruta (``user:token``); ``default`` o la URL si no hay"""
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and match.view_name:
+        return match.view_name
+    return default or request.path
+
+
+def response_size(response):
+    if response.streaming:
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+def over_budget(profile):
+    return (
+        profile.queries > settings.REQUEST_QUERY_BUDGET
+        or profile.total_seconds * 1000 > settings.REQUEST_TIME_BUDGET_MS
+    )
+
+
+class RequestProfilingMiddleware:
+    """
+    Mide cada petición: consultas y tiempo en la base de datos (con el
+    ``execute_wrapper`` del backend), serialización y render.
+
+    Los superusuarios reciben las cifras en ``Server-Timing``; las
+    peticiones que pasan ``REQUEST_QUERY_BUDGET`` o
+    ``REQUEST_TIME_BUDGET_MS`` se registran con el nombre de la ruta.
+    Latencia, estado y tamaño van además a las métricas de core.metrics.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        request.profile = profile
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        request.profile = profile
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    def process_template_response(self, request, response):
+        profile = request.profile
+        profile._render_started = time.perf_counter()
+
+        def rendered(response):
+            profile.render_seconds += (
+                time.perf_counter() - profile._render_started
+            )
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, profile):
+        profile.finish()
+        # las URLs sin ruta comparten etiqueta para no crear series sin fin
+        registry.observe_request(
+            route_name(request, 'unmatched'),
+            request.method,
+            response.status_code,
+            profile.total_seconds,
+            response_size(response),
+        )
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_superuser:
+            response['Server-Timing'] = profile.server_timing()
+        if over_budget(profile):
+            logger.warning(
+                'Request over budget: %s %s (%s) %d queries, '
+                '%.1f ms db, %.1f ms serializer, %.1f ms render, '
+                '%.1f ms total',
+                request.method,
+                request.path,
+                route_name(request),
+                profile.queries,
+                profile.db_seconds * 1000,
+                profile.serializer_seconds * 1000,
+                profile.render_seconds * 1000,
+                profile.total_seconds * 1000,
+            )
+        return response
@@ -0,0 +1,331 @@
+"""
+Datos sintéticos a escala para benchmarks y pruebas de carga
+"""
+import csv
+import io
+import json
+import os
+import random
+from collections import Counter, namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.utils import timezone
+from PIL import Image
+
+from core.images import generate_variants
+from core.models import (
+    COMPETENCY_SCORE_FIELDS,
+    Activity,
+    ActivityResponse,
+    CompetencyScore,
+    FormsQuestion,
+    FormsQuestionResponse,
+    ModuleResponseCompletion,
+    ScorePhase,
+    UserData,
+    UserProgress,
+    UserUserDefaults,
+)
+
+
+# Contraseña de los usuarios sembrados (se hashea una sola vez)
+SEED_PASSWORD = 'benchmark'
+PLACEHOLDER_DIR = 'uploads/benchmark'
+
+COUNTRIES = ['Mexico', 'Colombia', 'Chile', 'Peru', 'Argentina', 'Spain']
+INSTITUTIONS = ['ITESM', 'UNAM', 'IPN', 'UDG', 'UANL', 'ITAM', 'UDLAP']
+DISCIPLINES = [
+    'Engineering', 'Business', 'Health', 'Social Sciences', 'Humanities',
+]
+DEGREES = ['Bachelor', 'Master', 'PhD']
+GENDERS = ['F', 'M', 'Other']
+THEMES = ['light', 'dark']
+
+Catalog = namedtuple('Catalog', ['modules', 'activities', 'questions'])
+
+
+def response_type_for(index):
+    """85% texto, 10% imagen, 4% video, 1% audio"""
+    bucket = index % 100
+    if bucket < 85:
+        return 'text'
+    if bucket < 95:
+        return 'image'
+    if bucket < 99:
+        return 'video'
+    return 'audio'
+
+
+def drop_off_plan(responses, activities):
+    """
+    Actividades que responde cada usuario para sumar ``responses``: como
+    en la app, muchos abandonan antes de terminar (el usuario i responde
+    las primeras 1..N actividades).
+    """
+    plan = []
+    total = 0
+    while total < responses:
+        answered = min(1 + (len(plan) * 7919) % activities, responses - total)
+        plan.append(answered)
+        total += answered
+    return plan
+
+
+def copy_rows(model, fields, rows):
+    """Carga ``rows`` en la tabla de ``model`` con COPY (CSV)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    if not count:
+        return 0
+    buffer.seek(0)
+    quote = connection.ops.quote_name
+    columns = ', '.join(
+        quote(model._meta.get_field(field).column) for field in fields
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {quote(model._meta.db_table)} ({columns}) '
+            f'FROM STDIN WITH (FORMAT csv)',
+            buffer,
+        )
+    return count
+
+
+def seed_catalog(modules=5, activities_per_module=10, questions=20,
+                 prefix='Benchmark'):
+    """
+    Módulos con sus sub-actividades y preguntas del forms. Los que ya
+    existen (por título) se reutilizan, así que sembrar varias veces no
+    duplica el catálogo.
+    """
+    module_titles = [f'{prefix} module {m}' for m in range(modules)]
+    Activity.objects.bulk_create(
+        [Activity(title=title) for title in module_titles],
+        ignore_conflicts=True,
+    )
+    module_objects = Activity.objects.in_bulk(module_titles, field_name='title')  # noqa
+
+    activity_titles = {
+        f'{prefix} activity {m}.{a}': module_objects[title]
+        for m, title in enumerate(module_titles)
+        for a in range(activities_per_module)
+    }
+    Activity.objects.bulk_create(
+        [
+            Activity(
+                title=title,
+                description='Synthetic benchmark activity.',
+                parent_activity=module,
+            )
+            for title, module in activity_titles.items()
+        ],
+        ignore_conflicts=True,
+    )
+    activity_objects = Activity.objects.in_bulk(
+        list(activity_titles), field_name='title',
+    )
+
+    question_texts = [f'{prefix} question {q}' for q in range(questions)]
+    existing = set(FormsQuestion.objects.filter(
+        question__in=question_texts,
+    ).values_list('question', flat=True))
+    FormsQuestion.objects.bulk_create([
+        FormsQuestion(question=text, description='From 1 to 5')
+        for text in question_texts
+        if text not in existing
+    ])
+    question_objects = {
+        question.question: question
+        for question in FormsQuestion.objects.filter(
+            question__in=question_texts,
+        ).order_by('id')
+    }
+
+    return Catalog(
+        [module_objects[title] for title in module_titles],
+        [activity_objects[title] for title in activity_titles],
+        [question_objects[text] for text in question_texts],
+    )
+
+
+def placeholder_media(storage):
+    """
+    Escribe una vez un archivo por tipo de respuesta (y las variantes de la
+    imagen) y regresa sus nombres; todas las respuestas sembradas los
+    comparten.
+    """
+    names = {
+        'image': f'{PLACEHOLDER_DIR}/placeholder.png',
+        'video': f'{PLACEHOLDER_DIR}/placeholder.mp4',
+        'audio': f'{PLACEHOLDER_DIR}/placeholder.mp3',
+    }
+    os.makedirs(storage.path(PLACEHOLDER_DIR), exist_ok=True)
+    image_path = storage.path(names['image'])
+    if not os.path.exists(image_path):
+        Image.new('RGB', (1280, 960), (32, 96, 160)).save(image_path)
+    for kind in ('video', 'audio'):
+        path = storage.path(names[kind])
+        if not os.path.exists(path):
+            with open(path, 'wb') as placeholder:
+                placeholder.write(b'\0' * 64 * 1024)
+    variants = generate_variants(storage.location, names['image'])
+    names['image_thumbnail'] = variants['thumbnail']
+    names['image_medium'] = variants['medium']
+    return names
+
+
+def seed_users(plan, catalog, batch_size=5000, seed=0, password='!',
+               media=None):
+    """
+    Crea un usuario por elemento de ``plan`` (cuántas actividades del
+    catálogo responde, en orden) con datos personales, scores inicial y
+    final, respuestas, forms, módulos completados, su progreso y sus user
+    defaults.
+
+    Los usuarios se crean con ``bulk_create`` (se necesitan sus ids) y
+    todo lo demás con COPY, por tandas de ``batch_size`` usuarios. Las
+    señales no corren: quien llame debe invalidar las caches.
+    """
+    User = get_user_model()
+    rng = random.Random(seed)
+    offset = User.objects.count()
+    now = timezone.now()
+    activities_per_module = len(catalog.activities) // len(catalog.modules)
+    totals = Counter()
+
+    for start in range(0, len(plan), batch_size):
+        batch = plan[start:start + batch_size]
+        users = User.objects.bulk_create([
+            User(
+                email=f'benchmark{offset + start + i}@example.com',
+                name=f'Benchmark {offset + start + i}',
+                password=password,
+            )
+            for i in range(len(batch))
+        ])
+        totals['users'] += len(users)
+
+        rows = {
+            'user_data': [], 'scores': [], 'responses': [],
+            'forms': [], 'modules': [], 'progress': [], 'defaults': [],
+        }
+        for i, (user, answered) in enumerate(zip(users, batch)):
+            rows['user_data'].append((
+                user.id, user.name, rng.choice(DEGREES),
+                rng.choice(INSTITUTIONS), rng.choice(GENDERS),
+                rng.randint(18, 45), rng.choice(COUNTRIES),
+                rng.choice(DISCIPLINES),
+            ))
+            initial = [rng.randint(20, 80) for _ in COMPETENCY_SCORE_FIELDS]
+            rows['scores'].append([user.id, ScorePhase.INITIAL, *initial])
+            rows['scores'].append([user.id, ScorePhase.FINAL, *(
+                min(100, max(0, score + rng.randint(-5, 25)))
+                for score in initial
+            )])
+
+            minutes = 0
+            for index, activity in enumerate(catalog.activities[:answered]):
+                response_type = response_type_for(start + i + index)
+                time_minutes = rng.randint(1, 30)
+                minutes += time_minutes
+                files = dict.fromkeys(
+                    ('image', 'video', 'audio', 'image_thumbnail',
+                     'image_medium'),
+                )
+                if media and response_type != 'text':
+                    files[response_type] = media[response_type]
+                    if response_type == 'image':
+                        files['image_thumbnail'] = media['image_thumbnail']
+                        files['image_medium'] = media['image_medium']
+                rows['responses'].append((
+                    user.id, activity.id, response_type,
+                    'Synthetic benchmark response.'
+                    if response_type == 'text' or not media else None,
+                    files['image'], files['video'], files['audio'],
+                    time_minutes, files['image_thumbnail'],
+                    files['image_medium'],
+                ))
+
+            for question in catalog.questions:
+                rows['forms'].append((
+                    user.id, question.id, rng.randint(1, 5),
+                    rng.randint(1, 3),
+                ))
+
+            completed = min(
+                answered // activities_per_module, len(catalog.modules),
+            )
+            for module in catalog.modules[:completed]:
+                rows['modules'].append((user.id, module.id, True))
+
+            rows['defaults'].append((user.id, json.dumps({
+                'theme': rng.choice(THEMES), 'volume': rng.randint(0, 10),
+            })))
+
+            if answered:
+                rows['progress'].append((
+                    user.id, answered, completed, minutes,
+                    catalog.activities[answered - 1].id, now, now,
+                ))
+
+        copy_rows(UserData, [
+            'user', 'full_name', 'academic_degree', 'institution', 'gender',
+            'age', 'country', 'discipline',
+        ], rows['user_data'])
+        copy_rows(CompetencyScore, ['user', 'phase', *COMPETENCY_SCORE_FIELDS], rows['scores'])  # noqa
+        totals['activity_responses'] += copy_rows(ActivityResponse, [
+            'user', 'activity', 'response_type', 'string_response',
+            'image_response', 'video_response', 'audio_response',
+            'time_minutes', 'image_thumbnail', 'image_medium',
+        ], rows['responses'])
+        totals['forms_responses'] += copy_rows(
+            FormsQuestionResponse,
+            ['user', 'question', 'score', 'time_minutes'],
+            rows['forms'],
+        )
+        totals['completed_modules'] += copy_rows(
+            ModuleResponseCompletion,
+            ['user', 'parent_activity', 'completed'],
+            rows['modules'],
+        )
+        copy_rows(UserProgress, [
+            'user', 'answered_activities', 'completed_modules',
+            'total_time_minutes', 'last_activity', 'last_activity_at',
+            'updated_at',
+        ], rows['progress'])
+        copy_rows(
+            UserUserDefaults, ['user', 'user_defaults'], rows['defaults'],
+        )
+
+    return totals
+
+
+def seed_benchmark_data(users, responses_per_user, modules=5,
+                        activities_per_module=10, questions=20,
+                        batch_size=5000, seed=0, password=SEED_PASSWORD,
+                        media_storage=None, drop_off=False):
+    """
+    Siembra ``users`` usuarios con ``responses_per_user`` respuestas cada
+    uno (con ``drop_off``, entre 1 y ``responses_per_user``). La
+    contraseña se hashea una sola vez para todos.
+    """
+    catalog = seed_catalog(modules, activities_per_module, questions)
+    responses_per_user = min(responses_per_user, len(catalog.activities))
+    if drop_off and responses_per_user:
+        plan = [1 + (i * 7919) % responses_per_user for i in range(users)]
+    else:
+        plan = [responses_per_user] * users
+    media = placeholder_media(media_storage) if media_storage else None
+
+    totals = seed_users(
+        plan, catalog, batch_size, seed, make_password(password), media,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return totals
@@ -0,0 +1,80 @@
+"""
+Señales del CORE
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save
+
+from core.models import (
+    IMAGE_VARIANT_FIELDS,
+    MEDIA_FILE_FIELDS,
+    ImageVariantJob,
+)
+from core.storage import add_reference, content_addressed, remove_reference
+
+
+def _media_names(instance):
+    return {
+        field: getattr(instance, field).name or None
+        for field in MEDIA_FILE_FIELDS[type(instance).__name__]
+    }
+
+
+def remember_media(sender, instance, **kwargs):
+    """Guarda los nombres de archivo con los que se cargó la fila"""
+    # una fila nueva todavía no referencia archivos guardados
+    instance._original_media = (
+        {} if instance.pk is None else _media_names(instance)
+    )
+
+
+def media_saved(sender, instance, **kwargs):
+    """Ajusta referencias y variantes de los archivos que cambiaron"""
+    original = getattr(instance, '_original_media', {})
+    current = _media_names(instance)
+    changed = {
+        field: (original.get(field), name)
+        for field, name in current.items()
+        if name != original.get(field)
+    }
+    instance._original_media = current
+
+    if content_addressed():
+        for field, (old, name) in changed.items():
+            if name:
+                add_reference(getattr(instance, field).storage, name)
+            if old:
+                remove_reference(getattr(instance, field).storage, old)
+
+    variant_fields = IMAGE_VARIANT_FIELDS.get(sender.__name__, {})
+    for field, targets in variant_fields.items():
+        if field not in changed:
+            continue
+        if not kwargs.get('created'):
+            # las variantes anteriores ya no corresponden a la imagen
+            cleared = {target: None for target in targets.values()}
+            sender.objects.filter(pk=instance.pk).update(**cleared)
+            for target in targets.values():
+                setattr(instance, target, None)
+        if current[field]:
+            ImageVariantJob.objects.create(
+                model_name=sender.__name__,
+                object_id=instance.pk,
+                field=field,
+                source_name=current[field],
+            )
+
+
+def release_media(sender, instance, **kwargs):
+    """Suelta las referencias de una fila borrada"""
+    if not content_addressed():
+        return
+    for field, name in _media_names(instance).items():
+        if name:
+            remove_reference(getattr(instance, field).storage, name)
+
+
+for model_name in MEDIA_FILE_FIELDS:
+    model = apps.get_model('core', model_name)
+    post_init.connect(remember_media, sender=model)
+    post_save.connect(media_saved, sender=model)
+    post_delete.connect(release_media, sender=model)
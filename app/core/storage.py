@@ -0,0 +1,194 @@
+"""
+Almacenamiento de media con deduplicación por contenido
+"""
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+from core.images import delete_variants
+
+
+HASH_BLOCK_SIZE = 64 * 1024
+
+
+def content_addressed():
+    return getattr(settings, 'MEDIA_CONTENT_ADDRESSED', False)
+
+
+def lock_name(name):
+    """
+    Candado de PostgreSQL sobre un nombre de archivo hasta el fin de la
+    transacción. Existe aunque no haya fila de MediaBlob, así que serializa
+    guardar, soltar la última referencia y borrar el archivo.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [name])
+
+
+@deconstructible
+class MediaStorage(FileSystemStorage):
+    """
+    Storage de las respuestas y media de usuario.
+
+    Con ``MEDIA_CONTENT_ADDRESSED`` el archivo se hashea (SHA-256) mientras
+    se escribe y se guarda como ``<carpeta>/<digest><ext>``: un archivo
+    repetido no vuelve a ocupar disco. Cada archivo tiene un ``MediaBlob``
+    que cuenta cuántas filas lo usan; al llegar a cero se borra. Sin la
+    opción se comporta como ``FileSystemStorage``.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        if content_addressed():
+            # el nombre final se decide en _save a partir del hash
+            return name
+        return super().get_available_name(name, max_length)
+
+    def _save(self, name, content):
+        if not content_addressed():
+            return super()._save(name, content)
+
+        tmp_path, digest, size = self._write_temporary(content.chunks())
+        return self._store(tmp_path, name, digest, size)
+
+    def save_local_file(self, path, name):
+        """Adopta un archivo ya escrito en disco moviéndolo (sin copiarlo)"""
+        if not content_addressed():
+            name = self.get_available_name(name)
+            final_path = self.path(name)
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(path, final_path)
+            return name
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as local_file:
+            for block in iter(lambda: local_file.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        return self._store(
+            path, name, digest.hexdigest(), os.path.getsize(path),
+        )
+
+    def digest_name(self, name, digest):
+        directory, filename = os.path.split(name)
+        ext = os.path.splitext(filename)[1]
+        return os.path.join(directory, f'{digest}{ext}')
+
+    def _write_temporary(self, chunks):
+        tmp_dir = self.path('.tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                digest.update(chunk)
+                tmp.write(chunk)
+                size += len(chunk)
+        return tmp.name, digest.hexdigest(), size
+
+    def _store(self, tmp_path, name, digest, size):
+        """Guarda el archivo bajo su hash o lo descarta si ya existe"""
+        from core.models import MediaBlob
+
+        name = self.digest_name(name, digest)
+        final_path = self.path(name)
+        with transaction.atomic():
+            # con el candado la fila no puede borrarse entre get_or_create y
+            # la decisión de reutilizar el archivo
+            lock_name(name)
+            MediaBlob.objects.get_or_create(
+                name=name,
+                defaults={'digest': digest, 'size': size},
+            )
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+        return name
+
+
+def add_reference(storage, name):
+    """
+    Suma una referencia al archivo ``name``. Si una ``remove_reference``
+    concurrente borró la fila después de ``_store``, se vuelve a crear y
+    el borrado pendiente del archivo ya no ocurre.
+    """
+    from core.models import MediaBlob
+
+    with transaction.atomic():
+        lock_name(name)
+        MediaBlob.objects.get_or_create(
+            name=name,
+            defaults={
+                'digest': os.path.splitext(os.path.basename(name))[0],
+                'size': storage.size(name) if storage.exists(name) else 0,
+            },
+        )
+        MediaBlob.objects.filter(name=name).update(
+            ref_count=F('ref_count') + 1,
+        )
+
+
+def remove_reference(storage, name):
+    """
+    Resta una referencia. Al soltar la última borra la fila y, sólo si la
+    transacción se confirma, el archivo y sus variantes.
+    """
+    from core.models import MediaBlob
+
+    with transaction.atomic():
+        lock_name(name)
+        blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+        if blob is None:
+            return
+        if blob.ref_count > 1:
+            blob.ref_count -= 1
+            blob.save(update_fields=['ref_count'])
+            return
+        blob.delete()
+        transaction.on_commit(lambda: delete_orphan(storage, name))
+
+
+def delete_orphan(storage, name):
+    """Borra el archivo ``name`` si ninguna fila de MediaBlob lo reclamó"""
+    from core.models import MediaBlob
+
+    with transaction.atomic():
+        lock_name(name)
+        if MediaBlob.objects.filter(name=name).exists():
+            return
+        storage.delete(name)
+        delete_variants(storage, name)
+
+
+def collect_unreferenced(storage, created_before):
+    """
+    Borra los MediaBlob sin referencias creados antes de
+    ``created_before`` (de guardados que fallaron después de ``_store``)
+    y sus archivos. Regresa cuántos borró.
+    """
+    from core.models import MediaBlob
+
+    names = MediaBlob.objects.filter(
+        ref_count=0, created_at__lt=created_before,
+    ).values_list('name', flat=True)
+    collected = 0
+    for name in list(names):
+        with transaction.atomic():
+            lock_name(name)
+            deleted, _ = MediaBlob.objects.filter(
+                name=name, ref_count=0,
+            ).delete()
+            if deleted:
+                collected += 1
+                transaction.on_commit(
+                    lambda name=name: delete_orphan(storage, name),
+                )
+    return collected
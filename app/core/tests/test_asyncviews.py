@@ -0,0 +1,140 @@
+"""
+Tests de las vistas async con el cliente ASGI
+"""
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+from core.authentication import token_cache
+from core.models import Activity, UserUserDefaults
+from core.views import HealthCheckView
+from methodology.views import ActivityViewSet
+from swiftcon.views import UserUserDefaultsKeysView
+
+
+class AsyncViewsTests(TestCase):
+    """Test de los caminos de lectura async"""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.reset_stats()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.headers = {'Authorization': f'Token {self.token.key}'}
+
+    async def test_health_check(self):
+        """Test del health check en modo async"""
+        res = await self.async_client.get(reverse('health-check'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {'healthy': True})
+
+    async def test_activity_list_and_tree(self):
+        """Test de la lista y el árbol de actividades en modo async"""
+        module = await Activity.objects.acreate(title='Module')
+        await Activity.objects.acreate(title='Sub', parent_activity=module)
+
+        res = await self.async_client.get(
+            reverse('methodology:activity-list'), headers=self.headers,
+        )
+        self.assertEqual(len(res.json()), 2)
+
+        res = await self.async_client.get(
+            reverse('methodology:activity-tree'), headers=self.headers,
+        )
+        self.assertEqual(res.json()[0]['sub_activities'][0]['title'], 'Sub')
+
+    async def test_activity_detail_not_found(self):
+        """Test que un id inexistente es 404"""
+        res = await self.async_client.get(
+            reverse('methodology:activity-detail', args=[999]),
+            headers=self.headers,
+        )
+
+        self.assertEqual(res.status_code, 404)
+
+    async def test_user_defaults(self):
+        """Test de la lectura async de user defaults"""
+        url = reverse('swiftcon:get/update user defaults')
+        res = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(res.status_code, 404)
+
+        await UserUserDefaults.objects.acreate(
+            user=self.user, user_defaults={'theme': 'dark'},
+        )
+        res = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['user_defaults'], '{"theme": "dark"}')
+
+    async def test_requires_token(self):
+        """Test que la autenticación sigue aplicando"""
+        res = await self.async_client.get(
+            reverse('swiftcon:get/update user defaults'),
+        )
+
+        self.assertEqual(res.status_code, 401)
+
+
+@override_settings(ASYNC_VIEWS=True)
+class AsyncModeTests(TestCase):
+    """Test de las vistas con ASYNC_VIEWS (bajo ASGI)"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        token = Token.objects.create(user=self.user)
+        self.factory = AsyncRequestFactory()
+        self.headers = {'Authorization': f'Token {token.key}'}
+
+    def test_only_async_under_asgi(self):
+        """Test que la vista sólo es corrutina con ASYNC_VIEWS"""
+        self.assertTrue(iscoroutinefunction(HealthCheckView.as_view()))
+
+        with self.settings(ASYNC_VIEWS=False):
+            self.assertFalse(iscoroutinefunction(HealthCheckView.as_view()))
+
+    async def test_async_handlers_are_awaited(self):
+        """Test que se usan los handlers async y no los síncronos"""
+        module = await Activity.objects.acreate(title='Module')
+        await Activity.objects.acreate(title='Sub', parent_activity=module)
+        view = ActivityViewSet.as_view({'get': 'tree'})
+
+        with mock.patch(
+            'methodology.views.get_activity_tree',
+            side_effect=AssertionError('sync handler'),
+        ):
+            res = await view(self.factory.get('/tree/', headers=self.headers))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data[0]['sub_activities'][0]['title'], 'Sub')
+
+    async def test_sync_handlers_run_in_thread(self):
+        """Test que los handlers sin versión async siguen funcionando"""
+        await UserUserDefaults.objects.acreate(
+            user=self.user, user_defaults={'theme': 'dark'},
+        )
+        view = UserUserDefaultsKeysView.as_view()
+
+        res = await view(self.factory.patch(
+            '/', {'theme': 'light'},
+            content_type='application/json', headers=self.headers,
+        ))
+        self.assertEqual(res.data, {'theme': 'light'})
+
+        res = await view(self.factory.get(
+            '/', {'keys': 'theme'}, headers=self.headers,
+        ))
+        self.assertEqual(res.data, {'theme': 'light'})
@@ -0,0 +1,152 @@
+"""
+Tests para la autenticación por token con cache
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import (
+    CACHED_USER_FIELDS,
+    CachedTokenAuthentication,
+    TokenCache,
+    token_cache,
+)
+
+
+ME_URL = reverse('user:me')
+TOKEN_URL = reverse('user:token')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test de la cache de tokens"""
+
+    def setUp(self):
+        token_cache.reset_stats()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def tearDown(self):
+        token_cache.reset_stats()
+
+    def test_second_request_skips_token_query(self):
+        """Test que la segunda petición no consulta token ni usuario"""
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['email'], self.user.email)
+        stats = token_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_cache_holds_no_credentials(self):
+        """Test que la cache sólo guarda campos del usuario sin contraseña"""
+        self.client.get(ME_URL)
+
+        cached = token_cache.get(self.token.key)
+
+        self.assertEqual(set(cached), set(CACHED_USER_FIELDS))
+        self.assertNotIn(self.user.password, cached.values())
+
+    def test_cached_user_loads_other_fields_on_demand(self):
+        """Test que el usuario de cache consulta los campos que no guarda"""
+        self.client.get(ME_URL)
+        user, token = CachedTokenAuthentication().authenticate_credentials(
+            self.token.key,
+        )
+
+        self.assertEqual(token.user, user)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('testpass123'))
+
+    def test_deactivate_user_invalidates_cache(self):
+        """Test que un usuario desactivado deja de autenticarse"""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client.get(ME_URL)
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin)
+        admin_client.delete(
+            reverse('user:deactivate-user', args=[self.user.id])
+        )
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_rotation_invalidates_old_key(self):
+        """Test que el token anterior deja de servir al rotarlo"""
+        self.client.get(ME_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = APIClient().post(
+                TOKEN_URL,
+                {'email': 'user@example.com', 'password': 'testpass123'},
+            )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotation_invalidates_after_commit(self):
+        """Test que la llave vieja sale de la cache después de rotarla"""
+        old_key = self.token.key
+        self.client.get(ME_URL)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            APIClient().post(
+                TOKEN_URL,
+                {'email': 'user@example.com', 'password': 'testpass123'},
+            )
+            self.assertNotEqual(Token.objects.get().key, old_key)
+            self.assertIsNotNone(token_cache.get(old_key))
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(token_cache.get(old_key))
+
+    def test_revocation_reaches_other_workers(self):
+        """Test que revocar un token lo quita también de otro proceso"""
+        other_worker = TokenCache()
+        key = self.token.key
+        self.client.get(ME_URL)
+        self.assertIsNotNone(other_worker.get(key))
+
+        self.token.delete()
+
+        self.assertIsNone(other_worker.get(key))
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_reaches_other_workers(self):
+        """Test que desactivar un usuario invalida la cache de otro proceso"""
+        other_worker = TokenCache()
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(other_worker.get(self.token.key))
+
+    def test_internal_stats_requires_admin(self):
+        """Test que los contadores sólo los ven los admins"""
+        res = self.client.get(reverse('internal-stats'))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(reverse('internal-stats'))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,39 @@
+"""
+Tests del benchmark de consultas
+"""
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from core.benchmark import BENCHMARK_INDEXES
+from core.models import ActivityResponse
+
+
+class BenchmarkQueriesCommandTests(TestCase):
+    """Test del comando benchmark_queries"""
+
+    def test_compares_and_rolls_back(self):
+        """Test que mide antes/después y no deja datos ni borra índices"""
+        output = os.path.join(tempfile.mkdtemp(), 'bench.json')
+
+        call_command(
+            'benchmark_queries', seed=200, repeat=1, output=output,
+            stdout=io.StringIO(),
+        )
+
+        with open(output) as results_file:
+            results = json.load(results_file)
+        self.assertIn('activity_responses:activity', results)
+        self.assertIn('ms', results['users_info']['before'])
+        self.assertFalse(ActivityResponse.objects.exists())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s)',
+                [list(BENCHMARK_INDEXES)],
+            )
+            self.assertEqual(len(cursor.fetchall()), len(BENCHMARK_INDEXES))
@@ -0,0 +1,54 @@
+"""
+Tests de los contadores de conexiones
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.db import connection_stats
+
+
+class ConnectionStatsTests(TestCase):
+    """Test del conteo de conexiones nuevas y reutilizadas"""
+
+    def setUp(self):
+        connection_stats.clear()
+
+    def test_requests_reuse_open_connection(self):
+        """Test que una petición con la conexión abierta cuenta como reuso"""
+        client = APIClient()
+
+        client.get(reverse('health-check'))
+        client.get(reverse('health-check'))
+
+        self.assertEqual(connection_stats.stats()['reuses'], 2)
+
+    def test_new_connection_is_counted(self):
+        """Test que abrir una conexión suma a connects y al tiempo"""
+        new_connection = connection.copy()
+        try:
+            new_connection.ensure_connection()
+        finally:
+            new_connection.close()
+
+        stats = connection_stats.stats()
+        self.assertEqual(stats['connects'], 1)
+        self.assertEqual(stats['closes'], 1)
+        self.assertGreater(stats['max_connect_seconds'], 0)
+
+    def test_internal_stats_include_connections(self):
+        """Test que los contadores aparecen en el endpoint interno"""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        res = client.get(reverse('internal-stats'))
+
+        self.assertIn('reuses', res.data['db_connections'])
+        self.assertIn('conn_max_age', res.data['db_connections'])
@@ -0,0 +1,159 @@
+"""
+Tests para la generación de variantes de imágenes
+"""
+import io
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core import models
+from response.serializers import ActivityResponseSerializer
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file(size=(2000, 1500), color='red'):
+    """Devuelve un PNG del tamaño pedido"""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return SimpleUploadedFile('photo.png', buffer.getvalue())
+
+
+def process_jobs():
+    call_command(
+        'process_image_variants', once=True, processes=0,
+        stdout=io.StringIO(), stderr=io.StringIO(),
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageVariantTests(TestCase):
+    """Test de la cola y el worker de variantes"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.activity = models.Activity.objects.create(title='Photo')
+
+    def _image_response(self, **params):
+        defaults = {
+            'user': self.user,
+            'activity': self.activity,
+            'response_type': 'image',
+            'image_response': image_file(),
+            'time_minutes': 1,
+        }
+        defaults.update(params)
+        return models.ActivityResponse.objects.create(**defaults)
+
+    def test_upload_queues_and_generates_variants(self):
+        """Test que subir una imagen genera miniatura y tamaño medio"""
+        response = self._image_response()
+        job = models.ImageVariantJob.objects.get()
+        self.assertEqual(job.status, models.ImageVariantJob.PENDING)
+
+        process_jobs()
+
+        response.refresh_from_db()
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.ImageVariantJob.DONE)
+        with Image.open(response.image_thumbnail.path) as thumbnail:
+            self.assertLessEqual(max(thumbnail.size), 256)
+        with Image.open(response.image_medium.path) as medium:
+            self.assertEqual(medium.size, (1024, 768))
+
+    def test_text_response_is_not_queued(self):
+        """Test que una respuesta sin imagen no encola nada"""
+        self._image_response(
+            response_type='text',
+            string_response='hello',
+            image_response=None,
+        )
+
+        self.assertFalse(models.ImageVariantJob.objects.exists())
+
+    def test_replacing_image_discards_stale_job(self):
+        """Test que una tarea vieja no pisa las variantes de otra imagen"""
+        response = self._image_response()
+        process_jobs()
+
+        response.image_response = image_file(color='blue')
+        response.save()
+
+        response.refresh_from_db()
+        self.assertFalse(response.image_thumbnail)
+        stale = models.ImageVariantJob.objects.order_by('id').first()
+        stale.status = models.ImageVariantJob.PENDING
+        stale.save()
+        process_jobs()
+
+        response.refresh_from_db()
+        self.assertIn(
+            os.path.splitext(os.path.basename(response.image_response.name))[0],  # noqa
+            response.image_thumbnail.name,
+        )
+
+    def test_invalid_image_fails_after_retries(self):
+        """Test que un archivo inválido termina como fallido"""
+        self._image_response(
+            image_response=SimpleUploadedFile('photo.png', b'not an image'),
+        )
+
+        for _ in range(3):
+            process_jobs()
+
+        job = models.ImageVariantJob.objects.get()
+        self.assertEqual(job.status, models.ImageVariantJob.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertTrue(job.error)
+
+    def test_backfill_queues_missing_variants(self):
+        """Test que el backfill encola sólo imágenes sin variantes"""
+        activities = [
+            models.Activity.objects.create(title=f'Photo {i}')
+            for i in range(2)
+        ]
+        self._image_response()
+        self._image_response(activity=activities[0])
+        process_jobs()
+        pending = self._image_response(activity=activities[1])
+        models.ImageVariantJob.objects.all().delete()
+
+        call_command('backfill_image_variants', stdout=io.StringIO())
+
+        job = models.ImageVariantJob.objects.get()
+        self.assertEqual(job.object_id, pending.id)
+        self.assertEqual(job.source_name, pending.image_response.name)
+
+    def test_serializer_exposes_variant_urls(self):
+        """Test que la respuesta serializada incluye las variantes"""
+        response = self._image_response()
+        process_jobs()
+        response.refresh_from_db()
+
+        data = ActivityResponseSerializer(response).data
+
+        self.assertTrue(response.image_thumbnail.name.endswith('__thumbnail.jpg'))  # noqa
+        self.assertEqual(
+            data['image_thumbnail'],
+            f'/sel4c/media/activity-response/{response.pk}/image_thumbnail/',
+        )
+        self.assertEqual(
+            data['image_medium'],
+            f'/sel4c/media/activity-response/{response.pk}/image_medium/',
+        )
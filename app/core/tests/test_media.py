@@ -0,0 +1,236 @@
+"""
+Tests para la entrega de media protegida
+"""
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import models
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def media_url(kind, pk, field):
+    return reverse('media', args=[kind, pk, field])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_X_ACCEL_REDIRECT=True)
+class ProtectedMediaTests(TestCase):
+    """Test de permisos y X-Accel-Redirect"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.video = models.UserVideoMedia.objects.create(
+            user=self.user,
+            video=SimpleUploadedFile('clip.mp4', b'0123456789'),
+        )
+        self.url = media_url('video', self.video.id, 'video')
+        self.client = APIClient()
+
+    def test_owner_gets_accel_redirect(self):
+        """Test que el dueño recibe el encabezado para nginx sin el cuerpo"""
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res['X-Accel-Redirect'],
+            f'/protected-media/{self.video.video.name}',
+        )
+        self.assertEqual(res['Content-Type'], 'video/mp4')
+        self.assertEqual(res.content, b'')
+
+    def test_superuser_can_access(self):
+        """Test que un superusuario ve la media de cualquier usuario"""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_other_user_gets_not_found(self):
+        """Test que otro usuario no puede ver la media"""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(other)
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('X-Accel-Redirect', res)
+
+    def test_auth_required(self):
+        """Test que la media requiere autenticación"""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_field(self):
+        """Test que sólo se sirven campos de archivo"""
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(media_url('video', self.video.id, 'user'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(MEDIA_X_ACCEL_REDIRECT=False)
+    def test_fallback_streams_file(self):
+        """Test que sin X-Accel-Redirect Django entrega el archivo"""
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(res.streaming_content), b'0123456789')
+        self.assertTrue(os.path.exists(self.video.video.path))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_X_ACCEL_REDIRECT=False)
+class RangeMediaTests(TestCase):
+    """Test de peticiones Range al entregar media desde Django"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.content = bytes(range(256)) * 4
+        self.video = models.UserVideoMedia.objects.create(
+            user=self.user,
+            video=SimpleUploadedFile('clip.mp4', self.content),
+        )
+        self.url = media_url('video', self.video.id, 'video')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _body(self, res):
+        return b''.join(res.streaming_content)
+
+    def test_full_response_advertises_ranges(self):
+        """Test que la respuesta completa incluye ETag y Accept-Ranges"""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        stat = os.stat(self.video.video.path)
+        self.assertEqual(
+            res['ETag'],
+            f'"{int(stat.st_mtime):x}-{stat.st_size:x}"',
+        )
+
+    def test_single_range(self):
+        """Test que un rango devuelve 206 con sólo esos bytes"""
+        res = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(res['Content-Range'], 'bytes 100-199/1024')
+        self.assertEqual(res['Content-Length'], '100')
+        self.assertEqual(self._body(res), self.content[100:200])
+
+    def test_open_and_suffix_ranges(self):
+        """Test rangos abiertos y de sufijo"""
+        res = self.client.get(self.url, HTTP_RANGE='bytes=1000-')
+        self.assertEqual(self._body(res), self.content[1000:])
+
+        res = self.client.get(self.url, HTTP_RANGE='bytes=-24')
+        self.assertEqual(res['Content-Range'], 'bytes 1000-1023/1024')
+        self.assertEqual(self._body(res), self.content[-24:])
+
+    def test_multiple_ranges_return_full_file(self):
+        """Test que varios rangos entregan el archivo completo, como nginx"""
+        res = self.client.get(self.url, HTTP_RANGE='bytes=0-10,20-30')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Content-Range', res)
+        self.assertEqual(self._body(res), self.content)
+
+    def test_range_past_end(self):
+        """Test que un rango fuera del archivo no se puede satisfacer"""
+        res = self.client.get(self.url, HTTP_RANGE='bytes=2000-')
+
+        self.assertEqual(
+            res.status_code,
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        )
+
+    def test_if_range_mismatch_returns_full_file(self):
+        """Test que un If-Range viejo ignora el Range"""
+        res = self.client.get(
+            self.url,
+            HTTP_RANGE='bytes=0-9',
+            HTTP_IF_RANGE='"0-0"',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._body(res), self.content)
+
+    def test_if_range_match(self):
+        """Test que un If-Range con el ETag actual respeta el Range"""
+        etag = self.client.get(self.url)['ETag']
+
+        res = self.client.get(
+            self.url,
+            HTTP_RANGE='bytes=0-9',
+            HTTP_IF_RANGE=etag,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(self._body(res), self.content[:10])
+
+    def test_if_range_date_must_match_exactly(self):
+        """Test que If-Range con fecha sólo respeta el Range si es exacta"""
+        mtime = os.stat(self.video.video.path).st_mtime
+
+        res = self.client.get(
+            self.url,
+            HTTP_RANGE='bytes=0-9',
+            HTTP_IF_RANGE=http_date(mtime + 60),
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._body(res), self.content)
+
+        res = self.client.get(
+            self.url,
+            HTTP_RANGE='bytes=0-9',
+            HTTP_IF_RANGE=http_date(mtime),
+        )
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(self._body(res), self.content[:10])
+
+    def test_if_none_match(self):
+        """Test que un ETag vigente devuelve 304"""
+        etag = self.client.get(self.url)['ETag']
+
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
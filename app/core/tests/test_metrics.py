@@ -0,0 +1,147 @@
+"""
+Tests de las métricas por ruta
+"""
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.metrics import MetricsRegistry, registry
+
+
+METRICS_URL = reverse('internal-metrics')
+ME_URL = reverse('user:me')
+
+
+def sample_lines(text, prefix):
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+@override_settings(METRICS_DIR=None)
+class MetricsRegistryTests(SimpleTestCase):
+    """Test del registro y su formato de Prometheus"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_is_cumulative(self):
+        """Test que los buckets acumulan y cuadran con _count y _sum"""
+        self.registry.observe_request('user:me', 'GET', 200, 0.003, 50)
+        self.registry.observe_request('user:me', 'GET', 200, 0.2, 5000)
+
+        text = self.registry.render()
+
+        prefix = 'sel4c_http_request_duration_seconds_bucket{route="user:me",method="GET",'  # noqa
+        self.assertIn(f'{prefix}le="0.005"}} 1', text)
+        self.assertIn(f'{prefix}le="0.1"}} 1', text)
+        self.assertIn(f'{prefix}le="0.25"}} 2', text)
+        self.assertIn(f'{prefix}le="+Inf"}} 2', text)
+        self.assertIn(
+            'sel4c_http_request_duration_seconds_count{route="user:me",method="GET"} 2',  # noqa
+            text,
+        )
+        self.assertIn(
+            'sel4c_http_responses_total{route="user:me",method="GET",status="200"} 2',  # noqa
+            text,
+        )
+
+    def test_label_values_are_escaped(self):
+        """Test que las comillas en las etiquetas se escapan"""
+        self.registry.observe_request('a"b', 'GET', 404, 0.01, 0)
+
+        text = self.registry.render()
+
+        self.assertIn('route="a\\"b"', text)
+
+    def test_collect_merges_worker_files(self):
+        """Test que se suman las muestras que volcó otro worker"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        other = MetricsRegistry()
+        with override_settings(METRICS_DIR=directory):
+            other.observe_request('user:token', 'POST', 200, 0.02, 100)
+            other.flush()
+            # el archivo del otro worker lleva otro pid
+            os.rename(
+                os.path.join(directory, f'{os.getpid()}.json'),
+                os.path.join(directory, '1.json'),
+            )
+            self.registry.observe_request('user:token', 'POST', 400, 0.01, 80)  # noqa
+
+            samples = self.registry.collect()
+
+        totals = samples['counters']['sel4c_http_responses_total']
+        self.assertEqual(totals['user:token\tPOST\t200'], 1)
+        self.assertEqual(totals['user:token\tPOST\t400'], 1)
+        durations = samples['histograms']['sel4c_http_request_duration_seconds']  # noqa
+        self.assertEqual(durations['user:token\tPOST']['count'], 2)
+
+    def test_flush_writes_process_file(self):
+        """Test que el volcado deja un JSON por proceso"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with override_settings(METRICS_DIR=directory, METRICS_FLUSH_SECONDS=0):  # noqa
+            self.registry.observe_request('user:me', 'GET', 200, 0.01, 10)
+
+        with open(os.path.join(directory, f'{os.getpid()}.json')) as dump:
+            data = json.load(dump)
+        self.assertIn('sel4c_http_responses_total', data['counters'])
+
+
+@override_settings(METRICS_DIR=None)
+class MetricsApiTests(TestCase):
+    """Test del endpoint de métricas"""
+
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+
+    def tearDown(self):
+        registry.clear()
+
+    def test_requires_admin(self):
+        """Test que las métricas sólo las ven los admins"""
+        self.client.force_authenticate(self.user)
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_requests_are_labelled_by_route(self):
+        """Test que cada petición se registra con el nombre de su ruta"""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(self.user)
+        self.client.get(ME_URL)
+        self.client.get('/does-not-exist/')
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        text = res.content.decode()
+        self.assertEqual(
+            sample_lines(text, 'sel4c_http_responses_total{route="user:me"'),
+            ['sel4c_http_responses_total{route="user:me",method="GET",status="200"} 1'],  # noqa
+        )
+        self.assertIn(
+            'sel4c_http_responses_total{route="unmatched",method="GET",status="404"} 1',  # noqa
+            text,
+        )
@@ -1,7 +1,9 @@
 """
 Tests para modelos
 """
+from importlib import import_module
 from unittest.mock import patch
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -134,6 +136,66 @@ class ModelTests(TestCase):
 
         self.assertEqual(str(formquestion_response), f"{user.email} | {formsquestion.question}")  # noqa
 
+    def test_phase_scores_share_one_table(self):
+        """Test que los scores inicial y final son filas de CompetencyScore"""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+        models.UserInitialScore.objects.create(user=user, leadership_score=40)
+        models.UserFinalScore.objects.bulk_create([
+            models.UserFinalScore(user=user, leadership_score=70),
+        ])
+
+        scores = models.CompetencyScore.objects.filter(user=user)
+        self.assertEqual(
+            dict(scores.values_list('phase', 'leadership_score')),
+            {models.ScorePhase.INITIAL: 40, models.ScorePhase.FINAL: 70},
+        )
+        self.assertEqual(
+            models.UserInitialScore.objects.get().leadership_score, 40,
+        )
+        self.assertEqual(
+            models.UserFinalScore.objects.get().leadership_score, 70,
+        )
+        self.assertEqual(
+            str(models.UserFinalScore.objects.get()), f'{user.email} | final',
+        )
+
+    def test_one_score_per_phase(self):
+        """Test que un usuario sólo tiene un score por fase"""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+        models.UserInitialScore.objects.create(user=user)
+
+        with self.assertRaises(IntegrityError):
+            models.UserInitialScore.objects.create(user=user)
+
+    def test_score_range_checked_in_database(self):
+        """Test que la base rechaza scores mayores a 100"""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+
+        with self.assertRaises(IntegrityError):
+            models.UserFinalScore.objects.create(user=user, leadership_score=101)  # noqa
+
+    def test_score_migration_logs_clamped_rows(self):
+        """Test que la migración de scores registra los valores ajustados"""
+        migration = import_module('core.migrations.0007_competencyscore')
+        row = dict.fromkeys(migration.SCORE_FIELDS, 50)
+        row.update(user_id=7, leadership_score=130)
+
+        with self.assertLogs(migration.__name__, 'WARNING') as logs:
+            scores = migration.clamp_scores(row, 1)
+
+        self.assertEqual(scores['leadership_score'], 100)
+        self.assertEqual(scores['self_control_score'], 50)
+        self.assertIn('user 7, phase 1, leadership_score=130', logs.output[0])
+
     @patch('core.models.uuid.uuid4')
     def test_response_file_name_uuid(self, mock_uuid):
         """Test generando path de imagen"""
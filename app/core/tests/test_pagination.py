@@ -0,0 +1,116 @@
+"""
+Tests para la paginación keyset de las listas
+"""
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Activity,
+    ActivityResponse,
+    FormsQuestion,
+)
+
+
+ACTIVITY_RESPONSES_URL = reverse('response:activityresponse-list')
+ACTIVITIES_URL = reverse('methodology:activity-list')
+FORMSQUESTIONS_URL = reverse('methodology:formsquestion-list')
+
+
+class KeysetPaginationTests(TestCase):
+    """Test de la paginación por cursor"""
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _collect(self, url, page_size):
+        """Recorre todas las páginas y devuelve los ids"""
+        res = self.client.get(url, {'page_size': page_size})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [item['id'] for item in res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            self.assertLessEqual(len(res.data['results']), page_size)
+            ids.extend(item['id'] for item in res.data['results'])
+        return ids
+
+    def test_unpaginated_without_params(self):
+        """Test que sin parámetros se devuelve la lista completa"""
+        for i in range(3):
+            FormsQuestion.objects.create(question=f'Question {i}?')
+
+        res = self.client.get(FORMSQUESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data, list)
+        self.assertEqual(len(res.data), 3)
+
+    def test_paginates_ties_on_user(self):
+        """Test que el cursor (user_id, id) no repite ni salta registros"""
+        users = [
+            get_user_model().objects.create_user(f'user{i}@example.com', 'pw')
+            for i in range(3)
+        ]
+        activities = [
+            Activity.objects.create(title=f'Activity {i}') for i in range(4)
+        ]
+        expected = []
+        for user in users:
+            for activity in activities:
+                expected.append(ActivityResponse.objects.create(
+                    user=user,
+                    activity=activity,
+                    response_type='text',
+                    string_response='response',
+                    time_minutes=1,
+                ).id)
+
+        ids = self._collect(ACTIVITY_RESPONSES_URL, page_size=5)
+
+        self.assertEqual(ids, expected)
+
+    def test_paginates_by_title(self):
+        """Test paginando actividades ordenadas por título"""
+        for title in ['b', 'd', 'a', 'c', 'e']:
+            Activity.objects.create(title=title)
+
+        ids = self._collect(ACTIVITIES_URL, page_size=2)
+
+        expected = list(
+            Activity.objects.order_by('title').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self):
+        """Test que un cursor inválido devuelve 404"""
+        res = self.client.get(ACTIVITIES_URL, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_must_match_ordering(self):
+        """Test que un cursor con otro número o tipo de valores es 404"""
+        cursors = [
+            {'title': 'A', 'id': 1},
+            ['A'],
+            ['A', 1, 2],
+            ['A', 'not-an-id'],
+            [['A'], 1],
+            [None, 1],
+        ]
+        for values in cursors:
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode())
+            res = self.client.get(ACTIVITIES_URL, {'cursor': cursor.decode()})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(res.data['detail'], 'Invalid cursor')
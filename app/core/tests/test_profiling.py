@@ -0,0 +1,105 @@
+"""
+Tests de la medición por petición (Server-Timing y presupuestos)
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core import profiling
+
+
+ME_URL = reverse('user:me')
+USERS_INFO_URL = reverse('user:all_user_info')
+
+
+def timing_metrics(header):
+    """Regresa {nombre: (duración, descripción)} de un Server-Timing"""
+    metrics = {}
+    for entry in header.split(','):
+        name, *params = entry.strip().split(';')
+        values = dict(param.split('=', 1) for param in params)
+        metrics[name] = (float(values['dur']), values.get('desc'))
+    return metrics
+
+
+class RequestProfilingTests(TestCase):
+    """Test del middleware de medición"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+
+    def test_server_timing_for_superuser(self):
+        """Test que un superusuario recibe consultas y tiempos"""
+        self.client.force_authenticate(self.admin)
+
+        res = self.client.get(ME_URL)
+
+        metrics = timing_metrics(res['Server-Timing'])
+        self.assertEqual(set(metrics), {'db', 'render', 'total'})
+        self.assertEqual(metrics['db'][1], '"0 queries"')
+        self.assertGreater(metrics['total'][0], 0)
+
+    def test_serializers_untouched_by_default(self):
+        """Test que sin la opción no se envuelve BaseSerializer.data"""
+        self.assertFalse(profiling.serializer_timing_installed())
+
+    def test_serializer_timing(self):
+        """Test que con la medición instalada se reporta la serialización"""
+        profiling.install_serializer_timing()
+        self.addCleanup(profiling.uninstall_serializer_timing)
+        self.client.force_authenticate(self.admin)
+
+        res = self.client.get(ME_URL)
+
+        metrics = timing_metrics(res['Server-Timing'])
+        self.assertIn('serializer', metrics)
+        profiling.uninstall_serializer_timing()
+        self.assertFalse(profiling.serializer_timing_installed())
+
+    def test_counts_queries(self):
+        """Test que el conteo coincide con las consultas ejecutadas"""
+        self.client.force_authenticate(self.admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(USERS_INFO_URL)
+
+        metrics = timing_metrics(res['Server-Timing'])
+        self.assertEqual(metrics['db'][1], f'"{len(queries)} queries"')
+
+    def test_no_header_for_regular_user(self):
+        """Test que los usuarios normales no ven Server-Timing"""
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(ME_URL)
+
+        self.assertNotIn('Server-Timing', res)
+
+    @override_settings(REQUEST_QUERY_BUDGET=0)
+    def test_logs_request_over_query_budget(self):
+        """Test que se registra la ruta de una petición sobre presupuesto"""
+        self.client.force_authenticate(self.admin)
+
+        with self.assertLogs('core.profiling', 'WARNING') as logs:
+            self.client.get(USERS_INFO_URL)
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('(user:all_user_info)', logs.output[0])
+
+    def test_within_budget_is_not_logged(self):
+        """Test que una petición dentro del presupuesto no se registra"""
+        self.client.force_authenticate(self.user)
+
+        with self.assertNoLogs('core.profiling', 'WARNING'):
+            self.client.get(ME_URL)
@@ -0,0 +1,427 @@
+"""
+Presupuestos de consultas SQL y de bytes de cada ruta de la API
+
+Las lecturas se miden con los datos iniciales y otra vez después de
+agregar más usuarios con todas sus respuestas: el número de consultas
+no puede cambiar y ambas mediciones deben quedar dentro del presupuesto.
+Las escrituras se miden una vez con todos los datos cargados. Si una ruta
+pasa su presupuesto probablemente se agregó una consulta por fila (N+1).
+"""
+import shutil
+import tempfile
+from importlib import import_module
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+
+from rest_framework.test import APIClient
+
+from core.models import (
+    COMPETENCY_SCORE_FIELDS,
+    Activity,
+    ResponseUploadSession,
+)
+from core.seeding import seed_catalog, seed_users
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+MODULES = 3
+ACTIVITIES_PER_MODULE = 4
+QUESTIONS = 10
+# usuarios sembrados al inicio y en cada crecimiento
+SEED_USERS = 8
+PAGE = {'page_size': 5}
+# identifican en READ_BUDGETS los objetos sembrados
+ACTIVITY = '<activity>'
+QUESTION = '<question>'
+MODULE = '<module>'
+
+# (ruta, args, query params, quién pide, consultas, bytes máximos).
+# ``None`` en bytes: la ruta regresa todas las filas por contrato (export
+# y el detalle de respuestas de admin) y sólo se acota el número de
+# consultas.
+READ_BUDGETS = [
+    ('user:me', [], {}, 'user', 0, 200),
+    ('user:info', [], {}, 'user', 1, 300),
+    ('user:all_user_info', [], PAGE, 'admin', 1, 6_000),
+    ('user:all_admin_info', [], {}, 'admin', 1, 200),
+    ('user:initial_scores', [], PAGE, 'admin', 1, 2_500),
+    ('user:initial_scores', [], {}, 'user', 1, 500),
+    ('user:final_scores', [], PAGE, 'admin', 1, 2_500),
+    ('user:score_analytics', [], {}, 'admin', 2, 5_000),
+    ('user:improvement_report', [], {}, 'admin', 1, 6_000),
+    ('methodology:activity-list', [], PAGE, 'user', 1, 1_000),
+    ('methodology:activity-detail', [ACTIVITY], {}, 'user', 1, 200),
+    ('methodology:activity-tree', [], {}, 'user', 1, 2_500),
+    ('methodology:formsquestion-list', [], PAGE, 'user', 1, 800),
+    ('methodology:formsquestion-detail', [QUESTION], {}, 'user', 1, 200),
+    ('methodology:sub-activities', [MODULE], PAGE, 'user', 2, 800),
+    ('response:activityresponse-list', [], PAGE, 'admin', 1, 2_000),
+    ('response:activityresponse-list', [], {}, 'user', 1, 4_000),
+    ('response:activityresponse-detail', [ACTIVITY], {}, 'user', 3, 400),
+    ('response:activityresponse-detail', [ACTIVITY], {}, 'admin', 3, None),
+    ('response:all forms responses', [], PAGE, 'admin', 1, 800),
+    ('response:all forms responses', [], {}, 'user', 1, 1_000),
+    ('response:complete activity module', [], PAGE, 'admin', 1, 800),
+    ('response:progress', [], {}, 'user', 1, 300),
+    ('response:export', ['activity'], {}, 'admin', 1, None),
+    ('swiftcon:get/update user defaults', [], {}, 'user', 1, 200),
+    ('swiftcon:user defaults keys', [], {}, 'user', 1, 100),
+    ('swiftcon:user defaults keys', [], {'keys': 'theme'}, 'user', 1, 100),
+]
+
+
+# rutas que se miden en los tests de escritura
+WRITE_ROUTES = {
+    'user:create', 'user:create_admin', 'user:deactivate-user',
+    'user:token', 'user:add_info',
+    'methodology:activity-detail', 'methodology:formsquestion-list',
+    'response:activityresponse-create-response',
+    'response:activityresponse-update-response',
+    'response:activityresponse-create-upload-session',
+    'response:upload-session', 'response:upload-session-finalize',
+    'response:user question response', 'response:bulk-forms-responses',
+    'response:complete activity module',
+    'swiftcon:post user defaults',
+}
+BUDGETED_URLCONFS = (
+    'user.urls', 'methodology.urls', 'response.urls', 'swiftcon.urls',
+)
+
+
+def route_names(patterns, namespace):
+    """Nombres de todas las rutas de una lista de urlpatterns"""
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns, namespace)
+        elif pattern.name:
+            names.add(f'{namespace}:{pattern.name}')
+    return names
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class QueryBudgetTests(TestCase):
+    """Test de presupuestos de consultas y bytes por ruta"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalog = seed_catalog(MODULES, ACTIVITIES_PER_MODULE, QUESTIONS)
+        cls.modules, cls.activities, cls.questions = cls.catalog
+        cls.grow()
+        cls.user = get_user_model().objects.order_by('id').first()
+        cls.admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.clients = {}
+        for kind, user in (('user', self.user), ('admin', self.admin)):
+            self.clients[kind] = APIClient()
+            self.clients[kind].force_authenticate(user)
+        self.anonymous = APIClient()
+
+    @classmethod
+    def grow(cls):
+        """Agrega otra tanda de usuarios con todas sus respuestas"""
+        seed_users([len(cls.activities)] * SEED_USERS, cls.catalog)
+
+    def url_args(self, names):
+        objects = {
+            ACTIVITY: self.activities[0].id,
+            QUESTION: self.questions[0].id,
+            MODULE: self.modules[0].id,
+        }
+        return [objects.get(name, name) for name in names]
+
+    def measure(self, request):
+        """Regresa (consultas, bytes, respuesta) de una petición"""
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            res = request()
+            if res.streaming:
+                body = b''.join(res.streaming_content)
+            else:
+                body = res.content
+        return len(queries), len(body), res
+
+    def assertWithinBudget(self, request, max_queries, max_bytes,
+                           status_code):
+        count, size, res = self.measure(request)
+        self.assertEqual(res.status_code, status_code, res.content[:500])
+        self.assertLessEqual(count, max_queries)
+        if max_bytes is not None:
+            self.assertLessEqual(size, max_bytes)
+        return res
+
+    def test_every_route_has_a_budget(self):
+        """Test que ninguna ruta de la API queda sin presupuesto"""
+        budgeted = {route[0] for route in READ_BUDGETS} | WRITE_ROUTES
+        for urlconf in BUDGETED_URLCONFS:
+            module = import_module(urlconf)
+            names = route_names(module.urlpatterns, module.app_name)
+            # la raíz navegable del router de DRF
+            names.discard(f'{module.app_name}:api-root')
+            with self.subTest(urlconf=urlconf):
+                self.assertEqual(names - budgeted, set())
+
+    def test_read_routes(self):
+        """Test que las lecturas no dependen del número de filas"""
+        measured = {}
+        for rounds in range(2):
+            for name, args, params, kind, max_queries, max_bytes in READ_BUDGETS:  # noqa
+                url = reverse(name, args=self.url_args(args))
+                count, size, res = self.measure(
+                    lambda: self.clients[kind].get(url, params),
+                )
+                key = (name, kind)
+                with self.subTest(route=name, who=kind, round=rounds):
+                    self.assertEqual(res.status_code, 200)
+                    self.assertLessEqual(count, max_queries)
+                    if max_bytes is not None:
+                        self.assertLessEqual(size, max_bytes)
+                    if key in measured:
+                        self.assertEqual(count, measured[key])
+                measured[key] = count
+            self.grow()
+
+    def test_user_create_and_token(self):
+        """Test del registro de usuarios, admins y tokens"""
+        payload = {
+            'email': 'new@example.com',
+            'password': 'testpass123',
+            'name': 'New',
+        }
+        self.grow()
+
+        self.assertWithinBudget(
+            lambda: self.anonymous.post(reverse('user:create'), payload),
+            2, 300, 201,
+        )
+        self.assertWithinBudget(
+            lambda: self.anonymous.post(reverse('user:token'), {
+                'email': payload['email'], 'password': payload['password'],
+            }),
+            7, 300, 200,
+        )
+        self.assertWithinBudget(
+            lambda: self.clients['admin'].post(
+                reverse('user:create_admin'),
+                dict(payload, email='newadmin@example.com'),
+            ),
+            2, 300, 201,
+        )
+
+    def test_user_profile_writes(self):
+        """Test de las escrituras del usuario, sus datos y scores"""
+        self.grow()
+        new_user = get_user_model().objects.create_user(
+            'fresh@example.com',
+            'testpass123',
+        )
+        client = APIClient()
+        client.force_authenticate(new_user)
+        info = {
+            'full_name': 'Fresh', 'academic_degree': 'Bachelor',
+            'institution': 'Institution 0', 'gender': 'F', 'age': 21,
+            'country': 'Country 0', 'discipline': 'Engineering',
+            'user': new_user.id,
+        }
+        scores = {field: 50 for field in COMPETENCY_SCORE_FIELDS}
+        scores['user'] = new_user.id
+
+        self.assertWithinBudget(
+            lambda: client.patch(reverse('user:me'), {'name': 'Renamed'}),
+            1, 300, 200,
+        )
+        self.assertWithinBudget(
+            lambda: client.post(reverse('user:add_info'), info),
+            1, 400, 201,
+        )
+        self.assertWithinBudget(
+            lambda: client.patch(reverse('user:info'), {'age': 22}),
+            2, 400, 200,
+        )
+        for name in ('user:initial_scores', 'user:final_scores'):
+            with self.subTest(route=name):
+                self.assertWithinBudget(
+                    lambda: client.post(reverse(name), scores),
+                    1, 600, 201,
+                )
+        self.assertWithinBudget(
+            lambda: self.clients['admin'].delete(
+                reverse('user:deactivate-user', args=[new_user.id]),
+            ),
+            2, 0, 204,
+        )
+
+    def test_catalog_writes(self):
+        """Test de las escrituras de actividades y preguntas"""
+        self.grow()
+        client = self.clients['admin']
+
+        res = self.assertWithinBudget(
+            lambda: client.post(
+                reverse('methodology:activity-list'),
+                {'title': 'New activity', 'parent_activity': self.modules[0].id},  # noqa
+            ),
+            3, 300, 201,
+        )
+        detail = reverse('methodology:activity-detail', args=[res.data['id']])  # noqa
+        self.assertWithinBudget(
+            lambda: client.patch(detail, {'description': 'Updated'}),
+            2, 300, 200,
+        )
+        self.assertWithinBudget(lambda: client.delete(detail), 7, 0, 204)
+        self.assertWithinBudget(
+            lambda: client.post(
+                reverse('methodology:formsquestion-list'),
+                {'question': 'New question'},
+            ),
+            1, 300, 201,
+        )
+
+    def test_response_writes(self):
+        """Test de las escrituras de respuestas, forms y módulos"""
+        self.grow()
+        new_user = get_user_model().objects.create_user(
+            'fresh@example.com',
+            'testpass123',
+        )
+        client = APIClient()
+        client.force_authenticate(new_user)
+        activity = self.activities[0]
+        text = {
+            'response_type': 'text',
+            'string_response': 'My answer',
+            'time_minutes': 3,
+        }
+
+        self.assertWithinBudget(
+            lambda: client.post(
+                reverse('response:activityresponse-create-response', args=[activity.id]),  # noqa
+                text,
+            ),
+            7, 400, 201,
+        )
+        self.assertWithinBudget(
+            lambda: client.put(
+                reverse('response:activityresponse-update-response', args=[activity.id]),  # noqa
+                dict(text, string_response='Edited'),
+            ),
+            5, 400, 200,
+        )
+        self.assertWithinBudget(
+            lambda: client.post(
+                reverse('response:user question response', args=[self.questions[0].id]),  # noqa
+                {'score': 4, 'time_minutes': 1},
+            ),
+            2, 300, 201,
+        )
+        self.assertWithinBudget(
+            lambda: client.post(
+                reverse('response:bulk-forms-responses'),
+                [
+                    {'question': question.id, 'score': 2, 'time_minutes': 1}
+                    for question in self.questions
+                ],
+                format='json',
+            ),
+            5, 1_000, 200,
+        )
+        self.assertWithinBudget(
+            lambda: client.post(
+                reverse('response:complete activity module', args=[self.modules[0].id]),  # noqa
+                {'completed': True},
+            ),
+            6, 300, 201,
+        )
+
+    def test_upload_session_routes(self):
+        """Test de la subida por partes de una respuesta de video"""
+        self.grow()
+        client = self.clients['user']
+        content = b'0' * 100
+        activity = Activity.objects.create(title='Video activity')
+
+        res = self.assertWithinBudget(
+            lambda: client.post(
+                reverse('response:activityresponse-create-upload-session', args=[activity.id]),  # noqa
+                {'response_type': 'video', 'filename': 'clip.mp4',
+                 'size': len(content), 'time_minutes': 2},
+            ),
+            2, 300, 201,
+        )
+        session_url = reverse('response:upload-session', args=[res.data['id']])  # noqa
+        self.assertWithinBudget(lambda: client.get(session_url), 1, 300, 200)  # noqa
+        self.assertWithinBudget(
+            lambda: client.put(
+                session_url,
+                content,
+                content_type='application/octet-stream',
+                HTTP_CONTENT_RANGE=f'bytes 0-{len(content) - 1}/{len(content)}',  # noqa
+            ),
+            4, 300, 200,
+        )
+        self.assertWithinBudget(
+            lambda: client.post(
+                reverse('response:upload-session-finalize', args=[res.data['id']]),  # noqa
+            ),
+            11, 400, 201,
+        )
+
+        other = ResponseUploadSession.objects.create(
+            user=self.user, activity=activity, response_type='video',
+            filename='clip.mp4', size=10, time_minutes=1,
+        )
+        self.assertWithinBudget(
+            lambda: client.delete(
+                reverse('response:upload-session', args=[other.id]),
+            ),
+            2, 0, 204,
+        )
+
+    def test_user_defaults_writes(self):
+        """Test de la creación y actualización de user defaults"""
+        self.grow()
+        new_user = get_user_model().objects.create_user(
+            'fresh@example.com',
+            'testpass123',
+        )
+        client = APIClient()
+        client.force_authenticate(new_user)
+
+        self.assertWithinBudget(
+            lambda: client.post(
+                reverse('swiftcon:post user defaults'),
+                {'user_defaults': '{"theme": "light"}'},
+            ),
+            1, 300, 201,
+        )
+        self.assertWithinBudget(
+            lambda: client.patch(
+                reverse('swiftcon:get/update user defaults'),
+                {'user_defaults': '{"theme": "dark"}'},
+            ),
+            2, 300, 200,
+        )
+        self.assertWithinBudget(
+            lambda: client.patch(
+                reverse('swiftcon:user defaults keys'),
+                {'theme': 'light'},
+                format='json',
+            ),
+            1, 100, 200,
+        )
@@ -0,0 +1,118 @@
+"""
+Tests del sembrado de datos sintéticos para benchmarks
+"""
+import io
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from core.models import (
+    Activity,
+    ActivityResponse,
+    FormsQuestion,
+    FormsQuestionResponse,
+    ModuleResponseCompletion,
+    UserData,
+    UserFinalScore,
+    UserInitialScore,
+    UserProgress,
+    UserUserDefaults,
+)
+from core.seeding import SEED_PASSWORD, seed_benchmark_data
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def seed(**options):
+    params = {
+        'users': 12, 'responses': 7, 'modules': 2,
+        'activities_per_module': 3, 'questions': 4, 'batch_size': 5,
+    }
+    params.update(options)
+    call_command('seed_benchmark_data', stdout=io.StringIO(), **params)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class SeedBenchmarkDataTests(TestCase):
+    """Test del comando seed_benchmark_data"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_seeds_users_with_all_their_data(self):
+        """Test que cada usuario tiene datos, scores, respuestas y progreso"""
+        seed()
+
+        users = get_user_model().objects.filter(email__startswith='benchmark')  # noqa
+        self.assertEqual(users.count(), 12)
+        self.assertEqual(UserData.objects.count(), 12)
+        self.assertEqual(UserInitialScore.objects.count(), 12)
+        self.assertEqual(UserFinalScore.objects.count(), 12)
+        # 7 respuestas pedidas, pero el catálogo sólo tiene 6 actividades
+        self.assertEqual(ActivityResponse.objects.count(), 12 * 6)
+        self.assertEqual(FormsQuestionResponse.objects.count(), 12 * 4)
+        self.assertEqual(ModuleResponseCompletion.objects.count(), 12 * 2)
+        self.assertEqual(UserUserDefaults.objects.count(), 12)
+        progress = UserProgress.objects.get(user=users.first())
+        self.assertEqual(progress.answered_activities, 6)
+        self.assertEqual(progress.completed_modules, 2)
+
+    def test_password_is_usable(self):
+        """Test que los usuarios sembrados pueden iniciar sesión"""
+        seed(users=2)
+
+        user = get_user_model().objects.get(email='benchmark0@example.com')
+        self.assertTrue(user.check_password(SEED_PASSWORD))
+
+    def test_catalog_is_reused(self):
+        """Test que sembrar dos veces no duplica el catálogo"""
+        seed(users=2)
+        seed(users=3)
+
+        self.assertEqual(Activity.objects.count(), 2 + 2 * 3)
+        self.assertEqual(FormsQuestion.objects.count(), 4)
+        self.assertEqual(get_user_model().objects.count(), 5)
+
+    def test_same_seed_same_data(self):
+        """Test que la misma semilla genera los mismos datos"""
+        def generate():
+            with transaction.atomic():
+                seed_benchmark_data(5, 3, modules=1, activities_per_module=3, questions=2, seed=7)  # noqa
+                values = list(UserData.objects.order_by('user__email').values_list(  # noqa
+                    'country', 'institution', 'age',
+                ))
+                transaction.set_rollback(True)
+            return values
+
+        self.assertEqual(generate(), generate())
+
+    def test_drop_off(self):
+        """Test que con --drop-off cada usuario responde entre 1 y M"""
+        seed(drop_off=True, responses=6)
+
+        answered = list(UserProgress.objects.values_list(
+            'answered_activities', flat=True,
+        ))
+        self.assertEqual(len(answered), 12)
+        self.assertTrue(all(1 <= count <= 6 for count in answered))
+        self.assertGreater(len(set(answered)), 1)
+
+    def test_placeholder_media(self):
+        """Test que las respuestas de media apuntan a archivos existentes"""
+        # el 15% de las respuestas es media (ver response_type_for)
+        seed(users=100, responses=1, media=True)
+
+        response = ActivityResponse.objects.filter(response_type='image').first()  # noqa
+        self.assertIsNone(response.string_response)
+        self.assertTrue(os.path.exists(response.image_response.path))
+        self.assertTrue(os.path.exists(response.image_thumbnail.path))
+        video = ActivityResponse.objects.filter(response_type='video').first()
+        self.assertTrue(os.path.exists(video.video_response.path))
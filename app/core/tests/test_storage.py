@@ -0,0 +1,190 @@
+"""
+Tests para el almacenamiento de media deduplicado
+"""
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from core import models
+from core.storage import MediaStorage, add_reference
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_bytes(color='red'):
+    """Devuelve un PNG pequeño"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_CONTENT_ADDRESSED=True)
+class ContentAddressedStorageTests(TestCase):
+    """Test de la deduplicación y el conteo de referencias"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.activities = [
+            models.Activity.objects.create(title=f'Activity {i}')
+            for i in range(2)
+        ]
+
+    def _image_response(self, activity, content):
+        return models.ActivityResponse.objects.create(
+            user=self.user,
+            activity=activity,
+            response_type='image',
+            image_response=SimpleUploadedFile('photo.png', content),
+            time_minutes=1,
+        )
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(MEDIA_ROOT, name))
+
+    def test_identical_files_are_stored_once(self):
+        """Test que el mismo contenido se guarda una sola vez"""
+        content = image_bytes()
+        first = self._image_response(self.activities[0], content)
+        second = self._image_response(self.activities[1], content)
+        photo = models.UserPhotoMedia.objects.create(
+            user=self.user,
+            photo=SimpleUploadedFile('other-name.png', content),
+        )
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(first.image_response.name, f'uploads/image/{digest}.png')  # noqa
+        self.assertEqual(second.image_response.name, first.image_response.name)  # noqa
+        self.assertEqual(photo.photo.name, first.image_response.name)
+        blob = models.MediaBlob.objects.get(digest=digest)
+        self.assertEqual(blob.ref_count, 3)
+        self.assertEqual(blob.size, len(content))
+        files = os.listdir(os.path.join(MEDIA_ROOT, 'uploads', 'image'))
+        self.assertEqual(files, [f'{digest}.png'])
+
+    def test_file_deleted_with_last_reference(self):
+        """Test que el archivo se borra cuando nadie lo usa"""
+        content = image_bytes()
+        first = self._image_response(self.activities[0], content)
+        second = self._image_response(self.activities[1], content)
+        name = first.image_response.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(self._exists(name))
+        self.assertEqual(models.MediaBlob.objects.get(name=name).ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(self._exists(name))
+        self.assertFalse(models.MediaBlob.objects.filter(name=name).exists())
+
+    def test_replaced_file_is_released(self):
+        """Test que actualizar una respuesta libera el archivo anterior"""
+        response = self._image_response(self.activities[0], image_bytes())
+        old_name = response.image_response.name
+
+        response = models.ActivityResponse.objects.get(id=response.id)
+        response.image_response = SimpleUploadedFile(
+            'new.png', image_bytes('blue'),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response.save()
+
+        self.assertNotEqual(response.image_response.name, old_name)
+        self.assertFalse(self._exists(old_name))
+        self.assertTrue(self._exists(response.image_response.name))
+
+    def test_rolled_back_delete_keeps_file(self):
+        """Test que si la transacción se revierte el archivo se conserva"""
+        response = self._image_response(self.activities[0], image_bytes())
+        name = response.image_response.name
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                response.delete()
+                transaction.set_rollback(True)
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(self._exists(name))
+        self.assertEqual(models.MediaBlob.objects.get(name=name).ref_count, 1)
+
+    def test_reupload_before_delete_keeps_file(self):
+        """Test que un archivo reclamado de nuevo no se borra al confirmar"""
+        content = image_bytes()
+        response = self._image_response(self.activities[0], content)
+        name = response.image_response.name
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response.delete()
+        again = self._image_response(self.activities[1], content)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(again.image_response.name, name)
+        self.assertTrue(self._exists(name))
+
+    def test_reference_added_after_concurrent_remove(self):
+        """Test que un borrado concurrente no borra un archivo en uso"""
+        content = image_bytes()
+        first = self._image_response(self.activities[0], content)
+        storage = first.image_response.storage
+        # el archivo de la segunda fila ya se guardó (_store), falta contar
+        # su referencia cuando otra petición borra la primera
+        name = storage.save('uploads/image/photo.png', ContentFile(content))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            first.delete()
+        add_reference(storage, name)
+        for callback in callbacks:
+            callback()
+
+        self.assertTrue(self._exists(name))
+        self.assertEqual(models.MediaBlob.objects.get(name=name).ref_count, 1)
+
+    def test_unreferenced_blobs_are_collected(self):
+        """Test que un archivo de un guardado fallido se recolecta"""
+        storage = MediaStorage()
+        name = storage.save('uploads/image/photo.png', ContentFile(b'data'))
+        kept = self._image_response(self.activities[0], image_bytes())
+        out = io.StringIO()
+
+        call_command('collect_media_blobs', stdout=out)
+        self.assertTrue(self._exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('collect_media_blobs', older_than=-1, stdout=out)
+
+        self.assertFalse(self._exists(name))
+        self.assertFalse(models.MediaBlob.objects.filter(name=name).exists())
+        self.assertTrue(self._exists(kept.image_response.name))
+
+    @override_settings(MEDIA_CONTENT_ADDRESSED=False)
+    def test_disabled_keeps_unique_names(self):
+        """Test que sin la opción cada subida tiene su propio archivo"""
+        content = image_bytes()
+        first = self._image_response(self.activities[0], content)
+        second = self._image_response(self.activities[1], content)
+
+        self.assertNotEqual(first.image_response.name, second.image_response.name)  # noqa
+        self.assertFalse(models.MediaBlob.objects.exists())
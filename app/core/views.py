@@ -1,15 +1,75 @@
 """
 Vistas para el CORE.
 """
-from rest_framework.decorators import api_view
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db import connection
+from django.http import HttpResponse
 from django.shortcuts import render
 
+from core.asyncviews import AsyncViewMixin
+from core.authentication import CachedTokenAuthentication, token_cache
+from core.db import connection_stats
+from core.media import media_response, resolve_media
+from core.metrics import registry
+from user.views import IsSuperUser
 
-@api_view(['GET'])
-def health_check(request):
+
+class HealthCheckView(AsyncViewMixin, APIView):
     """Returns successful response."""
-    return Response({'healthy': True})
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response({'healthy': True})
+
+    async def aget(self, request):
+        return self.get(request)
+
+
+health_check = HealthCheckView.as_view()
+
+
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsSuperUser])
+def internal_stats(request):
+    """Devuelve contadores internos del proceso (Sólo Admins)"""
+    return Response({
+        'token_auth_cache': token_cache.stats(),
+        'db_connections': dict(
+            connection_stats.stats(),
+            conn_max_age=connection.settings_dict['CONN_MAX_AGE'],
+            health_checks=connection.settings_dict['CONN_HEALTH_CHECKS'],
+        ),
+    })
+
+
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsSuperUser])
+def metrics(request):
+    """Métricas por ruta en formato de Prometheus (Sólo Admins)"""
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication, SessionAuthentication])
+@permission_classes([IsAuthenticated])
+def serve_media(request, kind, pk, field):
+    """Entrega un archivo de media a su dueño o a un superusuario"""
+    name = resolve_media(request.user, kind, pk, field)
+    return media_response(request, name)
 
 
 def index_page(request):
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MethodologyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'methodology'
+
+    def ready(self):
+        from methodology import signals  # noqa
@@ -0,0 +1,26 @@
+"""
+Señales para mantener la cache de Metodologia
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import invalidate_namespace
+from core.models import Activity, FormsQuestion
+from methodology.tree import (
+    ACTIVITIES_CACHE_NAMESPACE,
+    FORMS_QUESTIONS_CACHE_NAMESPACE,
+)
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+def activity_changed(sender, **kwargs):
+    """Invalida listas, detalles y árbol al escribir una actividad"""
+    invalidate_namespace(ACTIVITIES_CACHE_NAMESPACE)
+
+
+@receiver(post_save, sender=FormsQuestion)
+@receiver(post_delete, sender=FormsQuestion)
+def forms_question_changed(sender, **kwargs):
+    """Invalida listas y detalles al escribir una pregunta"""
+    invalidate_namespace(FORMS_QUESTIONS_CACHE_NAMESPACE)
@@ -1,8 +1,10 @@
 """
 Tests for recipe APIs.
 """
+from unittest.mock import Mock, patch
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -14,6 +16,8 @@ from core.models import (
     FormsQuestion,
 )
 
+from core.cache import get_or_build, make_key
+from methodology.tree import ACTIVITIES_CACHE_NAMESPACE
 from methodology.serializers import (
     ActivitySerializer,
     FormsQuestionSerializer,
@@ -22,6 +26,7 @@ from methodology.serializers import (
 
 ACTIVITIES_URL = reverse('methodology:activity-list')
 FORMSQUESTIONS_URL = reverse('methodology:formsquestion-list')
+ACTIVITY_TREE_URL = reverse('methodology:activity-tree')
 
 
 def create_activity(**params):
@@ -52,6 +57,7 @@ class PublicRecipeAPITests(TestCase):
     """Test de solicitudes API no autenticadas."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
 
     def test_auth_required(self):
@@ -65,6 +71,7 @@ class PrivateRecipeApiTests(TestCase):
     """Test de solicitudes API autenticadas"""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.superuser = get_user_model().objects.create_user(
             'user@example.com',
@@ -139,3 +146,159 @@ class PrivateRecipeApiTests(TestCase):
     de borrar y
     de permisos.
     """
+
+
+class ActivityTreeApiTests(TestCase):
+    """Test del árbol completo de actividades"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_retrieve_activity_tree(self):
+        """Test recuperando la jerarquía anidada"""
+        module = create_activity(title='Module 1')
+        create_activity(title='Activity 1.2', parent_activity=module)
+        step = create_activity(title='Activity 1.1', parent_activity=module)
+        create_activity(title='Step 1.1.1', parent_activity=step)
+        create_activity(title='Module 2')
+
+        res = self.client.get(ACTIVITY_TREE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [node['title'] for node in res.data],
+            ['Module 1', 'Module 2'],
+        )
+        children = res.data[0]['sub_activities']
+        self.assertEqual(
+            [node['title'] for node in children],
+            ['Activity 1.1', 'Activity 1.2'],
+        )
+        self.assertEqual(
+            children[0]['sub_activities'][0]['title'],
+            'Step 1.1.1',
+        )
+
+    def test_activity_tree_is_cached(self):
+        """Test que el árbol cacheado no consulta la base de datos"""
+        create_activity(title='Module 1')
+        self.client.get(ACTIVITY_TREE_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ACTIVITY_TREE_URL)
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_activity_tree_invalidated_on_write(self):
+        """Test que crear, editar o borrar actividades renueva el árbol"""
+        module = create_activity(title='Module 1')
+        self.client.get(ACTIVITY_TREE_URL)
+
+        child = create_activity(title='Activity 1.1', parent_activity=module)
+        res = self.client.get(ACTIVITY_TREE_URL)
+        self.assertEqual(len(res.data[0]['sub_activities']), 1)
+
+        child.title = 'Renamed'
+        child.save()
+        res = self.client.get(ACTIVITY_TREE_URL)
+        self.assertEqual(res.data[0]['sub_activities'][0]['title'], 'Renamed')
+
+        child.delete()
+        res = self.client.get(ACTIVITY_TREE_URL)
+        self.assertEqual(res.data[0]['sub_activities'], [])
+
+
+class CatalogCacheApiTests(TestCase):
+    """Test de la cache del catálogo de actividades y preguntas"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.superuser = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'test123',
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_list_and_detail_are_cached(self):
+        """Test que las respuestas repetidas no consultan la base de datos"""
+        activity = create_activity()
+        question = create_forms_question()
+        urls = [
+            ACTIVITIES_URL,
+            reverse('methodology:activity-detail', args=[activity.id]),
+            FORMSQUESTIONS_URL,
+            reverse('methodology:formsquestion-detail', args=[question.id]),
+        ]
+        for url in urls:
+            self.client.get(url)
+
+        with self.assertNumQueries(0):
+            for url in urls:
+                res = self.client.get(url)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_write_invalidates_cache(self):
+        """Test que escribir por la API renueva la lista cacheada"""
+        create_forms_question(question='Question 1?')
+        self.client.get(FORMSQUESTIONS_URL)
+
+        self.client.force_authenticate(self.superuser)
+        self.client.post(FORMSQUESTIONS_URL, {'question': 'Question 2?'})
+        res = self.client.get(FORMSQUESTIONS_URL)
+
+        self.assertEqual(len(res.data), 2)
+
+    def test_paginated_pages_cached_separately(self):
+        """Test que cada página tiene su propia llave"""
+        for i in range(3):
+            create_activity(title=f'Activity {i}')
+
+        first = self.client.get(ACTIVITIES_URL, {'page_size': 2})
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual(len(first.data['results']), 2)
+        self.assertEqual(len(second.data['results']), 1)
+
+    def test_unknown_params_share_entry(self):
+        """Test que parámetros que la vista ignora no crean entradas nuevas"""
+        create_activity()
+        self.client.get(ACTIVITIES_URL)
+
+        with self.assertNumQueries(0):
+            for i in range(3):
+                res = self.client.get(ACTIVITIES_URL, {'x': i})
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_concurrent_miss_waits_for_rebuild(self):
+        """Test que con el candado tomado se espera el valor de otro proceso"""
+        key = make_key(ACTIVITIES_CACHE_NAMESPACE, 'value')
+        cache.add(f'{key}:lock', 1)
+        builder = Mock(return_value='rebuilt')
+
+        def other_process_finishes(seconds):
+            cache.set(key, 'cached by other process')
+
+        with patch('core.cache.time.sleep', side_effect=other_process_finishes):  # noqa
+            value = get_or_build(ACTIVITIES_CACHE_NAMESPACE, ('value',), builder)  # noqa
+
+        self.assertEqual(value, 'cached by other process')
+        builder.assert_not_called()
+
+    def test_concurrent_miss_falls_back_after_wait(self):
+        """Test que si el otro proceso no termina se construye el valor"""
+        key = make_key(ACTIVITIES_CACHE_NAMESPACE, 'value')
+        cache.add(f'{key}:lock', 1)
+        builder = Mock(return_value='rebuilt')
+
+        with self.settings(CACHE_STAMPEDE_WAIT=0.1):
+            value = get_or_build(ACTIVITIES_CACHE_NAMESPACE, ('value',), builder)  # noqa
+
+        self.assertEqual(value, 'rebuilt')
+        builder.assert_called_once()
@@ -0,0 +1,59 @@
+"""
+Árbol de Actividades (Módulos y Sub-Actividades)
+"""
+from core.cache import aget_or_build, get_or_build
+from core.models import Activity
+
+
+ACTIVITIES_CACHE_NAMESPACE = 'methodology:activities'
+FORMS_QUESTIONS_CACHE_NAMESPACE = 'methodology:formsquestions'
+
+
+def _tree_rows():
+    return Activity.objects.order_by('title').values(
+        'id', 'title', 'description', 'parent_activity',
+    )
+
+
+def _nest(rows):
+    nodes = {}
+    for row in rows:
+        nodes[row['id']] = dict(row, sub_activities=[])
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node['parent_activity'])
+        if parent is None:
+            roots.append(node)
+        else:
+            parent['sub_activities'].append(node)
+
+    return roots
+
+
+def build_activity_tree():
+    """Construye el árbol completo de actividades con una sola consulta"""
+    return _nest(_tree_rows())
+
+
+async def abuild_activity_tree():
+    """Versión async de ``build_activity_tree``"""
+    return _nest([row async for row in _tree_rows()])
+
+
+def get_activity_tree():
+    """Devuelve el árbol de actividades desde la cache"""
+    return get_or_build(
+        ACTIVITIES_CACHE_NAMESPACE,
+        ('tree',),
+        build_activity_tree,
+    )
+
+
+async def aget_activity_tree():
+    """Versión async de ``get_activity_tree``"""
+    return await aget_or_build(
+        ACTIVITIES_CACHE_NAMESPACE,
+        ('tree',),
+        abuild_activity_tree,
+    )
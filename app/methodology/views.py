@@ -2,12 +2,25 @@
 Views para Metodologia (Actividades y Preguntas)
 """
 from rest_framework import generics, viewsets
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework import permissions
 from rest_framework.exceptions import NotFound, ValidationError
+from drf_spectacular.utils import extend_schema, OpenApiTypes
 
+from core.asyncviews import AsyncCachedResponseMixin, AsyncViewMixin
+from core.authentication import CachedTokenAuthentication
 from core.models import Activity, FormsQuestion
-from methodology.serializers import ActivitySerializer, FormsQuestionSerializer
+from methodology.serializers import (
+    ActivitySerializer,
+    FormsQuestionSerializer,
+)
+from methodology.tree import (
+    ACTIVITIES_CACHE_NAMESPACE,
+    FORMS_QUESTIONS_CACHE_NAMESPACE,
+    aget_activity_tree,
+    get_activity_tree,
+)
 
 
 class IsSuperUserOrReadOnly(permissions.BasePermission):
@@ -25,18 +38,32 @@ class IsSuperUserOrReadOnly(permissions.BasePermission):
         return request.user.is_superuser
 
 
-class ActivityViewSet(viewsets.ModelViewSet):
-    """Administra las Actividades (Se tiene que ser SuperAdmin)"""
+class ActivityViewSet(AsyncViewMixin, AsyncCachedResponseMixin,
+                      viewsets.ModelViewSet):
+    """
+    Administra las Actividades (Se tiene que ser SuperAdmin). Bajo ASGI las
+    lecturas son async y las escrituras corren en un hilo.
+    """
+    cache_namespace = ACTIVITIES_CACHE_NAMESPACE
     serializer_class = ActivitySerializer
     queryset = Activity.objects.all().order_by('title')
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsSuperUserOrReadOnly]
 
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(methods=['GET'], detail=False, url_path='tree')
+    def tree(self, request):
+        """Devuelve la jerarquía completa de actividades"""
+        return Response(get_activity_tree())
+
+    async def atree(self, request):
+        return Response(await aget_activity_tree())
+
 
 class SubActivityView(generics.ListAPIView):
     """Devuelve las Sub-Activities de una Actividad Padre """
     serializer_class = ActivitySerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsSuperUserOrReadOnly]
 
     def get_queryset(self):
@@ -54,9 +81,14 @@ class SubActivityView(generics.ListAPIView):
         return queryset
 
 
-class FormsQuestionViewSet(viewsets.ModelViewSet):
-    """Administra las Preguntas del Forms (Se tiene que ser SuperAdmin)"""
+class FormsQuestionViewSet(AsyncViewMixin, AsyncCachedResponseMixin,
+                           viewsets.ModelViewSet):
+    """
+    Administra las Preguntas del Forms (Se tiene que ser SuperAdmin). Bajo ASGI
+    las lecturas son async y las escrituras corren en un hilo.
+    """
+    cache_namespace = FORMS_QUESTIONS_CACHE_NAMESPACE
     serializer_class = FormsQuestionSerializer
-    queryset = FormsQuestion.objects.all()
-    authentication_classes = [TokenAuthentication]
+    queryset = FormsQuestion.objects.all().order_by('id')
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsSuperUserOrReadOnly]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ResponsesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'response'
+
+    def ready(self):
+        from response import signals  # noqa
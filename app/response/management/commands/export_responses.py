@@ -0,0 +1,42 @@
+"""
+Comando en Django para exportar respuestas de usuarios en CSV o NDJSON.
+"""
+from django.core.management.base import BaseCommand
+
+from response.exports import EXPORT_DATASETS, EXPORT_FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    """Comando Django para exportar un dataset de respuestas."""
+
+    help = 'Exporta respuestas en streaming a un archivo o a stdout.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORT_DATASETS))
+        parser.add_argument(
+            '--format',
+            dest='file_format',
+            choices=sorted(EXPORT_FORMATS),
+            default='csv',
+        )
+        parser.add_argument(
+            '--output',
+            help='Ruta del archivo destino (stdout por defecto).',
+        )
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        chunks = iter_export(options['dataset'], options['file_format'])
+
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['output'], 'w', newline='') as output:
+            for chunk in chunks:
+                output.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {options['dataset']} to {options['output']}"
+        ))
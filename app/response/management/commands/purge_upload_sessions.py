@@ -0,0 +1,34 @@
+"""
+Comando en Django para borrar subidas por partes abandonadas.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ResponseUploadSession
+from response.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    """Comando Django para purgar sesiones de subida sin actividad."""
+
+    help = 'Borra sesiones de subida (y sus archivos) sin actividad.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24)
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        sessions = ResponseUploadSession.objects.filter(updated_at__lt=cutoff)
+
+        count = 0
+        for session in sessions.iterator():
+            discard_upload(session)
+            session.delete()
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Purged {count} upload sessions.'
+        ))
@@ -0,0 +1,19 @@
+"""
+Comando en Django para recalcular el progreso de todos los usuarios.
+"""
+from django.core.management.base import BaseCommand
+
+from response.progress import rebuild_progress
+
+
+class Command(BaseCommand):
+    """Comando Django para reconstruir la tabla UserProgress."""
+
+    help = 'Recalcula UserProgress desde las respuestas y módulos.'
+
+    def handle(self, *args, **options):
+        """Punto de entrada para el comando."""
+        count = rebuild_progress()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt progress for {count} users.'
+        ))
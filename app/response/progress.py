@@ -0,0 +1,92 @@
+"""
+Resumen de progreso por usuario mantenido de forma incremental
+"""
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from core.models import (
+    ActivityResponse,
+    ModuleResponseCompletion,
+    UserProgress,
+)
+
+
+def update_progress(user_id, activity_id=None, create=True, **deltas):
+    """
+    Suma ``deltas`` a los contadores del usuario con un UPDATE atómico
+    (``F()``), así dos escrituras concurrentes no se pisan. Con
+    ``activity_id`` también marca la última actividad respondida.
+
+    Los borrados usan ``create=False``: en un borrado en cascada del
+    usuario su resumen puede haberse borrado ya.
+    """
+    if create:
+        UserProgress.objects.get_or_create(user_id=user_id)
+    changes = {
+        field: F(field) + delta for field, delta in deltas.items() if delta
+    }
+    if activity_id is not None:
+        changes.update(
+            last_activity_id=activity_id,
+            last_activity_at=timezone.now(),
+        )
+    if changes:
+        changes['updated_at'] = timezone.now()
+        UserProgress.objects.filter(user_id=user_id).update(**changes)
+
+
+def rebuild_progress():
+    """Recalcula todos los resúmenes desde las respuestas y módulos"""
+    last_response = ActivityResponse.objects.filter(
+        user_id=OuterRef('user_id'),
+    ).order_by('-id')
+    responses = ActivityResponse.objects.values('user_id').annotate(
+        answered=Count('id'),
+        minutes=Sum('time_minutes'),
+        # sin fecha en las respuestas, la más reciente es la de mayor id
+        last_activity_id=Subquery(last_response.values('activity_id')[:1]),
+    ).order_by()
+    modules = ModuleResponseCompletion.objects.values('user_id').annotate(
+        completed=Count('id', filter=Q(completed=True)),
+    ).order_by()
+
+    progress = {}
+    for row in responses.iterator():
+        progress[row['user_id']] = UserProgress(
+            user_id=row['user_id'],
+            answered_activities=row['answered'],
+            total_time_minutes=row['minutes'] or 0,
+            last_activity_id=row['last_activity_id'],
+        )
+    for row in modules.iterator():
+        item = progress.setdefault(
+            row['user_id'], UserProgress(user_id=row['user_id']),
+        )
+        item.completed_modules = row['completed']
+
+    # sin DELETE: un get_or_create concurrente de las señales no choca con
+    # la clave única, las filas existentes se ponen a cero y se sobreescriben
+    with transaction.atomic():
+        UserProgress.objects.update(
+            answered_activities=0,
+            completed_modules=0,
+            total_time_minutes=0,
+            last_activity=None,
+            last_activity_at=None,
+            updated_at=timezone.now(),
+        )
+        UserProgress.objects.bulk_create(
+            progress.values(),
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[
+                'answered_activities',
+                'completed_modules',
+                'total_time_minutes',
+                'last_activity',
+                'updated_at',
+            ],
+        )
+    return len(progress)
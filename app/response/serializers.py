@@ -1,12 +1,20 @@
 """
 Serializers para Respuestas de Usuarios a Actividades y Preguntas
 """
+import os
+
+from django.conf import settings
 from rest_framework import serializers
 
+from core.media import media_fields, media_url
 from core.models import (
+    AUDIO_EXTENSIONS,
+    VIDEO_EXTENSIONS,
     ActivityResponse,
     FormsQuestionResponse,
     ModuleResponseCompletion,
+    ResponseUploadSession,
+    UserProgress,
 )
 
 
@@ -25,8 +33,8 @@ class ActivityResponseSerializer(serializers.ModelSerializer):
     """Serializador para ver Actividades y sus Respuestas"""
     class Meta:
         model = ActivityResponse
-        fields = ['id', 'user', 'activity', 'response_type', 'string_response', 'image_response', 'video_response', 'audio_response', 'time_minutes']  # noqa
-        read_only_fields = ['id', 'user', 'activity']
+        fields = ['id', 'user', 'activity', 'response_type', 'string_response', 'image_response', 'image_thumbnail', 'image_medium', 'video_response', 'audio_response', 'time_minutes']  # noqa
+        read_only_fields = ['id', 'user', 'activity', 'image_thumbnail', 'image_medium']  # noqa
 
     def validate(self, data):
         response_type = data.get('response_type')
@@ -59,6 +67,17 @@ class ActivityResponseSerializer(serializers.ModelSerializer):
 
         return data
 
+    def to_representation(self, instance):
+        """Los archivos se exponen por la vista con permisos, no por /static"""
+        data = super().to_representation(instance)
+        for field in media_fields('ActivityResponse'):
+            if data.get(field):
+                data[field] = media_url(
+                    self.context.get('request'),
+                    'activity-response', instance.pk, field,
+                )
+        return data
+
     def create(self, validated_data):
         return ActivityResponse.objects.create(**validated_data)
 
@@ -84,3 +103,53 @@ class FormsQuestionResponseSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         return instance
+
+
+class FormsQuestionResponseBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Serializador de una respuesta dentro de un envío en lote del forms.
+    ``score`` y ``time_minutes`` toman los límites de las columnas; la
+    pregunta es un id que la vista busca en una sola consulta.
+    """
+    question = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = FormsQuestionResponse
+        fields = ['question', 'score', 'time_minutes']
+
+
+class ResponseUploadSessionSerializer(serializers.ModelSerializer):
+    """Serializador para sesiones de subida por partes"""
+    EXTENSIONS = {
+        'video': VIDEO_EXTENSIONS,
+        'audio': AUDIO_EXTENSIONS,
+    }
+
+    class Meta:
+        model = ResponseUploadSession
+        fields = ['id', 'activity', 'response_type', 'filename', 'size',
+                  'offset', 'time_minutes']
+        read_only_fields = ['id', 'activity', 'offset']
+
+    def validate_size(self, value):
+        if value < 1 or value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"size must be between 1 and {settings.UPLOAD_MAX_SIZE} bytes."  # noqa
+            )
+        return value
+
+    def validate(self, data):
+        ext = os.path.splitext(data.get('filename', ''))[1]
+        if ext not in self.EXTENSIONS[data['response_type']]:
+            raise serializers.ValidationError(
+                f"Invalid file extension for {data['response_type']} response."  # noqa
+            )
+        return data
+
+
+class UserProgressSerializer(serializers.ModelSerializer):
+    """Serializador para el Resumen de Progreso de un Usuario"""
+    class Meta:
+        model = UserProgress
+        fields = ['user', 'answered_activities', 'completed_modules', 'total_time_minutes', 'last_activity', 'last_activity_at', 'updated_at']  # noqa
+        read_only_fields = fields
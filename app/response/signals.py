@@ -0,0 +1,62 @@
+"""
+Señales que mantienen el resumen de progreso de cada usuario
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core.models import ActivityResponse, ModuleResponseCompletion
+from response.progress import update_progress
+
+
+@receiver(post_init, sender=ActivityResponse)
+def remember_time_minutes(sender, instance, **kwargs):
+    instance._original_time_minutes = (
+        0 if instance.pk is None else instance.time_minutes
+    )
+
+
+@receiver(post_save, sender=ActivityResponse)
+def activity_response_saved(sender, instance, created, **kwargs):
+    """Cuenta la respuesta y el cambio de tiempo"""
+    minutes = instance.time_minutes or 0
+    update_progress(
+        instance.user_id,
+        activity_id=instance.activity_id,
+        answered_activities=1 if created else 0,
+        total_time_minutes=minutes - (instance._original_time_minutes or 0),
+    )
+    instance._original_time_minutes = minutes
+
+
+@receiver(post_delete, sender=ActivityResponse)
+def activity_response_deleted(sender, instance, **kwargs):
+    update_progress(
+        instance.user_id,
+        create=False,
+        answered_activities=-1,
+        total_time_minutes=-(instance.time_minutes or 0),
+    )
+
+
+@receiver(post_init, sender=ModuleResponseCompletion)
+def remember_completed(sender, instance, **kwargs):
+    instance._original_completed = (
+        False if instance.pk is None else instance.completed
+    )
+
+
+@receiver(post_save, sender=ModuleResponseCompletion)
+def module_completion_saved(sender, instance, **kwargs):
+    """Cuenta el módulo cuando pasa a completado (o deja de estarlo)"""
+    if instance.completed != instance._original_completed:
+        update_progress(
+            instance.user_id,
+            completed_modules=1 if instance.completed else -1,
+        )
+    instance._original_completed = instance.completed
+
+
+@receiver(post_delete, sender=ModuleResponseCompletion)
+def module_completion_deleted(sender, instance, **kwargs):
+    if instance.completed:
+        update_progress(instance.user_id, create=False, completed_modules=-1)  # noqa
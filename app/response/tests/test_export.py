@@ -0,0 +1,162 @@
+"""
+Tests de la exportación de respuestas para investigadores
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Activity,
+    ActivityResponse,
+    FormsQuestion,
+    FormsQuestionResponse,
+    ModuleResponseCompletion,
+)
+
+
+def export_url(dataset):
+    """Devuelve la URL de exportación de un dataset"""
+    return reverse('response:export', args=[dataset])
+
+
+def streamed_text(res):
+    """Consume el contenido de una respuesta en streaming"""
+    return b''.join(res.streaming_content).decode('utf-8')
+
+
+class ExportApiTests(TestCase):
+    """Test de la exportación en streaming"""
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.activity = Activity.objects.create(title='Module 1')
+        self.question = FormsQuestion.objects.create(question='Question?')
+        ActivityResponse.objects.create(
+            user=self.user,
+            activity=self.activity,
+            response_type='text',
+            string_response='Hello, "world"',
+            time_minutes=3,
+        )
+        FormsQuestionResponse.objects.create(
+            user=self.user,
+            question=self.question,
+            score=4,
+            time_minutes=1,
+        )
+        ModuleResponseCompletion.objects.create(
+            user=self.user,
+            parent_activity=self.activity,
+            completed=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_export_activity_csv(self):
+        """Test exportando respuestas de actividades en CSV"""
+        res = self.client.get(export_url('activity'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(streamed_text(res))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['user__email'], self.user.email)
+        self.assertEqual(rows[0]['string_response'], 'Hello, "world"')
+
+    def test_export_forms_ndjson(self):
+        """Test exportando respuestas del forms en NDJSON"""
+        res = self.client.get(
+            export_url('forms'),
+            {'file_format': 'ndjson'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        lines = streamed_text(res).splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row['question_id'], self.question.id)
+        self.assertEqual(row['score'], 4)
+
+    @patch('response.exports.EXPORT_CHUNK_SIZE', 2)
+    def test_export_in_keyset_chunks(self):
+        """Test que las tandas keyset cubren todas las filas en orden"""
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'testpass123',
+        )
+        activities = [
+            Activity.objects.create(title=f'Activity {index}')
+            for index in range(2)
+        ]
+        for user, activity in (
+            (other, activities[0]), (self.user, activities[0]),
+            (other, activities[1]), (self.user, activities[1]),
+        ):
+            ActivityResponse.objects.create(
+                user=user,
+                activity=activity,
+                response_type='text',
+                string_response='Chunked',
+                time_minutes=1,
+            )
+
+        with self.assertNumQueries(3):
+            res = self.client.get(export_url('activity'))
+            rows = list(csv.DictReader(io.StringIO(streamed_text(res))))
+
+        keys = [(int(row['user_id']), int(row['id'])) for row in rows]
+        self.assertEqual(len(keys), 5)
+        self.assertEqual(keys, sorted(keys))
+
+    def test_export_unknown_dataset(self):
+        """Test que devuelve 404 para un dataset inexistente"""
+        res = self.client.get(export_url('users'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_invalid_format(self):
+        """Test que devuelve error para un formato inválido"""
+        res = self.client.get(export_url('modules'), {'file_format': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_superuser(self):
+        """Test que sólo los admins pueden exportar"""
+        self.client.force_authenticate(self.user)
+
+        res = self.client.get(export_url('activity'))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        """Test del comando de exportación a archivo"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'modules.ndjson')
+            call_command(
+                'export_responses', 'modules',
+                format='ndjson', output=path, stdout=io.StringIO(),
+            )
+            with open(path) as output:
+                rows = [json.loads(line) for line in output]
+
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(rows[0]['completed'])
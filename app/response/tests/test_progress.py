@@ -0,0 +1,182 @@
+"""
+Tests del resumen de progreso por usuario
+"""
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Activity,
+    ActivityResponse,
+    ModuleResponseCompletion,
+    UserProgress,
+)
+
+
+PROGRESS_URL = reverse('response:progress')
+
+
+def upload_url(activity_id):
+    return reverse('response:activityresponse-create-response', args=[activity_id])  # noqa
+
+
+def update_url(activity_id):
+    return reverse('response:activityresponse-update-response', args=[activity_id])  # noqa
+
+
+def complete_url(activity_id):
+    return reverse('response:complete activity module', args=[activity_id])
+
+
+class UserProgressApiTests(TestCase):
+    """Test del mantenimiento incremental de UserProgress"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.module = Activity.objects.create(title='Module')
+        self.activities = [
+            Activity.objects.create(
+                title=f'Activity {i}',
+                parent_activity=self.module,
+            )
+            for i in range(3)
+        ]
+
+    def _answer(self, activity, minutes):
+        res = self.client.post(upload_url(activity.id), {
+            'response_type': 'text',
+            'string_response': 'answer',
+            'time_minutes': minutes,
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_responses_update_progress(self):
+        """Test que responder suma actividades y minutos"""
+        self._answer(self.activities[0], 5)
+        self._answer(self.activities[1], 7)
+
+        res = self.client.get(PROGRESS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['answered_activities'], 2)
+        self.assertEqual(res.data['total_time_minutes'], 12)
+        self.assertEqual(res.data['last_activity'], self.activities[1].id)
+
+    def test_update_and_delete_adjust_minutes(self):
+        """Test que editar o borrar una respuesta ajusta los totales"""
+        self._answer(self.activities[0], 5)
+        self._answer(self.activities[1], 7)
+
+        res = self.client.put(update_url(self.activities[0].id), {
+            'response_type': 'text',
+            'string_response': 'edited',
+            'time_minutes': 9,
+        })
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ActivityResponse.objects.get(activity=self.activities[1]).delete()
+
+        progress = UserProgress.objects.get(user=self.user)
+        self.assertEqual(progress.answered_activities, 1)
+        self.assertEqual(progress.total_time_minutes, 9)
+
+    def test_completed_modules(self):
+        """Test que completar un módulo lo cuenta una sola vez"""
+        self.client.post(complete_url(self.module.id), {'completed': True})
+        completion = ModuleResponseCompletion.objects.get()
+        completion.save()
+
+        self.assertEqual(
+            UserProgress.objects.get(user=self.user).completed_modules, 1,
+        )
+        completion.completed = False
+        completion.save()
+        self.assertEqual(
+            UserProgress.objects.get(user=self.user).completed_modules, 0,
+        )
+
+    def test_single_query(self):
+        """Test que el progreso se sirve con una consulta"""
+        self._answer(self.activities[0], 5)
+
+        with self.assertNumQueries(1):
+            self.client.get(PROGRESS_URL)
+
+    def test_no_progress_yet(self):
+        """Test que un usuario sin respuestas recibe ceros"""
+        res = self.client.get(PROGRESS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['answered_activities'], 0)
+
+    def test_admin_unknown_user_not_found(self):
+        """Test que pedir el progreso de un usuario inexistente es 404"""
+        admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(PROGRESS_URL, {'user': 99999})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(PROGRESS_URL, {'user': self.user.id})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['user'], self.user.id)
+
+    def test_user_deletion_cascades(self):
+        """Test que borrar un usuario con respuestas no falla"""
+        self._answer(self.activities[0], 5)
+
+        self.user.delete()
+
+        self.assertFalse(UserProgress.objects.exists())
+
+    def test_rebuild_command(self):
+        """Test que el comando reconstruye los contadores"""
+        self._answer(self.activities[0], 5)
+        self._answer(self.activities[2], 3)
+        self.client.post(complete_url(self.module.id), {'completed': True})
+        UserProgress.objects.update(answered_activities=99)
+
+        call_command('rebuild_user_progress', stdout=io.StringIO())
+
+        progress = UserProgress.objects.get(user=self.user)
+        self.assertEqual(progress.answered_activities, 2)
+        self.assertEqual(progress.total_time_minutes, 8)
+        self.assertEqual(progress.completed_modules, 1)
+        self.assertEqual(progress.last_activity_id, self.activities[2].id)
+
+    def test_rebuild_keeps_existing_rows(self):
+        """Test que reconstruir no borra filas y resetea las sin respuestas"""
+        self._answer(self.activities[0], 5)
+        progress = UserProgress.objects.get(user=self.user)
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'testpass123',
+        )
+        UserProgress.objects.create(
+            user=other,
+            answered_activities=4,
+            total_time_minutes=20,
+        )
+
+        call_command('rebuild_user_progress', stdout=io.StringIO())
+
+        self.assertEqual(
+            UserProgress.objects.get(user=self.user).pk, progress.pk,
+        )
+        stale = UserProgress.objects.get(user=other)
+        self.assertEqual(stale.answered_activities, 0)
+        self.assertEqual(stale.total_time_minutes, 0)
+        self.assertIsNone(stale.last_activity_id)
@@ -1,3 +1,139 @@
 """
 Tests de Respuestas de Usuarios a Actividades y Preguntas
 """
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    FormsQuestion,
+    FormsQuestionResponse,
+)
+
+
+BULK_FORMS_URL = reverse('response:bulk-forms-responses')
+
+
+def create_forms_question(**params):
+    """Crear y devolver una pregunta de muestra"""
+    defaults = {
+        'question': 'Sample question?',
+        'description': 'Sample description',
+    }
+    defaults.update(params)
+    return FormsQuestion.objects.create(**defaults)
+
+
+class BulkFormsResponseApiTests(TestCase):
+    """Test del envío en lote de respuestas del forms"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.questions = [
+            create_forms_question(question=f'Question {i}?')
+            for i in range(3)
+        ]
+
+    def _payload(self, score=3):
+        return [
+            {'question': question.id, 'score': score, 'time_minutes': 1}
+            for question in self.questions
+        ]
+
+    def test_bulk_create_responses(self):
+        """Test guardando todas las respuestas con consultas constantes"""
+        with self.assertNumQueries(5):
+            res = self.client.post(BULK_FORMS_URL, self._payload(), format='json')  # noqa
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['status'] for item in res.data['results']],
+            ['created'] * 3,
+        )
+        self.assertEqual(
+            FormsQuestionResponse.objects.filter(user=self.user).count(),
+            3,
+        )
+
+    def test_bulk_upsert_existing_responses(self):
+        """Test que una respuesta existente se actualiza"""
+        FormsQuestionResponse.objects.create(
+            user=self.user,
+            question=self.questions[0],
+            score=1,
+            time_minutes=1,
+        )
+
+        res = self.client.post(BULK_FORMS_URL, self._payload(score=5), format='json')  # noqa
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['status'] for item in res.data['results']],
+            ['updated', 'created', 'created'],
+        )
+        response = FormsQuestionResponse.objects.get(
+            user=self.user,
+            question=self.questions[0],
+        )
+        self.assertEqual(response.score, 5)
+
+    def test_bulk_invalid_item_saves_nothing(self):
+        """Test que un elemento inválido rechaza todo el envío"""
+        payload = self._payload()
+        payload[1]['score'] = -1
+        payload[2]['question'] = 9999
+
+        res = self.client.post(BULK_FORMS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [item['status'] for item in res.data['results']],
+            ['skipped', 'error', 'skipped'],
+        )
+        self.assertFalse(FormsQuestionResponse.objects.exists())
+
+    def test_bulk_values_outside_columns_are_rejected(self):
+        """Test que valores que no caben en la columna son 400 y no 500"""
+        payload = self._payload()
+        payload[0]['score'] = 2 ** 31
+        payload[1]['time_minutes'] = -2 ** 31 - 1
+
+        res = self.client.post(BULK_FORMS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [item['status'] for item in res.data['results']],
+            ['error', 'error', 'skipped'],
+        )
+        self.assertIn('score', res.data['results'][0]['errors'])
+        self.assertIn('time_minutes', res.data['results'][1]['errors'])
+        self.assertFalse(FormsQuestionResponse.objects.exists())
+
+    def test_bulk_unknown_and_repeated_questions(self):
+        """Test que reporta preguntas inexistentes y repetidas"""
+        payload = self._payload()
+        payload.append(dict(payload[0]))
+        payload.append({'question': 9999, 'score': 1, 'time_minutes': 1})
+
+        res = self.client.post(BULK_FORMS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [item['status'] for item in res.data['results']],
+            ['skipped', 'skipped', 'skipped', 'error', 'error'],
+        )
+        self.assertFalse(FormsQuestionResponse.objects.exists())
+
+    def test_bulk_empty_payload(self):
+        """Test que un envío vacío es inválido"""
+        res = self.client.post(BULK_FORMS_URL, [], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,166 @@
+"""
+Tests de las subidas por partes de respuestas de video y audio
+"""
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import (
+    Activity,
+    ActivityResponse,
+    ResponseUploadSession,
+)
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def session_create_url(activity_id):
+    return reverse('response:activityresponse-create-upload-session', args=[activity_id])  # noqa
+
+
+def session_url(session_id):
+    return reverse('response:upload-session', args=[session_id])
+
+
+def finalize_url(session_id):
+    return reverse('response:upload-session-finalize', args=[session_id])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ResponseUploadApiTests(TestCase):
+    """Test del protocolo de subida reanudable"""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.activity = Activity.objects.create(title='Video activity')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.content = os.urandom(1000)
+
+    def _create_session(self, **params):
+        payload = {
+            'response_type': 'video',
+            'filename': 'recording.mp4',
+            'size': len(self.content),
+            'time_minutes': 4,
+        }
+        payload.update(params)
+        res = self.client.post(session_create_url(self.activity.id), payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data['id']
+
+    def _put_chunk(self, session_id, start, end):
+        return self.client.put(
+            session_url(session_id),
+            self.content[start:end + 1],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.content)}',
+        )
+
+    def test_upload_in_chunks_and_finalize(self):
+        """Test subiendo un video en partes y adjuntándolo a la respuesta"""
+        session_id = self._create_session()
+
+        res = self._put_chunk(session_id, 0, 399)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['offset'], 400)
+        self._put_chunk(session_id, 400, 999)
+
+        res = self.client.post(finalize_url(session_id))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        response = ActivityResponse.objects.get(user=self.user)
+        self.assertEqual(response.response_type, 'video')
+        self.assertEqual(response.time_minutes, 4)
+        self.assertTrue(response.video_response.name.startswith('uploads/video/'))  # noqa
+        with response.video_response.open('rb') as video:
+            self.assertEqual(video.read(), self.content)
+        self.assertFalse(ResponseUploadSession.objects.exists())
+
+    def test_resume_from_current_offset(self):
+        """Test que una parte fuera de orden devuelve el offset actual"""
+        session_id = self._create_session()
+        self._put_chunk(session_id, 0, 499)
+
+        res = self._put_chunk(session_id, 600, 999)
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data['offset'], 500)
+        res = self.client.get(session_url(session_id))
+        self.assertEqual(res.data['offset'], 500)
+
+    def test_finalize_incomplete_upload(self):
+        """Test que no se puede terminar una subida incompleta"""
+        session_id = self._create_session()
+        self._put_chunk(session_id, 0, 499)
+
+        res = self.client.post(finalize_url(session_id))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(ActivityResponse.objects.exists())
+
+    def test_invalid_extension(self):
+        """Test que la extensión debe corresponder al tipo de respuesta"""
+        res = self.client.post(session_create_url(self.activity.id), {
+            'response_type': 'audio',
+            'filename': 'recording.mp4',
+            'size': 10,
+            'time_minutes': 1,
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_content_range(self):
+        """Test que una parte sin Content-Range es rechazada"""
+        session_id = self._create_session()
+
+        res = self.client.put(
+            session_url(session_id),
+            self.content,
+            content_type='application/octet-stream',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_user_cannot_access_session(self):
+        """Test que una sesión sólo la ve su usuario"""
+        session_id = self._create_session()
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'testpass123',
+        )
+        self.client.force_authenticate(other)
+
+        res = self._put_chunk(session_id, 0, 99)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_upload(self):
+        """Test cancelando una subida borra la sesión y el archivo"""
+        session_id = self._create_session()
+        self._put_chunk(session_id, 0, 99)
+        session = ResponseUploadSession.objects.get(id=session_id)
+        partial_path = os.path.join(MEDIA_ROOT, session.partial_name)
+        self.assertTrue(os.path.exists(partial_path))
+
+        res = self.client.delete(session_url(session_id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(os.path.exists(partial_path))
+        self.assertFalse(ResponseUploadSession.objects.exists())
@@ -0,0 +1,68 @@
+"""
+Subidas por partes (reanudables) de respuestas de video y audio
+"""
+import os
+import re
+
+from django.core.files.storage import default_storage
+
+from core.models import ActivityResponse, activity_media_response_file_path
+
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+# Bytes copiados por lectura del cuerpo de la petición
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+def parse_content_range(header):
+    """Devuelve ``(inicio, fin, total)`` de un header Content-Range"""
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        return None
+    start, end = int(match.group(1)), int(match.group(2))
+    total = None if match.group(3) == '*' else int(match.group(3))
+    if end < start:
+        return None
+    return start, end, total
+
+
+def append_chunk(session, stream, start, length):
+    """
+    Escribe una parte al final del archivo parcial de la sesión y devuelve
+    los bytes escritos. El archivo se recorta a ``start`` antes, por si una
+    parte anterior quedó escrita a medias.
+    """
+    path = default_storage.path(session.partial_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    remaining = length
+    with open(path, 'ab') as partial:
+        partial.truncate(start)
+        while remaining:
+            block = stream.read(min(COPY_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            partial.write(block)
+            remaining -= len(block)
+
+    return length - remaining
+
+
+def assemble_upload(session):
+    """Mueve el archivo completo a su ruta final y devuelve su nombre"""
+    storage = ActivityResponse._meta.get_field(
+        f'{session.response_type}_response'
+    ).storage
+    return storage.save_local_file(
+        default_storage.path(session.partial_name),
+        activity_media_response_file_path(None, session.filename),
+    )
+
+
+def discard_upload(session):
+    """Borra el archivo parcial de una sesión"""
+    try:
+        os.remove(default_storage.path(session.partial_name))
+    except FileNotFoundError:
+        pass
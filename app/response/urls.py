@@ -21,8 +21,16 @@ urlpatterns = [
     # Para el Forms
     path('retrieve-forms/', views.AllFormsQuestionResponsesView.as_view(), name ="all forms responses"),  # noqa
     path('add/forms-response/<int:question_id>/', views.CreateFormsQuestionResponseView.as_view(), name ="user question response"),  # noqa
+    path('add/forms-responses/', views.BulkFormsQuestionResponseView.as_view(), name='bulk-forms-responses'),  # noqa
     # Para marcar un modulo completado
     path('completed-module/<int:parent_activity_id>', views.PostModuleResponseCompletionView.as_view(), name ="complete activity module"),  # noqa
     path('complete-modules/', views.ListModuleResponseCompletionView.as_view(), name ="complete activity module"),  # noqa
+    # Resumen de progreso
+    path('progress/', views.UserProgressView.as_view(), name='progress'),
+    # Subidas por partes de video y audio
+    path('uploads/<uuid:session_id>/', views.ResponseUploadView.as_view(), name='upload-session'),  # noqa
+    path('uploads/<uuid:session_id>/finalize/', views.ResponseUploadFinalizeView.as_view(), name='upload-session-finalize'),  # noqa
+    # Exportación para investigadores
+    path('export/<str:dataset>/', views.export_responses, name='export'),
 
 ]
@@ -2,36 +2,63 @@
 Views para Respuestas de Usuarios a Actividades y Preguntas
 """
 from rest_framework import viewsets, generics, status, mixins
-from rest_framework.decorators import action
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework.authentication import TokenAuthentication
 from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
     OpenApiParameter,
     OpenApiTypes,
 )
+from core.authentication import CachedTokenAuthentication
 from core.models import (
     User,
     Activity,
     FormsQuestion,
     ActivityResponse,
     FormsQuestionResponse,
-    ModuleResponseCompletion
+    ModuleResponseCompletion,
+    ResponseUploadSession,
+    UserProgress,
+)
+from response.exports import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    iter_export,
 )
 from response.serializers import (
     ActivityResponseSerializer,
     FormsQuestionResponseSerializer,
-    ModuleResponseCompletionSerializer
+    ModuleResponseCompletionSerializer,
+    FormsQuestionResponseBulkItemSerializer,
+    ResponseUploadSessionSerializer,
+    UserProgressSerializer,
+)
+from response.uploads import (
+    append_chunk,
+    assemble_upload,
+    discard_upload,
+    parse_content_range,
 )
+from user.views import IsSuperUser
 
 
 class PostModuleResponseCompletionView(generics.CreateAPIView):
     """Serializador para el modelo de finalización de respuesta de un módulo"""  # noqa
     serializer_class = ModuleResponseCompletionSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -48,7 +75,7 @@ class ListModuleResponseCompletionView(generics.ListAPIView):
        Un administrador puede ver todos los modulos
        completados de todos los usuarios."""
     serializer_class = ModuleResponseCompletionSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -62,10 +89,31 @@ class ListModuleResponseCompletionView(generics.ListAPIView):
         return queryset
 
 
+class UserProgressView(generics.RetrieveAPIView):
+    """
+    Resumen de progreso del usuario autenticado. Un administrador puede
+    consultar el de otro usuario con ``?user=<id>``.
+    """
+    serializer_class = UserProgressSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        user_id = self.request.user.id
+        requested = self.request.query_params.get('user')
+        if requested and self.request.user.is_superuser:
+            if not requested.isdigit():
+                raise ValidationError({'user': ['A valid user id is required.']})  # noqa
+            user_id = get_object_or_404(User, pk=int(requested)).pk
+        progress = UserProgress.objects.filter(user_id=user_id).first()
+        # sin respuestas todavía
+        return progress or UserProgress(user_id=user_id)
+
+
 class AllFormsQuestionResponsesView(generics.ListAPIView):
     """Permite a Usuario/Admin Ver Respuestas Del Forms"""
     serializer_class = FormsQuestionResponseSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -82,7 +130,7 @@ class AllFormsQuestionResponsesView(generics.ListAPIView):
 class CreateFormsQuestionResponseView(generics.CreateAPIView):
     """Permite a Usuario Postear Respuestas Del Forms"""
     serializer_class = FormsQuestionResponseSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -93,6 +141,91 @@ class CreateFormsQuestionResponseView(generics.CreateAPIView):
         serializer.save(user=user, question=question)
 
 
+BULK_FORMS_MAX_ITEMS = 200
+
+
+class BulkFormsQuestionResponseView(generics.GenericAPIView):
+    """Permite a Usuario Postear Varias Respuestas Del Forms en un Envío
+
+    Las respuestas se validan juntas y sólo se guardan si todas son
+    válidas. Una respuesta existente para la misma pregunta se actualiza.
+    """
+    serializer_class = FormsQuestionResponseBulkItemSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(many=True, allow_empty=False,
+                      max_length=BULK_FORMS_MAX_ITEMS)
+        return super().get_serializer(*args, **kwargs)
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if not isinstance(errors, list):
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'results': [
+                {'status': 'error', 'errors': item} if item
+                else {'status': 'skipped'}
+                for item in errors
+            ]}, status=status.HTTP_400_BAD_REQUEST)
+
+        items = serializer.validated_data
+        question_ids = [item['question'] for item in items]
+        questions = FormsQuestion.objects.in_bulk(question_ids)
+
+        results = []
+        seen = set()
+        for question_id in question_ids:
+            result = {'question': question_id, 'status': 'skipped'}
+            if question_id not in questions:
+                error = 'Question does not exist.'
+            elif question_id in seen:
+                error = 'Question is repeated in the request.'
+            else:
+                error = None
+            if error:
+                result.update(status='error', errors={'question': [error]})
+            seen.add(question_id)
+            results.append(result)
+
+        if any(result['status'] == 'error' for result in results):
+            return Response({'results': results},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+        existing = set(FormsQuestionResponse.objects.filter(
+            user=user,
+            question_id__in=question_ids,
+        ).values_list('question_id', flat=True))
+
+        with transaction.atomic():
+            FormsQuestionResponse.objects.bulk_create(
+                [
+                    FormsQuestionResponse(
+                        user=user,
+                        question=questions[item['question']],
+                        score=item['score'],
+                        time_minutes=item['time_minutes'],
+                    )
+                    for item in items
+                ],
+                update_conflicts=True,
+                unique_fields=['user', 'question'],
+                update_fields=['score', 'time_minutes'],
+            )
+
+        return Response({'results': [
+            {
+                'question': question_id,
+                'status': 'updated' if question_id in existing else 'created',
+            }
+            for question_id in question_ids
+        ]})
+
+
 @extend_schema_view(
     list=extend_schema(
         parameters=[
@@ -118,7 +251,7 @@ class ActivityResponseView(mixins.ListModelMixin, viewsets.GenericViewSet):
     """Vista para Obtener Respuestas de Actividades"""
     serializer_class = ActivityResponseSerializer
     queryset = ActivityResponse.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -172,6 +305,21 @@ class ActivityResponseView(mixins.ListModelMixin, viewsets.GenericViewSet):
         serializer.save(user=user, activity=activity_object)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(
+        methods=['POST'],
+        detail=True,
+        url_path='upload-session',
+        serializer_class=ResponseUploadSessionSerializer,
+    )
+    def create_upload_session(self, request, pk=None):
+        """Inicia una subida por partes de una respuesta de video o audio"""
+        activity_object = get_object_or_404(Activity, id=pk)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user, activity=activity_object)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     @action(methods=['PUT'], detail=True, url_path='update-response')
     def update_response(self, request, pk=None):
         """Actualiza una respuesta existente"""
@@ -195,3 +343,144 @@ class ActivityResponseView(mixins.ListModelMixin, viewsets.GenericViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save(user=user, activity=activity_object)
         return Response(serializer.data)
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            'file_format',
+            OpenApiTypes.STR,
+            enum=list(EXPORT_FORMATS),
+            description='Export Format (csv by Default)',
+        ),
+    ],
+    responses={(200, 'text/csv'): OpenApiTypes.BINARY},
+)
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsSuperUser])
+def export_responses(request, dataset):
+    """Exporta todas las respuestas de un dataset en streaming (Sólo Admins)"""
+    if dataset not in EXPORT_DATASETS:
+        raise NotFound(detail="Export dataset does not exist")
+
+    file_format = request.query_params.get('file_format', 'csv')
+    if file_format not in EXPORT_FORMATS:
+        raise ValidationError({'file_format': 'Must be csv or ndjson.'})
+
+    response = StreamingHttpResponse(
+        iter_export(dataset, file_format),
+        content_type=EXPORT_FORMATS[file_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{dataset}-responses.{file_format}"'
+    )
+    return response
+
+
+class ResponseUploadView(APIView):
+    """Consulta, envía partes o cancela una subida por partes
+
+    Cada parte se envía con PUT, el cuerpo crudo y el header
+    ``Content-Range: bytes <inicio>-<fin>/<total>``. El inicio debe ser el
+    ``offset`` actual de la sesión; si no, se responde 409 con el offset
+    desde el cual reanudar.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = ResponseUploadSessionSerializer
+
+    def get_session(self, request, session_id, lock=False):
+        queryset = ResponseUploadSession.objects.filter(user=request.user)
+        if lock:
+            queryset = queryset.select_for_update()
+        return get_object_or_404(queryset, id=session_id)
+
+    def get(self, request, session_id):
+        session = self.get_session(request, session_id)
+        return Response(self.serializer_class(session).data)
+
+    @extend_schema(request={'application/octet-stream': OpenApiTypes.BINARY})
+    def put(self, request, session_id):
+        content_range = parse_content_range(
+            request.META.get('HTTP_CONTENT_RANGE')
+        )
+        if content_range is None:
+            return Response({"error": "A valid Content-Range header is required."}, status=status.HTTP_400_BAD_REQUEST)  # noqa
+        start, end, total = content_range
+        length = end - start + 1
+
+        if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+            return Response({"error": f"Chunks cannot exceed {settings.UPLOAD_CHUNK_MAX_SIZE} bytes."}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)  # noqa
+        if int(request.META.get('CONTENT_LENGTH') or 0) != length:
+            return Response({"error": "Content-Length does not match Content-Range."}, status=status.HTTP_400_BAD_REQUEST)  # noqa
+
+        with transaction.atomic():
+            session = self.get_session(request, session_id, lock=True)
+
+            if (total is not None and total != session.size) or end >= session.size:  # noqa
+                return Response({"error": "Content-Range does not match the upload size."}, status=status.HTTP_400_BAD_REQUEST)  # noqa
+            if start != session.offset:
+                return Response({"error": "Chunk does not start at the current offset.", "offset": session.offset}, status=status.HTTP_409_CONFLICT)  # noqa
+
+            written = append_chunk(session, request.stream, start, length)
+            session.offset = start + written
+            session.save(update_fields=['offset', 'updated_at'])
+
+        if written != length:
+            return Response({"error": "Incomplete chunk.", "offset": session.offset}, status=status.HTTP_400_BAD_REQUEST)  # noqa
+
+        return Response(self.serializer_class(session).data)
+
+    def delete(self, request, session_id):
+        session = self.get_session(request, session_id)
+        discard_upload(session)
+        session.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ResponseUploadFinalizeView(APIView):
+    """Termina una subida por partes y adjunta el archivo a la respuesta"""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = ActivityResponseSerializer
+
+    @extend_schema(request=None)
+    def post(self, request, session_id):
+        with transaction.atomic():
+            session = get_object_or_404(
+                ResponseUploadSession.objects.select_for_update(),
+                user=request.user,
+                id=session_id,
+            )
+            if session.offset != session.size:
+                return Response({"error": "Upload is not complete.", "offset": session.offset}, status=status.HTTP_409_CONFLICT)  # noqa
+
+            activity_response = ActivityResponse.objects.filter(
+                user=request.user,
+                activity_id=session.activity_id,
+            ).first()
+            created = activity_response is None
+            if created:
+                activity_response = ActivityResponse(
+                    user=request.user,
+                    activity_id=session.activity_id,
+                    response_type=session.response_type,
+                )
+            elif activity_response.response_type != session.response_type:
+                return Response({"error": "You cannot update the response type"}, status=status.HTTP_400_BAD_REQUEST)  # noqa
+
+            name = assemble_upload(session)
+            setattr(activity_response, f'{session.response_type}_response', name)  # noqa
+            activity_response.time_minutes = session.time_minutes
+            activity_response.save()
+            session.delete()
+
+        serializer = self.serializer_class(
+            activity_response,
+            context={'request': request},
+        )
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
@@ -0,0 +1,86 @@
+"""
+Lecturas y escrituras parciales de user defaults hechas en PostgreSQL
+"""
+import json
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import connection, models
+from django.db.models import F, Func, Value
+
+from core.models import UserUserDefaults
+
+
+class JSONBObject(Func):
+    """El valor jsonb si es un objeto, si no ``{}`` (defaults de texto)"""
+    template = (
+        "CASE WHEN jsonb_typeof(%(expressions)s) = 'object' "
+        "THEN %(expressions)s ELSE '{}'::jsonb END"
+    )
+    output_field = models.JSONField()
+
+
+class JSONBSubset(Func):
+    """Sólo las claves ``keys`` de un objeto jsonb (las que existan)"""
+    template = (
+        "(SELECT coalesce(jsonb_object_agg(key, value), '{}'::jsonb) "
+        "FROM jsonb_each(%(expressions)s))"
+    )
+    # jsonb_each(<objeto>) WHERE key = ANY(<keys>)
+    arg_joiner = ') WHERE key = ANY('
+    output_field = models.JSONField()
+
+    def __init__(self, expression, keys, **extra):
+        super().__init__(
+            JSONBObject(expression),
+            Value(list(keys), output_field=ArrayField(models.TextField())),
+            **extra,
+        )
+
+
+def defaults_subset(user, keys):
+    """Consulta con las claves ``keys`` de los user defaults de ``user``"""
+    return UserUserDefaults.objects.filter(user=user).values_list(
+        JSONBSubset(F('user_defaults'), keys), flat=True,
+    )
+
+
+# Aplica el merge patch sobre la fila bloqueada y regresa, de las claves
+# del patch, las que cambiaron con su valor nuevo (null si se borró).
+MERGE_PATCH_SQL = '''
+WITH previous AS (
+    SELECT id, user_defaults FROM {table} WHERE user_id = %s FOR UPDATE
+)
+UPDATE {table} AS defaults
+SET user_defaults = jsonb_merge_patch(defaults.user_defaults, %s::jsonb)
+FROM previous
+WHERE defaults.id = previous.id
+    AND coalesce(jsonb_typeof(previous.user_defaults), 'object') = 'object'
+RETURNING (
+    SELECT coalesce(
+        jsonb_object_agg(key, defaults.user_defaults -> key), '{{}}'::jsonb
+    )
+    FROM jsonb_object_keys(%s::jsonb) AS key
+    WHERE (previous.user_defaults -> key)
+        IS DISTINCT FROM (defaults.user_defaults -> key)
+)
+'''
+
+
+def merge_patch_defaults(user, patch):
+    """
+    Aplica ``patch`` (JSON Merge Patch, RFC 7386) a los user defaults de
+    ``user`` en una sola sentencia, sin leer ni reescribir el documento
+    completo desde Python. Regresa las claves que cambiaron o ``None`` si
+    el usuario no tiene user defaults o si no son un objeto (NULL sí se
+    trata como objeto vacío).
+    """
+    document = json.dumps(patch)
+    sql = MERGE_PATCH_SQL.format(
+        table=connection.ops.quote_name(UserUserDefaults._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [user.pk, document, document])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0])
@@ -1,6 +1,8 @@
 """
 Serializadores para la API de Swift Connection.
 """
+import json
+
 from rest_framework import serializers
 from core.models import (
     # UserPhotoMedia,
@@ -9,8 +11,33 @@ from core.models import (
 )
 
 
+class UserDefaultsTextField(serializers.Field):
+    """
+    ``user_defaults`` como texto JSON, el formato que la app ya envía y
+    espera. Un objeto JSON se guarda como objeto jsonb; cualquier otro
+    texto se guarda como cadena y se regresa igual. NULL se regresa como
+    null.
+    """
+
+    def to_representation(self, value):
+        if value is None:
+            return None
+        return value if isinstance(value, str) else json.dumps(value)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            return data
+        try:
+            value = json.loads(data)
+        except ValueError:
+            return data
+        return value if isinstance(value, dict) else data
+
+
 class UserUserDefaultsSerializer(serializers.ModelSerializer):
     """Serializador para el modelo de de finalización de resouesta de un módulo"""  # noqa
+    user_defaults = UserDefaultsTextField(required=False, allow_null=True)
+
     class Meta:
         model = UserUserDefaults
         fields = '__all__'
@@ -0,0 +1,167 @@
+"""
+Tests para la API de user defaults.
+"""
+import json
+from importlib import import_module
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import UserUserDefaults
+from swiftcon.serializers import UserDefaultsTextField
+
+
+ADD_URL = reverse('swiftcon:post user defaults')
+DEFAULTS_URL = reverse('swiftcon:get/update user defaults')
+KEYS_URL = reverse('swiftcon:user defaults keys')
+
+
+class UserDefaultsApiTests(TestCase):
+    """Test de los endpoints de user defaults"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_text_contract_is_kept(self):
+        """Test que el endpoint original sigue recibiendo y dando texto"""
+        res = self.client.post(
+            ADD_URL, {'user_defaults': '{"theme": "dark", "volume": 3}'},
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        defaults = UserUserDefaults.objects.get(user=self.user)
+        self.assertEqual(defaults.user_defaults, {'theme': 'dark', 'volume': 3})  # noqa
+        res = self.client.get(DEFAULTS_URL)
+        self.assertEqual(
+            json.loads(res.data['user_defaults']),
+            {'theme': 'dark', 'volume': 3},
+        )
+
+    def test_non_object_text_is_kept(self):
+        """Test que el texto que no es un objeto JSON regresa igual"""
+        for text in ['"dark"', '[1, 2]', '42', 'not json']:
+            UserUserDefaults.objects.filter(user=self.user).delete()
+            self.client.post(ADD_URL, {'user_defaults': text})
+
+            res = self.client.get(DEFAULTS_URL)
+
+            self.assertEqual(res.data['user_defaults'], text)
+
+    def test_subset_of_keys(self):
+        """Test que GET con keys regresa sólo esas claves"""
+        UserUserDefaults.objects.create(
+            user=self.user,
+            user_defaults={'theme': 'dark', 'volume': 3, 'lang': 'es'},
+        )
+
+        res = self.client.get(KEYS_URL, {'keys': 'theme,lang,missing'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'theme': 'dark', 'lang': 'es'})
+        res = self.client.get(KEYS_URL)
+        self.assertEqual(len(res.json()), 3)
+
+    def test_merge_patch_returns_changed_keys(self):
+        """Test que el merge patch se aplica y regresa sólo lo que cambió"""
+        UserUserDefaults.objects.create(
+            user=self.user,
+            user_defaults={
+                'theme': 'dark', 'volume': 3, 'lang': 'es',
+                'layout': {'grid': True, 'columns': 2},
+            },
+        )
+
+        res = self.client.generic(
+            'PATCH', KEYS_URL,
+            json.dumps({
+                'theme': 'dark', 'volume': 5, 'lang': None,
+                'layout': {'columns': 3}, 'sound': True,
+            }),
+            content_type='application/merge-patch+json',
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {
+            'volume': 5, 'lang': None,
+            'layout': {'grid': True, 'columns': 3}, 'sound': True,
+        })
+        defaults = UserUserDefaults.objects.get(user=self.user)
+        self.assertEqual(defaults.user_defaults, {
+            'theme': 'dark', 'volume': 5,
+            'layout': {'grid': True, 'columns': 3}, 'sound': True,
+        })
+
+    def test_merge_patch_must_be_object(self):
+        """Test que un patch que no es objeto es rechazado"""
+        UserUserDefaults.objects.create(user=self.user, user_defaults={})
+
+        res = self.client.patch(KEYS_URL, [1, 2], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_null_defaults_stay_null(self):
+        """Test que user defaults nulos se guardan y regresan como null"""
+        res = self.client.post(ADD_URL, {'user_defaults': None}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        defaults = UserUserDefaults.objects.get(user=self.user)
+        self.assertIsNone(defaults.user_defaults)
+        res = self.client.get(DEFAULTS_URL)
+        self.assertIsNone(res.data['user_defaults'])
+
+    def test_merge_patch_on_null_defaults(self):
+        """Test que el merge patch sobre user defaults nulos crea el objeto"""
+        UserUserDefaults.objects.create(user=self.user, user_defaults=None)
+
+        res = self.client.patch(KEYS_URL, {'theme': 'dark'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {'theme': 'dark'})
+        defaults = UserUserDefaults.objects.get(user=self.user)
+        self.assertEqual(defaults.user_defaults, {'theme': 'dark'})
+
+    def test_merge_patch_on_text_defaults(self):
+        """Test que el merge patch no reemplaza user defaults de texto"""
+        UserUserDefaults.objects.create(user=self.user, user_defaults='dark')
+
+        res = self.client.patch(KEYS_URL, {'theme': 'dark'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        defaults = UserUserDefaults.objects.get(user=self.user)
+        self.assertEqual(defaults.user_defaults, 'dark')
+
+    def test_keys_without_defaults(self):
+        """Test que sin user defaults ambos métodos regresan 404"""
+        res = self.client.get(KEYS_URL, {'keys': 'theme'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.patch(KEYS_URL, {'theme': 'dark'}, format='json')
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class UserDefaultsMigrationTests(TestCase):
+    """Test de la conversión del texto guardado a jsonb (0008)"""
+
+    def test_legacy_text_round_trips(self):
+        """Test que el texto que no es un objeto JSON no se pierde"""
+        migration = import_module('core.migrations.0008_userdefaults_jsonb')
+        field = UserDefaultsTextField()
+
+        for text in ['"dark"', '[1, 2]', 'null', 'not json']:
+            value = migration.text_to_value(text)
+            self.assertEqual(field.to_representation(value), text)
+            self.assertEqual(migration.value_to_text(value), text)
+
+        value = migration.text_to_value('{"theme": "dark"}')
+        self.assertEqual(value, {'theme': 'dark'})
+        self.assertIsNone(migration.text_to_value(None))
+        self.assertIsNone(migration.value_to_text(None))
@@ -10,4 +10,5 @@ app_name = 'swiftcon'
 urlpatterns = [
     path('user-default/add', views.CreateUserUserDefaultsView.as_view(), name="post user defaults"),  # noqa
     path('user-default/', views.RetrieveUpdateUserUserDefaultsView.as_view(), name="get/update user defaults"),  # noqa
+    path('user-default/keys/', views.UserUserDefaultsKeysView.as_view(), name="user defaults keys"),  # noqa
 ]
@@ -2,35 +2,110 @@
 Vistas para la API de Swift Connection
 """
 from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from swiftcon.serializers import (
     UserUserDefaultsSerializer
 )
+from core.asyncviews import AsyncViewMixin
+from core.authentication import CachedTokenAuthentication
 from core.models import (
     # UserPhotoMedia,
     # UserVideoMedia,
     UserUserDefaults
 )
+from swiftcon.defaults import defaults_subset, merge_patch_defaults
+
+
+class MergePatchParser(JSONParser):
+    """Cuerpos ``application/merge-patch+json`` (RFC 7386)"""
+    media_type = 'application/merge-patch+json'
 
 
 class CreateUserUserDefaultsView(generics.CreateAPIView):
     """Vista para la creación del modelo de user defaults"""
     serializer_class = UserUserDefaultsSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
-class RetrieveUpdateUserUserDefaultsView(generics.RetrieveUpdateAPIView):
-    """Vista para la obtención y actualización del modelo de user defaults"""
+class RetrieveUpdateUserUserDefaultsView(AsyncViewMixin,
+                                         generics.RetrieveUpdateAPIView):
+    """
+    Vista para la obtención y actualización del modelo de user defaults.
+    Bajo ASGI el GET es async y la actualización corre en un hilo.
+    """
     serializer_class = UserUserDefaultsSerializer
     queryset = UserUserDefaults.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return UserUserDefaults.objects.get(user=self.request.user)
+        try:
+            return UserUserDefaults.objects.get(user=self.request.user)
+        except UserUserDefaults.DoesNotExist:
+            raise NotFound('User defaults not found.')
+
+    async def aget(self, request, *args, **kwargs):
+        try:
+            instance = await UserUserDefaults.objects.aget(user=request.user)
+        except UserUserDefaults.DoesNotExist:
+            raise NotFound('User defaults not found.')
+        return Response(self.get_serializer(instance).data)
+
+
+class UserUserDefaultsKeysView(AsyncViewMixin, generics.GenericAPIView):
+    """
+    User defaults como objeto JSON, por claves. GET con ``?keys=a,b``
+    regresa sólo esas claves; PATCH recibe un JSON Merge Patch, lo aplica
+    en la base de datos y regresa sólo las claves que cambiaron (null si se
+    borraron). Bajo ASGI el GET es async.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, MergePatchParser]
+
+    def get_defaults(self, request):
+        """Consulta con los user defaults pedidos en ``?keys``"""
+        keys = [
+            key for key in request.query_params.get('keys', '').split(',')
+            if key
+        ]
+        if keys:
+            return defaults_subset(request.user, keys)
+        return UserUserDefaults.objects.filter(
+            user=request.user,
+        ).values_list('user_defaults', flat=True)
+
+    def get(self, request, *args, **kwargs):
+        try:
+            defaults = self.get_defaults(request).get()
+        except UserUserDefaults.DoesNotExist:
+            raise NotFound('User defaults not found.')
+        return Response(defaults)
+
+    async def aget(self, request, *args, **kwargs):
+        try:
+            defaults = await self.get_defaults(request).aget()
+        except UserUserDefaults.DoesNotExist:
+            raise NotFound('User defaults not found.')
+        return Response(defaults)
+
+    def patch(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            raise ValidationError('The merge patch must be a JSON object.')
+        changed = merge_patch_defaults(request.user, request.data)
+        if changed is None:
+            if UserUserDefaults.objects.filter(user=request.user).exists():
+                # texto guardado que no es un objeto JSON: no se reemplaza
+                raise ValidationError(
+                    'The user defaults are not a JSON object.',
+                )
+            raise NotFound('User defaults not found.')
+        return Response(changed)
@@ -0,0 +1,221 @@
+"""
+Estadísticas agregadas de los scores de competencias
+"""
+import math
+
+from django.db.models import (
+    Aggregate,
+    Avg,
+    Count,
+    F,
+    FilteredRelation,
+    FloatField,
+    Max,
+    Min,
+    Q,
+    StdDev,
+)
+
+from core.cache import get_or_build
+from core.models import (
+    COMPETENCY_SCORE_FIELDS,
+    CompetencyScore,
+    ScorePhase,
+    UserData,
+)
+
+
+SCORES_CACHE_NAMESPACE = 'user:scores'
+
+# Campos de UserData por los que se puede agrupar la mejora
+IMPROVEMENT_GROUPS = (
+    'country',
+    'institution',
+    'gender',
+    'discipline',
+    'academic_degree',
+)
+
+SCORE_PERCENTILES = (25, 50, 75, 90)
+# Cubetas [0, 10), [10, 20), ... [90, 100]
+HISTOGRAM_BIN_WIDTH = 10
+HISTOGRAM_BINS = 10
+
+
+class Percentile(Aggregate):
+    """``percentile_cont`` de PostgreSQL (interpolado)"""
+    function = 'percentile_cont'
+    name = 'Percentile'
+    output_field = FloatField()
+    template = (
+        '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'  # noqa
+    )
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=percentile / 100, **extra)
+
+
+def _histogram_bins(field):
+    bins = {}
+    for index in range(HISTOGRAM_BINS):
+        low = index * HISTOGRAM_BIN_WIDTH
+        condition = Q(**{f'{field}__gte': low})
+        if index < HISTOGRAM_BINS - 1:
+            condition &= Q(**{f'{field}__lt': low + HISTOGRAM_BIN_WIDTH})
+        bins[f'{field}__bin{index}'] = Count('id', filter=condition)
+    return bins
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def with_phase_scores(user_data):
+    """
+    Une a una consulta de UserData los scores de cada fase como
+    ``initial_score`` y ``final_score`` (un JOIN por fase sobre el índice
+    único ``(user, phase)`` de CompetencyScore).
+    """
+    return user_data.annotate(**{
+        f'{phase.label}_score': FilteredRelation(
+            'user__competency_scores',
+            condition=Q(user__competency_scores__phase=phase),
+        )
+        for phase in ScorePhase
+    })
+
+
+def _summary(row):
+    competencies = {}
+    for field in COMPETENCY_SCORE_FIELDS:
+        competencies[field] = {
+            'mean': _round(row[f'{field}__mean']),
+            'median': _round(row[f'{field}__p50']),
+            'stddev': _round(row[f'{field}__stddev']),
+            'min': row[f'{field}__min'],
+            'max': row[f'{field}__max'],
+            'percentiles': {
+                f'p{percentile}': _round(row[f'{field}__p{percentile}'])
+                for percentile in SCORE_PERCENTILES
+            },
+            'histogram': [
+                row[f'{field}__bin{index}'] for index in range(HISTOGRAM_BINS)
+            ],
+        }
+    return {'count': row['count'], 'competencies': competencies}
+
+
+def score_summaries():
+    """
+    Media, mediana, percentiles e histograma de cada competencia en cada
+    fase, calculados por PostgreSQL en una sola consulta agrupada por fase.
+    """
+    aggregates = {'count': Count('id')}
+    for field in COMPETENCY_SCORE_FIELDS:
+        aggregates[f'{field}__mean'] = Avg(field)
+        aggregates[f'{field}__stddev'] = StdDev(field, sample=True)
+        aggregates[f'{field}__min'] = Min(field)
+        aggregates[f'{field}__max'] = Max(field)
+        for percentile in SCORE_PERCENTILES:
+            aggregates[f'{field}__p{percentile}'] = Percentile(
+                field, percentile,
+            )
+        aggregates.update(_histogram_bins(field))
+
+    rows = {
+        row['phase']: row
+        for row in CompetencyScore.objects.filter(
+            user__is_superuser=False,
+        ).values('phase').annotate(**aggregates).order_by()
+    }
+    # una fase sin scores da lo mismo que aggregate() sobre cero filas
+    empty = {
+        name: 0 if isinstance(aggregate, Count) else None
+        for name, aggregate in aggregates.items()
+    }
+    return {
+        phase.label: _summary(rows.get(phase, empty)) for phase in ScorePhase
+    }
+
+
+def build_score_analytics():
+    return {
+        'histogram_bins': [
+            [index * HISTOGRAM_BIN_WIDTH,
+             min((index + 1) * HISTOGRAM_BIN_WIDTH, 100)]
+            for index in range(HISTOGRAM_BINS)
+        ],
+        **score_summaries(),
+    }
+
+
+def get_score_analytics():
+    """Devuelve las estadísticas de scores desde la cache"""
+    return get_or_build(
+        SCORES_CACHE_NAMESPACE,
+        ('analytics',),
+        build_score_analytics,
+    )
+
+
+def _paired_statistics(count, mean, stddev):
+    """Tamaño de efecto (d_z) y estadístico t de una muestra pareada"""
+    if count < 2 or not stddev:
+        return None, None
+    effect_size = mean / stddev
+    return _round(effect_size), _round(effect_size * math.sqrt(count))
+
+
+def build_improvement_report(group_by):
+    """
+    Cambio de cada competencia entre el score inicial y el final, agrupado
+    por el campo ``group_by`` de UserData. PostgreSQL calcula las
+    diferencias por usuario y sus medias y desviaciones en una consulta.
+    """
+    aggregates = {'count': Count('id')}
+    for field in COMPETENCY_SCORE_FIELDS:
+        delta = (
+            F(f'final_score__{field}') -
+            F(f'initial_score__{field}')
+        )
+        aggregates[f'{field}__mean'] = Avg(delta, output_field=FloatField())
+        aggregates[f'{field}__stddev'] = StdDev(delta, sample=True)
+
+    # sólo usuarios con ambos scores
+    rows = with_phase_scores(UserData.objects.filter(
+        user__is_superuser=False,
+    )).filter(
+        initial_score__isnull=False,
+        final_score__isnull=False,
+    ).values(group_by).annotate(**aggregates).order_by(group_by)
+
+    groups = []
+    for row in rows:
+        competencies = {}
+        for field in COMPETENCY_SCORE_FIELDS:
+            mean = row[f'{field}__mean']
+            stddev = row[f'{field}__stddev']
+            effect_size, t_statistic = _paired_statistics(
+                row['count'], mean, stddev,
+            )
+            competencies[field] = {
+                'mean_delta': _round(mean),
+                'stddev_delta': _round(stddev),
+                'effect_size': effect_size,
+                't_statistic': t_statistic,
+            }
+        groups.append({
+            group_by: row[group_by],
+            'count': row['count'],
+            'competencies': competencies,
+        })
+    return {'group_by': group_by, 'groups': groups}
+
+
+def get_improvement_report(group_by):
+    """Devuelve el reporte de mejora de ``group_by`` desde la cache"""
+    return get_or_build(
+        SCORES_CACHE_NAMESPACE,
+        ('improvement', group_by),
+        lambda: build_improvement_report(group_by),
+    )
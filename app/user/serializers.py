@@ -7,10 +7,12 @@ from django.contrib.auth import (
     get_user_model,
     authenticate,
 )
+from django.db import transaction
 from rest_framework.authtoken.models import Token
 from django.utils.translation import gettext as _
 
 from rest_framework import serializers
+from core.authentication import invalidate_token
 from core.models import UserData, UserInitialScore, UserFinalScore
 
 
@@ -62,7 +64,8 @@ class UserInitialScoreSerializer(serializers.ModelSerializer):
     """Serializador para el modelo de scores iniciales de usuario"""
     class Meta:
         model = UserInitialScore
-        fields = '__all__'
+        # la fase la fija el modelo proxy
+        exclude = ['phase']
         read_only_fields = ['id', 'user']
 
     def create(self, validated_data):
@@ -74,7 +77,8 @@ class UserFinalScoreSerializer(serializers.ModelSerializer):
     """Serializador para el modelo de scores finales de usuario"""
     class Meta:
         model = UserFinalScore
-        fields = '__all__'
+        # la fase la fija el modelo proxy
+        exclude = ['phase']
         read_only_fields = ['id', 'user']
 
     def create(self, validated_data):
@@ -112,7 +116,12 @@ class AuthTokenSerializer(serializers.Serializer):
                 md5_algorithm.update(first_level_value.encode('utf-8'))
                 second_level_value = md5_algorithm.hexdigest()
 
+                # el token anterior sale de la cache hasta que la rotación
+                # está confirmada; antes una petición con la llave vieja
+                # podría volver a cachearla
+                old_key = token[0].key
                 token.update(key=second_level_value)
+                transaction.on_commit(lambda: invalidate_token(old_key))
             return token
         except Exception as ex:
             logging.error(msg=f'Failed to create auth token {ex}', stacklevel=logging.CRITICAL)  # noqa
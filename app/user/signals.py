@@ -0,0 +1,32 @@
+"""
+Señales para mantener la cache de estadísticas de usuarios
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import invalidate_namespace
+from core.models import (
+    CompetencyScore,
+    UserData,
+    UserFinalScore,
+    UserInitialScore,
+)
+from user.analytics import SCORES_CACHE_NAMESPACE
+
+
+@receiver(post_save, sender=CompetencyScore)
+@receiver(post_delete, sender=CompetencyScore)
+@receiver(post_save, sender=UserInitialScore)
+@receiver(post_delete, sender=UserInitialScore)
+@receiver(post_save, sender=UserFinalScore)
+@receiver(post_delete, sender=UserFinalScore)
+def score_changed(sender, **kwargs):
+    """Invalida las estadísticas al escribir un score"""
+    invalidate_namespace(SCORES_CACHE_NAMESPACE)
+
+
+@receiver(post_save, sender=UserData)
+@receiver(post_delete, sender=UserData)
+def user_data_changed(sender, **kwargs):
+    """Invalida los reportes agrupados por datos de usuario"""
+    invalidate_namespace(SCORES_CACHE_NAMESPACE)
@@ -0,0 +1,163 @@
+"""
+Tests para las estadísticas de scores
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import UserData, UserFinalScore, UserInitialScore
+
+
+ANALYTICS_URL = reverse('user:score_analytics')
+
+
+def create_scored_user(email, initial, final=None):
+    """Crea un usuario con todos sus scores iniciales en ``initial``"""
+    user = get_user_model().objects.create_user(email, 'testpass123')
+    UserInitialScore.objects.create(
+        user=user,
+        self_control_score=initial,
+        leadership_score=initial,
+    )
+    if final is not None:
+        UserFinalScore.objects.create(user=user, self_control_score=final)
+    return user
+
+
+class ScoreAnalyticsApiTests(TestCase):
+    """Test del endpoint de estadísticas de scores"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        for index, score in enumerate([10, 20, 30, 40, 100]):
+            create_scored_user(f'user{index}@example.com', score, score // 2)
+
+    def test_competency_statistics(self):
+        """Test media, mediana, percentiles e histograma"""
+        res = self.client.get(ANALYTICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        initial = res.data['initial']
+        self.assertEqual(initial['count'], 5)
+        stats = initial['competencies']['self_control_score']
+        self.assertEqual(stats['mean'], 40)
+        self.assertEqual(stats['median'], 30)
+        self.assertEqual(stats['min'], 10)
+        self.assertEqual(stats['max'], 100)
+        self.assertEqual(stats['percentiles']['p25'], 20)
+        self.assertEqual(stats['histogram'], [0, 1, 1, 1, 1, 0, 0, 0, 0, 1])
+        final = res.data['final']['competencies']['self_control_score']
+        self.assertEqual(final['mean'], 20)
+
+    def test_results_are_cached(self):
+        """Test que la segunda petición no consulta la base de datos"""
+        self.client.get(ANALYTICS_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ANALYTICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_score_write_invalidates_cache(self):
+        """Test que escribir un score recalcula las estadísticas"""
+        self.client.get(ANALYTICS_URL)
+
+        create_scored_user('new@example.com', 50)
+        res = self.client.get(ANALYTICS_URL)
+
+        self.assertEqual(res.data['initial']['count'], 6)
+
+    def test_requires_superuser(self):
+        """Test que sólo los admins ven las estadísticas"""
+        user = get_user_model().objects.get(email='user0@example.com')
+        self.client.force_authenticate(user)
+
+        res = self.client.get(ANALYTICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+IMPROVEMENT_URL = reverse('user:improvement_report')
+
+
+class ImprovementReportApiTests(TestCase):
+    """Test del reporte de mejora por datos demográficos"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        scores = [
+            ('MX', 10, 30),
+            ('MX', 20, 30),
+            ('MX', 30, 60),
+            ('CO', 50, 40),
+        ]
+        for index, (country, initial, final) in enumerate(scores):
+            user = create_scored_user(
+                f'user{index}@example.com', initial, final,
+            )
+            UserData.objects.create(
+                user=user,
+                full_name='Test Name',
+                academic_degree='Bachelor',
+                institution='Test University',
+                gender='F',
+                age=20,
+                country=country,
+                discipline='Engineering',
+            )
+        # sin score final: no cuenta
+        user = create_scored_user('partial@example.com', 90)
+        UserData.objects.create(
+            user=user, full_name='Partial', academic_degree='Bachelor',
+            institution='Test University', gender='F', age=20,
+            country='MX', discipline='Engineering',
+        )
+
+    def test_improvement_by_country(self):
+        """Test media de cambio, tamaño de efecto y t pareada por país"""
+        res = self.client.get(IMPROVEMENT_URL, {'group_by': 'country'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        groups = {group['country']: group for group in res.data['groups']}
+        self.assertEqual(groups['MX']['count'], 3)
+        mx = groups['MX']['competencies']['self_control_score']
+        # deltas 20, 10, 30
+        self.assertEqual(mx['mean_delta'], 20)
+        self.assertEqual(mx['stddev_delta'], 10)
+        self.assertEqual(mx['effect_size'], 2)
+        self.assertEqual(mx['t_statistic'], 3.46)
+        co = groups['CO']['competencies']['self_control_score']
+        self.assertEqual(co['mean_delta'], -10)
+        self.assertIsNone(co['t_statistic'])
+
+    def test_invalid_group(self):
+        """Test que sólo se agrupa por campos demográficos"""
+        res = self.client.get(IMPROVEMENT_URL, {'group_by': 'full_name'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_per_group(self):
+        """Test que cada agrupación se cachea por separado"""
+        self.client.get(IMPROVEMENT_URL, {'group_by': 'country'})
+
+        with self.assertNumQueries(0):
+            self.client.get(IMPROVEMENT_URL, {'group_by': 'country'})
+        res = self.client.get(IMPROVEMENT_URL, {'group_by': 'gender'})
+
+        self.assertEqual(res.data['groups'][0]['count'], 4)
@@ -8,10 +8,13 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core.models import UserData, UserInitialScore, UserFinalScore
+
 
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
+USERS_INFO_URL = reverse('user:all_user_info')
 
 
 def create_user(**params):
@@ -19,6 +22,21 @@ def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
 
+def create_user_data(user, **params):
+    """Crea y devuelve la información de un usuario"""
+    defaults = {
+        'full_name': 'Full Name',
+        'academic_degree': 'Bachelor',
+        'institution': 'SEL4C',
+        'gender': 'Female',
+        'age': 20,
+        'country': 'Mexico',
+        'discipline': 'STEM',
+    }
+    defaults.update(params)
+    return UserData.objects.create(user=user, **defaults)
+
+
 class PublicUserApiTests(TestCase):
     """Clase para testear propiedades publicas de API usuario"""
 
@@ -164,3 +182,102 @@ class PrivateUserApiTests(TestCase):
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class UsersInfoApiTests(TestCase):
+    """Test del listado de información de usuarios para admins"""
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            'admin@example.com',
+            'testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _create_participants(self, count, **params):
+        users = []
+        for _ in range(count):
+            user = create_user(
+                email=f'user{UserData.objects.count()}@example.com',
+                password='testpass123',
+            )
+            create_user_data(user, **params)
+            users.append(user)
+        return users
+
+    def test_users_info_shape_and_default_scores(self):
+        """Test que mantiene el formato y devuelve 0 sin scores"""
+        user, other = self._create_participants(2)
+        UserInitialScore.objects.create(user=user, leadership_score=80)
+
+        res = self.client.get(USERS_INFO_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+        first, second = res.data
+        self.assertEqual(first['user'], user.pk)
+        self.assertEqual(first['email'], user.email)
+        self.assertEqual(first['initial_score']['leadership_score'], 80)
+        self.assertEqual(first['initial_score']['user'], user.pk)
+        self.assertEqual(first['final_score'], 0)
+        self.assertEqual(second['initial_score'], 0)
+
+    def test_users_info_single_query(self):
+        """Test que el número de consultas no depende de los usuarios"""
+        for user in self._create_participants(5):
+            UserInitialScore.objects.create(user=user)
+            UserFinalScore.objects.create(user=user)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(USERS_INFO_URL)
+
+        self.assertEqual(len(res.data), 5)
+
+    def test_users_info_filters(self):
+        """Test filtrando por país, institución y disciplina"""
+        self._create_participants(2, country='Spain')
+        self._create_participants(1, country='Spain', discipline='Arts')
+        self._create_participants(3, country='Mexico')
+
+        res = self.client.get(USERS_INFO_URL, {'country': 'Spain'})
+        self.assertEqual(len(res.data), 3)
+
+        res = self.client.get(
+            USERS_INFO_URL,
+            {'country': 'Spain', 'discipline': 'Arts'},
+        )
+        self.assertEqual(len(res.data), 1)
+
+    def test_users_info_keyset_pagination(self):
+        """Test paginando por cursor de usuario"""
+        users = self._create_participants(5)
+
+        res = self.client.get(USERS_INFO_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['user'] for item in res.data['results']],
+            [users[0].pk, users[1].pk],
+        )
+        seen = [item['user'] for item in res.data['results']]
+        while res.data['next']:
+            res = self.client.get(res.data['next'])
+            seen.extend(item['user'] for item in res.data['results'])
+
+        self.assertEqual(seen, [user.pk for user in users])
+
+    def test_users_info_invalid_page_size(self):
+        """Test que devuelve error con un tamaño de página inválido"""
+        res = self.client.get(USERS_INFO_URL, {'page_size': 'all'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_users_info_requires_superuser(self):
+        """Test que sólo los admins pueden ver la información"""
+        user = create_user(email='user@example.com', password='testpass123')
+        self.client.force_authenticate(user=user)
+
+        res = self.client.get(USERS_INFO_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -33,4 +33,7 @@ urlpatterns = [
     path('scores/initial/', views.UserInitialScorePostView.as_view(), name='initial_scores'),  # noqa
     # Agrega scores finales
     path('scores/final/', views.UserFinalScorePostView.as_view(), name='final_scores'),  # noqa
+    # Estadísticas de scores para admins
+    path('scores/analytics/', views.score_analytics, name='score_analytics'),  # noqa
+    path('scores/improvement/', views.improvement_report, name='improvement_report'),  # noqa
 ]
@@ -12,7 +12,6 @@ from rest_framework.decorators import (
 )
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 from django.contrib.auth import get_user_model
@@ -23,7 +22,15 @@ from user.serializers import (
     UserInitialScoreSerializer,
     UserFinalScoreSerializer
 )
+from core.authentication import CachedTokenAuthentication
 from core.models import UserData, UserInitialScore, UserFinalScore
+from core.pagination import KeysetPagination
+from user.analytics import (
+    IMPROVEMENT_GROUPS,
+    get_improvement_report,
+    get_score_analytics,
+    with_phase_scores,
+)
 
 
 class IsSuperUser(permissions.BasePermission):
@@ -47,7 +54,7 @@ class CreateUserView(generics.CreateAPIView):
 class CreateAdminView(generics.CreateAPIView):
     """Crea un nuevo usuario en el sistema (No requiere Autenticación)"""
     serializer_class = UserSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsSuperUser]
 
     def perform_create(self, serializer):
@@ -57,7 +64,7 @@ class CreateAdminView(generics.CreateAPIView):
 class UserPersonalDataCreateView(generics.CreateAPIView):
     """Agrega la Info de Nuevos Usuarios (Requiere Autenticación)"""
     serializer_class = UserDataSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -67,7 +74,7 @@ class UserPersonalDataCreateView(generics.CreateAPIView):
 class UserPersonalDataView(generics.RetrieveUpdateAPIView):
     """Administra la Info de los Usuarios existentes (Requiere Autenticación)"""  # noqa
     serializer_class = UserDataSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -80,23 +87,54 @@ class UserPersonalDataView(generics.RetrieveUpdateAPIView):
         return UserData.objects.get(user=self.request.user)
 
 
+USERS_INFO_FILTERS = ('country', 'institution', 'discipline')
+
+
+def _score_data(serializer_class, score):
+    """Serializa un score o devuelve 0 si el usuario no lo ha registrado"""
+    if score is None:
+        return 0  # Default value
+    return serializer_class(score).data
+
+
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsSuperUser])
 def users_info(request):
-    """Devuelve toda la información de los usuarios (Requiere Autenticación)"""
-    user_data = UserData.objects.filter(user__is_superuser=False)
+    """Devuelve toda la información de los usuarios (Requiere Autenticación)
+
+    Usuario, datos personales y ambos scores se obtienen en una sola
+    consulta. Acepta los filtros ``country``, ``institution`` y
+    ``discipline``. Si se envía ``page_size`` o ``cursor`` la respuesta se
+    pagina por id de usuario con ``KeysetPagination``.
+    """
+    user_data = with_phase_scores(UserData.objects.filter(
+        user__is_superuser=False,
+    )).select_related(
+        'user',
+        'initial_score',
+        'final_score',
+    ).order_by('user_id')
+
+    for field in USERS_INFO_FILTERS:
+        value = request.query_params.get(field)
+        if value:
+            user_data = user_data.filter(**{field: value})
+
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(user_data, request)
 
     combined_data = []
 
-    for user_data_item in user_data:
+    for user_data_item in (user_data if page is None else page):
+        user = user_data_item.user
 
-        combined_item = {
+        combined_data.append({
             # Campos de Usuario
-            'user': user_data_item.user.pk,
-            'name': user_data_item.user.name,
-            'email': user_data_item.user.email,
-            'is_active': user_data_item.user.is_active,
+            'user': user.pk,
+            'name': user.name,
+            'email': user.email,
+            'is_active': user.is_active,
             # Campos de Datos de Usuarios
             'full_name': user_data_item.full_name,
             'academic_degree': user_data_item.academic_degree,
@@ -105,27 +143,24 @@ def users_info(request):
             'age': user_data_item.age,
             'country': user_data_item.country,
             'discipline': user_data_item.discipline,
-        }
-
-        initial_score = UserInitialScore.objects.filter(user=user_data_item.user).first()  # noqa
-        if initial_score:
-            combined_item['initial_score'] = UserInitialScoreSerializer(initial_score).data  # noqa
-        else:
-            combined_item['initial_score'] = 0  # Default value
-
-        final_score =  UserFinalScore.objects.filter(user=user_data_item.user).first()  # noqa
-        if final_score:
-            combined_item['final_score'] = UserFinalScoreSerializer(final_score).data  # noqa
-        else:
-            combined_item['final_score'] = 0  # Default value
-
-        combined_data.append(combined_item)
-
-    return Response(combined_data)
+            # Scores (0 si no existen)
+            'initial_score': _score_data(
+                UserInitialScoreSerializer,
+                getattr(user_data_item, 'initial_score', None),
+            ),
+            'final_score': _score_data(
+                UserFinalScoreSerializer,
+                getattr(user_data_item, 'final_score', None),
+            ),
+        })
+
+    if page is None:
+        return Response(combined_data)
+    return paginator.get_paginated_response(combined_data)
 
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsSuperUser])
 def admins_info(request):
     """Devuelve toda la información de los admins (Requiere Autenticación)"""
@@ -148,8 +183,35 @@ def admins_info(request):
     return Response(combined_data)
 
 
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsSuperUser])
+def score_analytics(request):
+    """
+    Estadísticas por competencia de los scores iniciales y finales
+    (Sólo Admins). Se calculan en SQL y se cachean hasta el siguiente
+    cambio de scores.
+    """
+    return Response(get_score_analytics())
+
+
+@api_view(['GET'])
+@authentication_classes([CachedTokenAuthentication])
+@permission_classes([IsSuperUser])
+def improvement_report(request):
+    """
+    Mejora entre scores iniciales y finales agrupada por ``group_by``
+    (country, institution, gender, discipline o academic_degree) con media,
+    tamaño de efecto y t pareada por competencia (Sólo Admins).
+    """
+    group_by = request.query_params.get('group_by', 'country')
+    if group_by not in IMPROVEMENT_GROUPS:
+        return Response({"error": f"group_by must be one of: {', '.join(IMPROVEMENT_GROUPS)}."}, status=status.HTTP_400_BAD_REQUEST)  # noqa
+    return Response(get_improvement_report(group_by))
+
+
 @api_view(['DELETE'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsSuperUser])
 def deactivate_user(request, user_id):
     """Desactiva a un usuario (Requiere Autenticación)"""
@@ -162,7 +224,7 @@ def deactivate_user(request, user_id):
 class UserInitialScorePostView(generics.ListCreateAPIView):
     """Maneja los scores iniciales de Usuario (Requiere Autenticación)"""
     serializer_class = UserInitialScoreSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -182,7 +244,7 @@ class UserInitialScorePostView(generics.ListCreateAPIView):
 class UserFinalScorePostView(generics.ListCreateAPIView):
     """Maneja los scores finales de Usuario (Requiere Autenticación)"""
     serializer_class = UserFinalScoreSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -210,7 +272,7 @@ class CreateTokenView(ObtainAuthToken):
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Administra el usuario autenticado (Requiere Autenticación)"""
     serializer_class = UserSerializer
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
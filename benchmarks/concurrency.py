@@ -0,0 +1,103 @@
+"""
+Compara el throughput con muchas conexiones concurrentes entre despliegues
+(p. ej. uWSGI vs. ASGI) pidiendo los mismos endpoints de lectura.
+
+    python benchmarks/concurrency.py \
+        --target wsgi=http://localhost:8001 \
+        --target asgi=http://localhost:8002 \
+        --token <token> --concurrency 1,10,50,200 --duration 10 \
+        --output results.json
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from httpclient import Connection, summarize
+
+
+DEFAULT_PATHS = [
+    '/api/health-check/',
+    '/sel4c/methodology/activities/',
+    '/sel4c/methodology/activities/tree/',
+    '/sel4c/swift-connection/user-default/',
+]
+
+
+async def worker(base_url, path, headers, deadline, latencies, errors):
+    connection = Connection(base_url)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status, _, _ = await connection.request('GET', path, headers)
+            except (OSError, asyncio.TimeoutError, ConnectionError):
+                errors.append(1)
+                await connection.close()
+                continue
+            if status >= 500:
+                errors.append(status)
+            else:
+                latencies.append(time.perf_counter() - started)
+    finally:
+        await connection.close()
+
+
+async def measure(base_url, path, headers, concurrency, duration):
+    latencies = []
+    errors = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        worker(base_url, path, headers, deadline, latencies, errors)
+        for _ in range(concurrency)
+    ))
+    return summarize(latencies, time.perf_counter() - started, len(errors))
+
+
+async def main(args):
+    headers = {}
+    if args.token:
+        headers['Authorization'] = f'Token {args.token}'
+    results = []
+    for target in args.target:
+        label, _, base_url = target.partition('=')
+        for concurrency in args.concurrency:
+            for path in args.path or DEFAULT_PATHS:
+                summary = await measure(
+                    base_url, path, headers, concurrency, args.duration,
+                )
+                results.append(dict(
+                    summary, target=label, path=path, concurrency=concurrency,
+                ))
+                print(
+                    f"{label:8} c={concurrency:<4} {path:42}"
+                    f" {summary['rps']:>8} req/s"
+                    f"  p50 {summary['p50_ms']} ms  p99 {summary['p99_ms']} ms"
+                    f"  errors {summary['errors']}"
+                )
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--target', action='append', required=True,
+        help='label=http://host:port (repetible)',
+    )
+    parser.add_argument('--path', action='append')
+    parser.add_argument('--token', help='Token de un usuario existente')
+    parser.add_argument(
+        '--concurrency',
+        type=lambda value: [int(level) for level in value.split(',')],
+        default=[1, 10, 50, 200],
+    )
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--output')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,185 @@
+"""
+Cliente HTTP/1.1 mínimo con asyncio (sólo biblioteca estándar) para los
+benchmarks: conexiones keep-alive y mediciones de latencia.
+"""
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from urllib.parse import urlsplit
+
+
+class HTTPError(Exception):
+    pass
+
+
+class Connection:
+    """Una conexión keep-alive a ``base_url`` (se reabre si el server la
+    cierra)"""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http':
+            raise ValueError('Only http:// targets are supported')
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port,
+        )
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.writer = None
+
+    async def request(self, method, path, headers=None, body=b''):
+        """Regresa ``(status, headers, body)``"""
+        for attempt in range(2):
+            if self.writer is None:
+                await self._open()
+            try:
+                return await asyncio.wait_for(
+                    self._request(method, path, headers or {}, body),
+                    self.timeout,
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # el server cerró la conexión keep-alive: reintenta una vez
+                await self.close()
+                if attempt:
+                    raise
+        raise HTTPError('unreachable')
+
+    async def _request(self, method, path, headers, body):
+        lines = [
+            f'{method} {self.prefix}{path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            f'Content-Length: {len(body)}',
+        ]
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        self.writer.write(
+            ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding') == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            content = b''.join(chunks)
+        else:
+            length = int(response_headers.get('content-length', 0))
+            content = await self.reader.readexactly(length)
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, content
+
+    async def json(self, method, path, payload=None, headers=None):
+        """Petición con cuerpo JSON; regresa ``(status, data)``"""
+        headers = dict(headers or {})
+        body = b''
+        if payload is not None:
+            body = json.dumps(payload).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        status, _, content = await self.request(method, path, headers, body)
+        return status, _decode(content)
+
+    async def multipart(self, method, path, fields, files, headers=None):
+        """
+        Petición ``multipart/form-data``; ``files`` es
+        ``{campo: (nombre, content_type, bytes)}``. Regresa ``(status, data)``
+        """
+        boundary = uuid.uuid4().hex
+        parts = []
+        for name, value in fields.items():
+            parts.append(
+                f'--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f'{value}\r\n'.encode('utf-8')
+            )
+        for name, (filename, content_type, content) in files.items():
+            parts.append(
+                f'--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="{name}"; '
+                f'filename="{filename}"\r\n'
+                f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8')
+                + content + b'\r\n'
+            )
+        parts.append(f'--{boundary}--\r\n'.encode('utf-8'))
+        headers = dict(headers or {})
+        headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+        status, _, content = await self.request(
+            method, path, headers, b''.join(parts),
+        )
+        return status, _decode(content)
+
+
+def _decode(content):
+    try:
+        return json.loads(content) if content else None
+    except ValueError:
+        return None
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano de una lista ordenada"""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Resumen (ms) de una lista de latencias en segundos"""
+    ordered = sorted(latency * 1000 for latency in latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'rps': round(len(ordered) / elapsed, 1) if elapsed else 0,
+        'mean_ms': round(statistics.mean(ordered), 2) if ordered else None,
+        'p50_ms': _round(percentile(ordered, 50)),
+        'p95_ms': _round(percentile(ordered, 95)),
+        'p99_ms': _round(percentile(ordered, 99)),
+        'max_ms': _round(ordered[-1] if ordered else None),
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+class Timer:
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
@@ -0,0 +1,322 @@
+"""
+Prueba de carga que repite el recorrido de un participante en la app:
+registro, token, datos personales, catálogo, forms, respuestas de texto e
+imagen y módulos completados.
+
+    python benchmarks/loadtest.py --base-url http://localhost:8000 \
+        --journeys 200 --concurrency 20 --output run.json \
+        --compare previous-run.json
+
+El catálogo (módulos con sub-actividades y preguntas del forms) ya debe
+existir. Cada recorrido crea un usuario nuevo, así que conviene correrlo
+contra una base desechable.
+"""
+import argparse
+import asyncio
+import json
+import random
+import struct
+import time
+import zlib
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from httpclient import Connection, summarize
+
+
+API = '/sel4c'
+
+
+class JourneyError(Exception):
+    pass
+
+
+def tiny_png(size=64, seed=0):
+    """PNG en escala de grises con ruido (sólo biblioteca estándar)"""
+    rng = random.Random(seed)
+    rows = b''.join(
+        b'\x00' + bytes(rng.randrange(256) for _ in range(size))
+        for _ in range(size)
+    )
+
+    def chunk(kind, data):
+        body = kind + data
+        return (
+            struct.pack('>I', len(data)) + body
+            + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+        )
+
+    header = struct.pack('>IIBBBBB', size, size, 8, 0, 0, 0, 0)
+    return (
+        b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+        + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+    )
+
+
+class Recorder:
+    """Latencias y errores por ruta (plantilla de la URL)"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.failures = defaultdict(int)
+
+    def add(self, route, seconds, status, expected):
+        if status == expected:
+            self.latencies[route].append(seconds)
+        else:
+            self.errors[route] += 1
+            self.failures[f'{route} -> {status}'] += 1
+
+    def report(self, elapsed):
+        return {
+            route: summarize(
+                self.latencies[route], elapsed, self.errors[route],
+            )
+            for route in sorted(set(self.latencies) | set(self.errors))
+        }
+
+
+class Journey:
+    """Recorrido de un participante sobre una conexión keep-alive"""
+
+    def __init__(self, connection, recorder, email, args, rng):
+        self.connection = connection
+        self.recorder = recorder
+        self.email = email
+        self.args = args
+        self.rng = rng
+        self.headers = {}
+
+    async def call(self, route, expected, request):
+        started = time.perf_counter()
+        try:
+            status, data = await request
+        except (OSError, asyncio.TimeoutError, ConnectionError):
+            await self.connection.close()
+            status, data = 'connection-error', None
+        self.recorder.add(route, time.perf_counter() - started, status, expected)  # noqa
+        if status != expected:
+            raise JourneyError(f'{route} -> {status}')
+        if self.args.think_time:
+            await asyncio.sleep(self.rng.uniform(0, self.args.think_time))
+        return data
+
+    def json(self, method, path, payload=None):
+        return self.connection.json(
+            method, API + path, payload, headers=self.headers,
+        )
+
+    async def run(self):
+        password = 'loadtest-password'
+        await self.call('POST /user/create/', 201, self.json(
+            'POST', '/user/create/',
+            {'email': self.email, 'password': password, 'name': 'Load test'},
+        ))
+        data = await self.call('POST /user/token/', 200, self.json(
+            'POST', '/user/token/',
+            {'email': self.email, 'password': password},
+        ))
+        self.headers = {'Authorization': f'Token {data["token"]}'}
+
+        await self.call('POST /user/info/add/', 201, self.json(
+            'POST', '/user/info/add/', {
+                'full_name': 'Load test',
+                'academic_degree': 'Bachelor',
+                'institution': self.rng.choice(['ITESM', 'UNAM', 'IPN']),
+                'gender': self.rng.choice(['F', 'M']),
+                'age': self.rng.randint(18, 40),
+                'country': self.rng.choice(['Mexico', 'Chile', 'Peru']),
+                'discipline': 'Engineering',
+            },
+        ))
+
+        await self.call('GET /methodology/activities/', 200, self.json(
+            'GET', '/methodology/activities/',
+        ))
+        tree = await self.call('GET /methodology/activities/tree/', 200, self.json(  # noqa
+            'GET', '/methodology/activities/tree/',
+        ))
+        questions = await self.call('GET /methodology/formsquestions/', 200, self.json(  # noqa
+            'GET', '/methodology/formsquestions/',
+        ))
+        if not tree or not questions:
+            raise JourneyError('empty catalog')
+
+        await self.call('POST /response/add/forms-responses/', 200, self.json(  # noqa
+            'POST', '/response/add/forms-responses/', [
+                {
+                    'question': question['id'],
+                    'score': self.rng.randint(1, 5),
+                    'time_minutes': self.rng.randint(1, 3),
+                }
+                for question in questions
+            ],
+        ))
+
+        modules = [module for module in tree if module['sub_activities']]
+        for module in modules[:self.args.modules]:
+            for activity in module['sub_activities']:
+                await self.answer(activity['id'])
+            await self.call(
+                'POST /response/completed-module/{id}', 201,
+                self.json(
+                    'POST', f'/response/completed-module/{module["id"]}',
+                    {'completed': True},
+                ),
+            )
+
+    async def answer(self, activity_id):
+        route = 'POST /response/activity/{id}/upload-response/'
+        path = f'{API}/response/activity/{activity_id}/upload-response/'
+        minutes = self.rng.randint(1, 20)
+        if self.rng.random() < self.args.image_ratio:
+            request = self.connection.multipart(
+                'POST', path,
+                {'response_type': 'image', 'time_minutes': minutes},
+                {'image_response': ('answer.png', 'image/png', self.args.png)},
+                headers=self.headers,
+            )
+            await self.call(f'{route} (image)', 201, request)
+        else:
+            request = self.connection.json('POST', path, {
+                'response_type': 'text',
+                'string_response': 'Respuesta de prueba de carga. ' * 10,
+                'time_minutes': minutes,
+            }, headers=self.headers)
+            await self.call(f'{route} (text)', 201, request)
+
+
+async def virtual_user(args, queue, recorder, outcomes):
+    connection = Connection(args.base_url, timeout=args.timeout)
+    try:
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            journey = Journey(
+                connection, recorder,
+                f'loadtest-{args.run_id}-{index}@example.com',
+                args, random.Random(f'{args.seed}-{index}'),
+            )
+            try:
+                await journey.run()
+                outcomes['completed'] += 1
+            except JourneyError:
+                outcomes['failed'] += 1
+    finally:
+        await connection.close()
+
+
+async def run(args):
+    queue = asyncio.Queue()
+    for index in range(args.journeys):
+        queue.put_nowait(index)
+    recorder = Recorder()
+    outcomes = {'completed': 0, 'failed': 0}
+
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(args, queue, recorder, outcomes)
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [
+        latency
+        for latencies in recorder.latencies.values()
+        for latency in latencies
+    ]
+    return {
+        'label': args.label,
+        'base_url': args.base_url,
+        'started_at': started_at.isoformat(),
+        'elapsed_s': round(elapsed, 2),
+        'concurrency': args.concurrency,
+        'journeys': dict(outcomes, journeys_per_s=round(
+            outcomes['completed'] / elapsed, 2,
+        )),
+        'total': summarize(
+            all_latencies, elapsed, sum(recorder.errors.values()),
+        ),
+        'routes': recorder.report(elapsed),
+        'failures': dict(recorder.failures),
+    }
+
+
+def print_report(report, previous=None):
+    print(
+        f"{report['label']}: {report['journeys']['completed']} journeys"
+        f" ({report['journeys']['failed']} failed) in"
+        f" {report['elapsed_s']} s, {report['total']['rps']} req/s"
+    )
+    header = f"{'route':58} {'req':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}"  # noqa
+    if previous:
+        header += f" {'Δp95':>8} {'Δrps':>7}"
+    print(header)
+    for route, summary in report['routes'].items():
+        line = (
+            f"{route:58} {summary['requests']:>6} {summary['rps']:>7}"
+            f" {_ms(summary['p50_ms'])} {_ms(summary['p95_ms'])}"
+            f" {_ms(summary['p99_ms'])} {summary['errors']:>5}"
+        )
+        before = (previous or {}).get('routes', {}).get(route)
+        if before and before['p95_ms'] and summary['p95_ms']:
+            line += (
+                f" {summary['p95_ms'] - before['p95_ms']:>+8.1f}"
+                f" {summary['rps'] - before['rps']:>+7.1f}"
+            )
+        print(line)
+    for failure, count in report['failures'].items():
+        print(f'  {count} x {failure}')
+
+
+def _ms(value):
+    return f'{value:>8.1f}' if value is not None else f"{'-':>8}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--label', default='run')
+    parser.add_argument('--journeys', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument(
+        '--modules', type=int, default=2,
+        help='Módulos que responde cada participante',
+    )
+    parser.add_argument(
+        '--image-ratio', type=float, default=0.2,
+        help='Fracción de respuestas que son imagen',
+    )
+    parser.add_argument(
+        '--think-time', type=float, default=0,
+        help='Pausa máxima (s) entre pasos del recorrido',
+    )
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', default='sel4c')
+    parser.add_argument('--output', help='Archivo JSON con el reporte')
+    parser.add_argument('--compare', help='Reporte JSON de una corrida previa')  # noqa
+    args = parser.parse_args()
+    args.run_id = f'{int(time.time()):x}'
+    args.png = tiny_png()
+    return args
+
+
+def main():
+    args = parse_args()
+    report = asyncio.run(run(args))
+    previous = None
+    if args.compare:
+        with open(args.compare) as previous_file:
+            previous = json.load(previous_file)
+    print_report(report, previous)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,22 @@ server {
         alias /vol/static;
     }
 
+    # Los archivos subidos sólo salen por /sel4c/media/ (con permisos)
+    location /static/media/ {
+        return 404;
+    }
+
+    # Sólo accesible por X-Accel-Redirect desde /sel4c/media/
+    location /protected-media/ {
+        internal;
+        alias /vol/static/media/;
+        # un solo rango por petición; con varios se entrega el archivo
+        max_ranges 1;
+    }
+
     location / {
-        uwsgi_pass              ${APP_HOST}:${APP_PORT};
-        include                 /etc/nginx/uwsgi_params;
+        # uwsgi_pass o proxy_pass según SERVER_MODE (ver run.sh)
+        include                 /etc/nginx/app_pass.conf;
         client_max_body_size    10M;
     }
 }
\ No newline at end of file
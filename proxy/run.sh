@@ -2,5 +2,7 @@
 
 set -e
 
-envsubst < /etc/nginx/default.conf.tpl > /etc/nginx/conf.d/default.conf
-nginx -g 'daemon off;'
\ No newline at end of file
+# sólo se sustituyen las variables propias; las de nginx ($host...) no
+envsubst '${APP_HOST} ${APP_PORT}' < /etc/nginx/${SERVER_MODE}_pass.conf.tpl > /etc/nginx/app_pass.conf
+envsubst '${LISTEN_PORT}' < /etc/nginx/default.conf.tpl > /etc/nginx/conf.d/default.conf
+nginx -g 'daemon off;'
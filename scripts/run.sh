@@ -6,4 +6,21 @@ python manage.py wait_for_db
 python manage.py collectstatic --noinput
 python manage.py migrate
 
-uwsgi --socket :9000 --workers 4 --master --enable-threads --module app.wsgi
\ No newline at end of file
+# cada worker vuelca sus métricas aquí (ver core.metrics); se empieza
+# de cero en cada arranque
+export METRICS_DIR="${METRICS_DIR:-/tmp/sel4c-metrics}"
+rm -rf "$METRICS_DIR"
+
+# SERVER_MODE=asgi: gunicorn con workers de uvicorn (HTTP en :9000)
+# SERVER_MODE=wsgi (default): uWSGI (protocolo uwsgi en :9000)
+if [ "$SERVER_MODE" = "asgi" ]; then
+    # bajo ASGI las conexiones no se reutilizan entre peticiones;
+    # el pool es pgbouncer
+    export DB_CONN_MAX_AGE=0
+    exec gunicorn app.asgi:application \
+        --worker-class uvicorn.workers.UvicornWorker \
+        --workers "${WEB_WORKERS:-4}" \
+        --bind :9000
+fi
+
+uwsgi --socket :9000 --workers "${WEB_WORKERS:-4}" --master --enable-threads --module app.wsgi